@@ -0,0 +1,143 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Background workers. Results are handed back through a dispatch callable
+# (the app passes a Clock.schedule_once wrapper), so callbacks always run on
+# the UI thread.
+
+import threading
+from collections import OrderedDict
+from itertools import count
+
+
+class PersistenceWorker:
+    """Single writer thread for file and database I/O.
+
+    Jobs run strictly in submission order. A job submitted with a key
+    replaces a still-queued job with the same key and moves to the end of
+    the queue, so repeated snapshot writes collapse into the newest one.
+    """
+
+    def __init__(self, dispatch, name: str = "jontrain-persistence"):
+        self._dispatch = dispatch
+        self._cond = threading.Condition()
+        self._jobs = OrderedDict()
+        self._ids = count()
+        self._busy = False
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, key=None, on_done=None, on_error=None):
+        """Queue fn(); on_done(result) / on_error(exc) run via dispatch."""
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("PersistenceWorker gestoppt")
+            if key is None:
+                key = ("job", next(self._ids))
+            else:
+                self._jobs.pop(key, None)
+            self._jobs[key] = (fn, on_done, on_error)
+            self._cond.notify_all()
+
+    def flush(self, timeout=None) -> bool:
+        """Block until every queued job has finished. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._jobs and not self._busy, timeout)
+
+    def stop(self, timeout=None) -> bool:
+        done = self.flush(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        return done
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._jobs or self._stopped)
+                if not self._jobs:
+                    return
+                _, (fn, on_done, on_error) = self._jobs.popitem(last=False)
+                self._busy = True
+            try:
+                result = fn()
+            except Exception as e:
+                if on_error is not None:
+                    self._dispatch(lambda e=e, cb=on_error: cb(e))
+            else:
+                if on_done is not None:
+                    self._dispatch(lambda r=result, cb=on_done: cb(r))
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class BackgroundJob:
+    """One-off cancellable task on its own thread.
+
+    fn(job) may call job.report(text) for progress and job.check() between
+    steps; once cancelled, check() raises JobCancelled and no further
+    callbacks reach the UI. A step that is already running (e.g. a key
+    derivation) finishes, but its result is discarded.
+    """
+
+    def __init__(self, fn, dispatch, on_progress=None, on_done=None, on_error=None, name: str = "jontrain-job"):
+        self._fn = fn
+        self._dispatch = dispatch
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._on_error = on_error
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive() and not self._finished.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, text: str):
+        if self._on_progress is not None and not self._cancel.is_set():
+            self._dispatch(lambda t=text, cb=self._on_progress: cb(t))
+
+    def _deliver(self, cb, value):
+        # Drop results of cancelled jobs, also if cancel() races the dispatch
+        def _call():
+            if not self._cancel.is_set():
+                cb(value)
+        self._dispatch(_call)
+
+    def _run(self):
+        try:
+            result = self._fn(self)
+            self.check()
+        except JobCancelled:
+            return
+        except Exception as e:
+            if self._on_error is not None:
+                self._deliver(self._on_error, e)
+        else:
+            if self._on_done is not None:
+                self._deliver(self._on_done, result)
+        finally:
+            self._finished.set()
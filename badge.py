@@ -0,0 +1,105 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Share badge rendered offscreen: the badge widget tree is built once per
+# size and drawn into its own Fbo, never added to the window. A render sets
+# the texts, updates the label textures and the layout synchronously and
+# reads the pixels back in the same frame, so no delay is needed and the
+# visible UI is not touched.
+
+from kivy.graphics import ClearBuffers, ClearColor, Color, Fbo, Line, Rectangle
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.widget import Widget
+
+
+BADGE_SIZE = (900, 520)
+# Bump when the layout changes: cached badge files are keyed by it
+BADGE_TEMPLATE_VERSION = 1
+
+
+class _BadgeTemplate:
+    """Widget tree and Fbo of one badge size; only the texts change per render."""
+
+    def __init__(self, size):
+        w, h = size
+        self.size = size
+        badge = BoxLayout(orientation="vertical", size_hint=(None, None), size=(w, h), pos=(0, 0),
+                          padding=30, spacing=18)
+        with badge.canvas.before:
+            Color(0, 0, 0, 1)
+            Rectangle(pos=(0, 0), size=(w, h))
+            Color(1, 1, 1, 1)
+            Line(rectangle=(0, 0, w, h), width=2)
+
+        self.labels = {
+            "name": Label(font_size=34, halign="left"),
+            "mode": Label(font_size=34, halign="left"),
+            "points": Label(font_size=34, halign="left"),
+            "date": Label(font_size=26, halign="left"),
+        }
+        for label in self.labels.values():
+            label.text_size = (w - 60, None)
+            label.valign = "middle"
+
+        self.static = [
+            Label(text="JONTRAIN  HIGHSCORE", font_size=40),
+            Label(text="====================", font_size=26),
+            Label(text="geteilt aus JonTrain", font_size=22),
+        ]
+        title, sep, footer = self.static
+        for child in (title, sep, *self.labels.values(), Widget(), footer):
+            badge.add_widget(child)
+        self.widget = badge
+
+        self.fbo = Fbo(size=size)
+        with self.fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
+        self.fbo.add(badge.canvas)
+        self._static_ready = False
+
+    def fill(self, fields: dict):
+        texts = {
+            "name": f"Name:   {fields.get('name', 'Anonym')}",
+            "mode": f"Modus:  {fields.get('mode', '')}",
+            "points": f"Punkte: {fields.get('points', 0)}",
+            "date": f"Datum:  {fields.get('date', '')}",
+        }
+        labels = list(self.labels.values())
+        if not self._static_ready:
+            labels += self.static
+            self._static_ready = True
+        for key, text in texts.items():
+            self.labels[key].text = text
+        # Normally deferred to the next frame; forced so the Fbo sees them now
+        for label in labels:
+            label.texture_update()
+        self.widget.do_layout()
+
+    def draw(self) -> bytes:
+        self.fbo.draw()
+        return self.fbo.pixels  # RGBA, bottom row first
+
+
+class BadgeRenderer:
+    """Renders badges to RGBA pixels / PNG bytes (UI thread for render())."""
+
+    def __init__(self):
+        self._templates = {}  # size -> _BadgeTemplate
+
+    def _template(self, size) -> _BadgeTemplate:
+        template = self._templates.get(size)
+        if template is None:
+            template = self._templates[size] = _BadgeTemplate(size)
+        return template
+
+    def render(self, fields: dict, size=BADGE_SIZE):
+        """(width, height, RGBA bytes bottom-up) of the badge for fields (name, mode, points, date)."""
+        template = self._template(tuple(size))
+        template.fill(fields)
+        return size[0], size[1], template.draw()
+
+    @staticmethod
+    def template_id(size=BADGE_SIZE) -> str:
+        return f"{size[0]}x{size[1]}/v{BADGE_TEMPLATE_VERSION}"
@@ -0,0 +1,136 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Rendered share badges on disk, keyed by a hash of their content. Sharing
+# the same entry twice reuses the PNG instead of rendering and writing a
+# new file. The directory is kept within a size and age budget by evicting
+# the least recently used badges (file mtime = last use, so the order
+# survives restarts).
+
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_DIRNAME = "badges"
+MAX_BYTES = 4 * 1024 * 1024
+MAX_AGE_SECONDS = 30 * 24 * 3600
+# Files written by versions without the cache (one per share, never deleted)
+LEGACY_PATTERN = "jontrain-badge-*.png"
+
+
+def badge_key(fields: dict, template: str = "") -> str:
+    """Content hash of a badge: its texts plus the template (size/version)."""
+    payload = json.dumps([template, fields], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+class BadgeCache:
+    """LRU file cache; safe to call from the UI and the persistence thread."""
+
+    def __init__(self, directory: str, max_bytes: int = MAX_BYTES, max_age: float = MAX_AGE_SECONDS,
+                 clock=time.time):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index = None  # key -> (size, last use), least recently used first
+        self.total_bytes = 0
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"badge-{key}.png")
+
+    def _load(self):
+        if self._index is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".tmp"):
+                # Interrupted write
+                _remove(path)
+                continue
+            if not (name.startswith("badge-") and name.endswith(".png")):
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            found.append((st.st_mtime, name[len("badge-"):-len(".png")], st.st_size))
+        found.sort()
+        self._index = OrderedDict((key, (size, mtime)) for mtime, key, size in found)
+        self.total_bytes = sum(size for size, _ in self._index.values())
+
+    def get(self, key: str):
+        """Path of the cached badge (marked as used) or None."""
+        with self._lock:
+            self._load()
+            if key not in self._index:
+                return None
+            path = self.path(key)
+            now = self._clock()
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                # Deleted behind our back
+                self.total_bytes -= self._index.pop(key)[0]
+                return None
+            self._index[key] = (self._index[key][0], now)
+            self._index.move_to_end(key)
+            return path
+
+    def put(self, key: str, data: bytes) -> str:
+        """Store data under key (atomic), evict over budget; returns the path."""
+        path = self.path(key)
+        with self._lock:
+            self._load()
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            now = self._clock()
+            os.utime(path, (now, now))
+            old = self._index.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[0]
+            self._index[key] = (len(data), now)
+            self.total_bytes += len(data)
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: str = None) -> int:
+        removed = 0
+        expired = self._clock() - self.max_age
+        for key, (size, used) in list(self._index.items()):
+            if key == keep:
+                continue
+            if used >= expired and self.total_bytes <= self.max_bytes:
+                break  # LRU order: everything after is newer
+            _remove(self.path(key))
+            del self._index[key]
+            self.total_bytes -= size
+            removed += 1
+        return removed
+
+    def cleanup(self, legacy_dir: str = None) -> int:
+        """Startup housekeeping (background): enforce the budget, drop legacy badge files."""
+        with self._lock:
+            self._load()
+            removed = self._evict()
+        if legacy_dir:
+            for path in glob.glob(os.path.join(glob.escape(legacy_dir), LEGACY_PATTERN)):
+                removed += _remove(path)
+        return removed
+
+
+def _remove(path: str) -> int:
+    try:
+        os.remove(path)
+        return 1
+    except OSError:
+        return 0
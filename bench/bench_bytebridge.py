@@ -0,0 +1,71 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Python-side cost of the byte[] conversions for backups and badge PNGs
+# (10 KB .. 10 MB), old per-byte loops vs. bytebridge:
+#   python bench/bench_bytebridge.py
+#
+# Runs without Android: Java arrays are modelled as the lists pyjnius hands
+# over, so only the Python work per payload is measured.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bytebridge import ByteBridge  # noqa: E402
+
+SIZES = (10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024)
+
+
+def _fake_jarray(code):
+    return list
+
+
+def old_to_java(data: bytes):
+    signed = [b - 256 if b > 127 else b for b in data]
+    return _fake_jarray("b")(signed)
+
+
+def old_from_java(buf, n: int) -> bytes:
+    return bytes(((int(buf[i]) + 256) & 0xFF) for i in range(n))
+
+
+def _timeit(fn, *args) -> float:
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _fmt(size: int) -> str:
+    return f"{size // (1024 * 1024)} MB" if size >= 1024 * 1024 else f"{size // 1024} KB"
+
+
+def main():
+    bridge = ByteBridge(jarray=_fake_jarray)
+    direct = ByteBridge(direct_bytes=True)
+    chunk = 64 * 1024
+    print(f"{'Payload':>8} | {'write old':>10} {'jarray':>10} {'direct':>10} | {'read old':>10} {'read new':>10}")
+    for size in SIZES:
+        data = os.urandom(size)
+        jbuf = bridge.to_java(data)
+        assert bytes(bridge.from_java(jbuf, size)) == data
+
+        def read_chunks(conv):
+            for off in range(0, size, chunk):
+                conv(jbuf[off:off + chunk], min(chunk, size - off))
+
+        w_old = _timeit(old_to_java, data)
+        w_new = _timeit(bridge.to_java, data)
+        w_direct = _timeit(direct.to_java, data)
+        r_old = _timeit(read_chunks, old_from_java)
+        r_new = _timeit(read_chunks, bridge.from_java)
+        print(f"{_fmt(size):>8} | {w_old * 1000:8.1f}ms {w_new * 1000:8.1f}ms {w_direct * 1000:8.3f}ms | {r_old * 1000:8.1f}ms {r_new * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Batch certificate packing (PDF / sprite sheet ZIP) without a GL context:
+#   python bench/bench_certificates.py
+#
+# The Fbo read-back is replaced by synthetic badge pixels (black card with
+# white text-like bars), so only the encoding pipeline is measured.
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from certificates import CERTIFICATE_FORMATS, MAX_ENCODE_WORKERS, CertificateBatch, format_report  # noqa: E402
+
+COUNTS = (30, 100, 300)
+BADGE_SIZE = (900, 520)  # badge.BADGE_SIZE (badge needs Kivy)
+
+
+def fake_badge(n: int, width: int, height: int) -> bytes:
+    black = b"\x00\x00\x00\xff"
+    white = b"\xff\xff\xff\xff"
+    rows = []
+    for y in range(height):
+        if (y // 40) % 3 == 1:
+            bar = 200 + (n * 37 + y) % 500
+            rows.append(white * bar + black * (width - bar))
+        else:
+            rows.append(black * width)
+    return b"".join(rows)
+
+
+def main():
+    width, height = BADGE_SIZE
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in CERTIFICATE_FORMATS:
+            for count in COUNTS:
+                for workers in (1, MAX_ENCODE_WORKERS):
+                    batch = CertificateBatch(os.path.join(tmp, f"urkunden.{fmt}"), fmt, workers=workers)
+                    for n in range(count):
+                        while batch.busy:
+                            time.sleep(0.001)
+                        t0 = time.perf_counter()
+                        pixels = fake_badge(n, width, height)
+                        batch.add(width, height, pixels, time.perf_counter() - t0)
+                    report = batch.finish()
+                    print(f"[{fmt} {count} x, {report['workers']} Threads]")
+                    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Import cost at cold start, each measured in a fresh interpreter:
+#   python bench/bench_import.py [runs]
+#
+# "eager" is what main.py used to import before the first frame (webbrowser,
+# pyzipper, pycryptodome); "lazy" is the platform_bridge module that
+# replaced it. Modules that are not installed here are reported as such.
+# With Kivy installed, "main" measures the full module import as well (the
+# app's STARTUP timeline reports the same phase on the device).
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    "eager": (
+        "import webbrowser\n"
+        "try:\n import pyzipper\nexcept Exception:\n pass\n"
+        "try:\n from Crypto.Cipher import AES\n from Crypto.Protocol.KDF import PBKDF2\n from Crypto.Hash import SHA256\n"
+        "except Exception:\n pass\n"
+    ),
+    "lazy": "import platform_bridge\n",
+    "lazy + crypto": "import platform_bridge\nplatform_bridge.pyzipper_module()\nplatform_bridge.aes_gcm()\n",
+    "main": "import main\n",
+}
+
+_TIMED = (
+    "import time\n"
+    "t0 = time.perf_counter()\n"
+    "{code}"
+    "print(time.perf_counter() - t0)\n"
+)
+
+
+def time_import(code: str, runs: int):
+    """Best wall time over runs fresh interpreters, or None if the import fails."""
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", _TIMED.format(code=code)],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            return None
+        t = float(proc.stdout.strip().splitlines()[-1])
+        best = t if best is None else min(best, t)
+    return best
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'Fall':<16}{'Import':>12}")
+    for name, code in CASES.items():
+        t = time_import(code, runs)
+        shown = "nicht verfügbar" if t is None else f"{t * 1000:9.2f}ms"
+        print(f"{name:<16}{shown:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Leaderboard operations on large boards, old list handling vs. leaderboard:
+#   python bench/bench_leaderboard.py
+
+import os
+import sys
+import time
+from random import Random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import Leaderboard  # noqa: E402
+
+SIZES = (1_000, 10_000, 50_000)
+OPS = 200
+
+
+def _entries(n: int, rng: Random):
+    return [{"name": f"Kind {i}", "points": rng.randint(0, 400), "date": "01.01.2025 12:00"} for i in range(n)]
+
+
+def old_insert(scores: list, entry: dict) -> list:
+    scores.append(entry)
+    return sorted(scores, key=lambda x: x.get("points", 0), reverse=True)
+
+
+def old_rank(scores: list, entry: dict) -> int:
+    for rank, score in enumerate(scores, start=1):
+        if score == entry:
+            return rank
+    return 0
+
+
+def _per_op(fn, n: int = OPS) -> float:
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main():
+    rng = Random(1)
+    print(f"{'Einträge':>10}{'alt insert':>14}{'insert':>10}{'alt rank':>12}{'rank_of':>10}{'page':>10}")
+    for size in SIZES:
+        base = _entries(size, rng)
+        new = _entries(OPS, rng)
+
+        scores = sorted(base, key=lambda x: x["points"], reverse=True)
+
+        def _old(i):
+            nonlocal scores
+            scores = old_insert(scores, new[i])
+
+        t_old_insert = _per_op(_old)
+        t_old_rank = _per_op(lambda i: old_rank(scores, new[i]))
+
+        board = Leaderboard(sorted(base, key=lambda x: x["points"], reverse=True))
+        ids = []
+        t_insert = _per_op(lambda i: ids.append(board.insert(new[i])))
+        t_rank = _per_op(lambda i: board.rank_of(ids[i]))
+        t_page = _per_op(lambda i: board.page(board.page_of(ids[i], 20), 20))
+
+        print(f"{size:>10,}{t_old_insert:>12.1f}µs{t_insert:>8.1f}µs{t_old_rank:>10.1f}µs{t_rank:>8.1f}µs{t_page:>8.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
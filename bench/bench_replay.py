@@ -0,0 +1,93 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Records simulated keypad sessions and replays them (no Kivy needed):
+#   python bench/bench_replay.py [sessions]
+#
+# Also checks adaptive sessions whose answers take about SLOW_ANSWER_SECONDS
+# on a float clock: the logged ms must lead to the same scheduling.
+
+import json
+import os
+import sys
+import time
+from random import Random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fact_stats import FactStats  # noqa: E402
+from questions import CATEGORY_OPS  # noqa: E402
+from replay import SessionLog, build_session, replay  # noqa: E402
+from scheduler import SLOW_ANSWER_SECONDS  # noqa: E402
+from session import SESSION_SECONDS, VirtualClock  # noqa: E402
+
+
+def record_session(category: str, seed: int, accuracy: float = 0.9) -> SessionLog:
+    """One 300 s session typed in on the keypad, as the app would record it."""
+    player = Random(seed ^ 0x5EED)
+    clock = VirtualClock()
+    log = SessionLog(seed, category)
+    session = build_session(log, clock=clock)
+    session.start()
+    while not session.is_over:
+        value, remainder = session.question.answer
+        if player.random() >= accuracy:
+            value += 1
+        tens, ones = divmod(value, 10)
+        if tens:
+            clock.advance(player.uniform(0.3, 1.5))
+            session.toggle("tens", str(tens * 10))
+        if ones:
+            clock.advance(player.uniform(0.3, 1.5))
+            session.toggle("ones", str(ones))
+        if remainder:
+            clock.advance(player.uniform(0.3, 1.5))
+            session.toggle("remainder", f"R{remainder}")
+        clock.advance(player.uniform(0.2, 1.0))
+        if not session.is_over:
+            session.submit()
+    log.finish(session)
+    return log
+
+
+def record_adaptive_session(seed: int, duration: int = 10 * SESSION_SECONDS) -> SessionLog:
+    """Long adaptive session (facts come back) with answers within 2 ms of the slow threshold."""
+    player = Random(seed)
+    clock = VirtualClock(player.uniform(0, 1000))  # arbitrary start, like time.monotonic
+    log = SessionLog(seed, "div", duration=duration, mode="adaptive")
+    session = build_session(log, clock=clock, stats=FactStats())
+    session.start()
+    while not session.is_over:
+        clock.advance(SLOW_ANSWER_SECONDS + player.uniform(-0.002, 0.002))
+        if not session.is_over:
+            value, remainder = session.question.answer
+            session.answer_with(value if player.random() < 0.9 else value + 1, remainder)
+    log.finish(session)
+    return log
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    categories = list(CATEGORY_OPS)
+    logs = [record_session(categories[i % len(categories)], seed=i) for i in range(n)]
+    # Round trip through JSON, as logs from devices would arrive
+    logs = [SessionLog.from_dict(json.loads(json.dumps(log.to_dict()))) for log in logs]
+    events = sum(len(log) for log in logs)
+    size = sum(len(json.dumps(log.to_dict(), separators=(",", ":"))) for log in logs)
+
+    t0 = time.perf_counter()
+    for log in logs:
+        replay(log)
+    elapsed = time.perf_counter() - t0
+    print(f"{n} Sitzungen, {events:,} Ereignisse, {size / n / 1024:.1f} KiB pro Sitzung")
+    print(f"Replay: {n / elapsed:,.0f} Sitzungen/s, {events / elapsed:,.0f} Ereignisse/s, "
+          f"{n * SESSION_SECONDS / elapsed:,.0f}x Echtzeit")
+
+    # Raises ReplayMismatch when the replay schedules differently
+    for seed in range(50):
+        replay(record_adaptive_session(seed))
+    print("Adaptiv an der Langsam-Schwelle: 50 Sitzungen gleich abgespielt")
+
+
+if __name__ == "__main__":
+    main()
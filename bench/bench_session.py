@@ -0,0 +1,47 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Headless throughput of the training engine (no Kivy needed):
+#   python bench/bench_session.py [answers]
+
+import os
+import sys
+import time
+from random import Random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from questions import CATEGORY_OPS  # noqa: E402
+from scheduler import AdaptiveScheduler  # noqa: E402
+from session import TrainingSession, VirtualClock, simulate  # noqa: E402
+
+
+def bench_answers(category: str, n: int, adaptive: bool = False, max_factor: int = 10) -> float:
+    clock = VirtualClock()
+    pool = AdaptiveScheduler(category, rng=Random(1), max_factor=max_factor) if adaptive else None
+    session = TrainingSession(category, clock=clock, rng=Random(1), pool=pool, max_factor=max_factor)
+    session.start()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        clock.now += 2.5
+        session.answer_with(*session.question.answer)
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    for category in CATEGORY_OPS:
+        rate = bench_answers(category, n)
+        points = simulate(category, accuracy=0.9, answer_seconds=3.0, seed=1).points
+        print(f"{category:12s} {rate:12,.0f} answers/s   simulated 300 s session: {points} Punkte")
+
+    print()
+    for max_factor in (10, 20):
+        for adaptive in (False, True):
+            rate = bench_answers("all", n, adaptive=adaptive, max_factor=max_factor)
+            mode = "adaptiv" if adaptive else "zufall"
+            print(f"all 1..{max_factor:<3d} {mode:8s} {rate:12,.0f} answers/s")
+
+
+if __name__ == "__main__":
+    main()
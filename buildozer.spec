@@ -28,6 +28,7 @@ source.include_exts = py,png,jpg,kv,atlas
 
 # (list) List of directory to exclude (leave empty to not exclude anything)
 #source.exclude_dirs = tests, bin, venv
+source.exclude_dirs = bench
 
 # (list) List of exclusions using pattern matching
 # Do not prefix with './'
@@ -42,7 +43,7 @@ version.filename = main.py
 
 # (list) Application requirements
 # comma separated e.g. requirements = sqlite3,kivy
-requirements = python3,kivy,pyjnius,pyzipper,pycryptodome
+requirements = python3,kivy,pyjnius,pyzipper,pycryptodome,sqlite3
 
 # (str) Custom source folders for requirements
 # Sets custom source for any requirements with recipes
@@ -0,0 +1,112 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Bulk conversion between Python bytes and Java byte[] for pyjnius streams.
+# Java bytes are signed (-128..127); every path here reinterprets whole
+# buffers (memoryview casts, array('b')) instead of converting byte by byte
+# in Python.
+
+from array import array
+
+
+def signed_view(data) -> memoryview:
+    """Zero-copy view of data as signed bytes."""
+    return memoryview(data).cast("b")
+
+
+def unsigned_bytes(values) -> bytes:
+    """bytes from a sequence of signed byte values (-128..127)."""
+    return array("b", values).tobytes()
+
+
+class ByteBridge:
+    """Converts payloads for pyjnius byte[] parameters and back.
+
+    jarray / jbytearray_cls are the pyjnius helpers available on the
+    device (either may be None). direct_bytes marks a pyjnius build that
+    accepts bytes for byte[] arguments itself (one JNI region copy); the
+    app probes that once via probe_direct_bytes().
+    """
+
+    def __init__(self, jarray=None, jbytearray_cls=None, direct_bytes: bool = False):
+        self.jarray = jarray
+        self.jbytearray_cls = jbytearray_cls
+        self.direct_bytes = direct_bytes
+
+    def to_java(self, data):
+        if self.direct_bytes:
+            return data if isinstance(data, (bytes, bytearray)) else bytes(data)
+        if self.jarray:
+            # tolist() builds the signed values in C, jarray copies them in Cython
+            return self.jarray("b")(signed_view(data).tolist())
+        if self.jbytearray_cls:
+            # Last resort: element-wise fill is all this pyjnius offers
+            signed = signed_view(data)
+            arr = self.jbytearray_cls(len(signed))
+            for i, v in enumerate(signed):
+                arr[i] = v
+            return arr
+        return data
+
+    def from_java(self, buf, n: int) -> bytes:
+        if isinstance(buf, (bytes, bytearray, memoryview)):
+            return bytes(memoryview(buf)[:n])
+        tostring = getattr(buf, "tostring", None)
+        if tostring is not None:
+            # pyjnius ByteArray (byte[] return values): one bulk copy
+            return tostring()[:n]
+        try:
+            return bytes(memoryview(buf).cast("B")[:n])
+        except TypeError:
+            pass
+        return unsigned_bytes(buf[:n])
+
+    def new_buffer(self, size: int):
+        """Reusable byte[] for InputStream.read."""
+        if self.jarray:
+            return self.jarray("b")([0] * size)
+        if self.jbytearray_cls:
+            return self.jbytearray_cls(size)
+        return bytearray(size)
+
+
+def probe_direct_bytes(byte_array_output_stream_cls) -> bool:
+    """True if pyjnius passes bytes to byte[] parameters correctly."""
+    sample = b"\x00\x01\x7f\x80\xff"
+    try:
+        out = byte_array_output_stream_cls()
+        out.write(sample, 0, len(sample))
+        got = out.toByteArray()
+        return ByteBridge().from_java(got, len(sample)) == sample
+    except Exception:
+        return False
+
+
+# Chunk size for streaming into Java OutputStreams
+STREAM_CHUNK = 64 * 1024
+
+
+def copy_to_output_stream(stream, source, bridge: ByteBridge, chunk_size: int = STREAM_CHUNK) -> int:
+    """Copy bytes or a binary file object to a Java OutputStream chunk by chunk.
+
+    Only one chunk is converted at a time (file sources reuse one read
+    buffer), so peak memory does not grow with the payload. Returns the
+    number of bytes written.
+    """
+    total = 0
+    if hasattr(source, "readinto"):
+        buf = bytearray(chunk_size)
+        while True:
+            n = source.readinto(buf)
+            if not n:
+                break
+            stream.write(bridge.to_java(buf), 0, n)
+            total += n
+    else:
+        view = memoryview(source)
+        for off in range(0, len(view), chunk_size):
+            part = view[off:off + chunk_size]
+            stream.write(bridge.to_java(part), 0, len(part))
+            total += len(part)
+    stream.flush()
+    return total
@@ -0,0 +1,245 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Batch certificates: badges are rendered one after another on the UI
+# thread; their pixels go to a thread pool for conversion and zlib
+# compression (zlib releases the GIL, so encoding overlaps with rendering)
+# and the results are packed into one printable file:
+#   pdf  one certificate per A4 landscape page
+#   zip  PNG sprite sheets with SHEET_COLS x SHEET_ROWS certificates each
+# Every queued job holds raw pixels (1.9 MB per certificate, 15 MB per
+# sheet), so the renderer has to pause while the batch is busy instead of
+# running ahead. Sheets are filled in place as certificates arrive, so the
+# tiles are not kept until a sheet is complete.
+
+import os
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from pngwriter import encode_png_scanlines
+
+CERTIFICATE_FORMATS = ("pdf", "zip")
+SHEET_COLS = 2
+SHEET_ROWS = 4
+# A4 landscape and margin in PDF points
+PAGE_SIZE = (842, 595)
+PAGE_MARGIN = 36
+MAX_ENCODE_WORKERS = 4
+
+
+def rgba_to_rgb(rgba) -> bytearray:
+    """Drop the alpha channel (badges are opaque) with slice copies in C."""
+    view = memoryview(rgba)
+    rgb = bytearray(len(view) // 4 * 3)
+    rgb[0::3] = view[0::4]
+    rgb[1::3] = view[1::4]
+    rgb[2::3] = view[2::4]
+    return rgb
+
+
+def flip_rows(data, stride: int, height: int) -> bytes:
+    """Bottom-up rows (OpenGL read-back) to top-down."""
+    view = memoryview(data)
+    return b"".join(view[y * stride:(y + 1) * stride] for y in range(height - 1, -1, -1))
+
+
+def new_sheet(width: int, height: int, cols: int = SHEET_COLS, rows: int = SHEET_ROWS) -> bytearray:
+    """PNG scanlines of an empty sheet of width x height cells (empty cells stay transparent)."""
+    return bytearray((1 + width * 4 * cols) * height * rows)
+
+
+def put_tile(sheet: bytearray, tile, index: int, width: int, height: int, cols: int = SHEET_COLS):
+    """Copy a bottom-up RGBA tile into cell index of a new_sheet() (cells fill row by row)."""
+    stride = width * 4
+    line = 1 + stride * cols
+    src = memoryview(tile)
+    offset = (index // cols) * height * line + 1 + (index % cols) * stride
+    for y in range(height - 1, -1, -1):
+        sheet[offset:offset + stride] = src[y * stride:(y + 1) * stride]
+        offset += line
+
+
+def _pdf_page_image(pixels, width: int, height: int, level: int) -> bytes:
+    rgb = rgba_to_rgb(pixels)
+    return zlib.compress(flip_rows(rgb, width * 3, height), level)
+
+
+def _png_sheet(sheet: bytearray, rows: int, width: int, height: int, level: int) -> bytes:
+    used = (1 + width * 4 * SHEET_COLS) * height * rows
+    return encode_png_scanlines(memoryview(sheet)[:used], width * SHEET_COLS, height * rows, level)
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+class PdfWriter:
+    """Streams one image per page into a PDF (images are Flate-compressed RGB)."""
+
+    def __init__(self, f, page_size=PAGE_SIZE, margin: int = PAGE_MARGIN):
+        self._f = f
+        self.page_size = page_size
+        self.margin = margin
+        self._offsets = {}
+        self._pages = []
+        self._next_id = 3  # 1: catalog, 2: page tree
+        self._pos = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes):
+        self._f.write(data)
+        self._pos += len(data)
+
+    def _object(self, obj_id: int, body: bytes, stream: bytes = None):
+        self._offsets[obj_id] = self._pos
+        self._write(b"%d 0 obj\n" % obj_id + body)
+        if stream is not None:
+            self._write(b"\nstream\n" + stream + b"\nendstream")
+        self._write(b"\nendobj\n")
+
+    def add_image_page(self, data: bytes, width: int, height: int):
+        page_id, content_id, image_id = self._next_id, self._next_id + 1, self._next_id + 2
+        self._next_id += 3
+        pw, ph = self.page_size
+        scale = min((pw - 2 * self.margin) / width, (ph - 2 * self.margin) / height)
+        dw, dh = width * scale, height * scale
+        content = b"q %.2f 0 0 %.2f %.2f %.2f cm /Im0 Do Q" % (dw, dh, (pw - dw) / 2, (ph - dh) / 2)
+        self._object(image_id, b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+                               b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>" % (width, height, len(data)),
+                     data)
+        self._object(content_id, b"<< /Length %d >>" % len(content), content)
+        self._object(page_id, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+                              b"/Resources << /XObject << /Im0 %d 0 R >> >> >>" % (pw, ph, content_id, image_id))
+        self._pages.append(page_id)
+
+    def close(self):
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self._pages)
+        self._object(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._pages)))
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref_at = self._pos
+        size = self._next_id
+        lines = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        for obj_id in range(1, size):
+            lines.append(b"%010d 00000 n \n" % self._offsets[obj_id])
+        self._write(b"".join(lines))
+        self._write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_at))
+
+
+class CertificateBatch:
+    """Collects rendered certificates (add, UI thread) and writes the file (finish, any thread)."""
+
+    def __init__(self, path: str, fmt: str = "pdf", workers: int = None, level: int = 6):
+        if fmt not in CERTIFICATE_FORMATS:
+            raise ValueError(f"Unbekanntes Urkundenformat: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.level = level
+        workers = workers or min(MAX_ENCODE_WORKERS, os.cpu_count() or 1)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jontrain-encode")
+        self.workers = workers
+        self._futures = []  # in page order
+        self._settled = 0   # leading futures known to be done
+        # Unfinished jobs before busy: enough to keep every worker fed; a
+        # sheet job already holds a full sheet of certificates
+        self.max_pending = 2 * workers if fmt == "pdf" else workers
+        self._sheet = None  # zip: sheet being filled
+        self._cells = 0
+        self.size = None
+        self.count = 0
+        self.render_seconds = 0.0
+        self._t0 = time.perf_counter()
+
+    @property
+    def pending(self) -> int:
+        """Jobs not yet encoded."""
+        futures = self._futures
+        while self._settled < len(futures) and futures[self._settled].done():
+            self._settled += 1
+        return sum(not future.done() for future in futures[self._settled:])
+
+    @property
+    def busy(self) -> bool:
+        """Stop adding until this is False again (bounds the pixels held in memory)."""
+        return self.pending >= self.max_pending
+
+    def add(self, width: int, height: int, pixels, render_seconds: float = 0.0):
+        """One certificate as bottom-up RGBA; encoding starts right away."""
+        if self.size is None:
+            self.size = (width, height)
+        elif self.size != (width, height):
+            raise ValueError("Alle Urkunden brauchen dieselbe Größe")
+        self.count += 1
+        self.render_seconds += render_seconds
+        if self.fmt == "pdf":
+            self._futures.append(self._pool.submit(_timed, _pdf_page_image, pixels, width, height, self.level))
+            return
+        if self._sheet is None:
+            self._sheet = new_sheet(width, height)
+        put_tile(self._sheet, pixels, self._cells, width, height)
+        self._cells += 1
+        if self._cells == SHEET_COLS * SHEET_ROWS:
+            self._submit_sheet()
+
+    def _submit_sheet(self):
+        sheet, rows = self._sheet, -(-self._cells // SHEET_COLS)
+        self._sheet, self._cells = None, 0
+        width, height = self.size
+        self._futures.append(self._pool.submit(_timed, _png_sheet, sheet, rows, width, height, self.level))
+
+    def cancel(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def finish(self) -> dict:
+        """Wait for the encoders, write path and return the throughput report."""
+        if self._cells:
+            self._submit_sheet()
+        encode_seconds = 0.0
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                if self.fmt == "pdf":
+                    pdf = PdfWriter(f)
+                    for future in self._futures:
+                        data, seconds = future.result()
+                        encode_seconds += seconds
+                        pdf.add_image_page(data, *self.size)
+                    pdf.close()
+                else:
+                    with zipfile.ZipFile(f, "w", zipfile.ZIP_STORED) as zf:
+                        for n, future in enumerate(self._futures, start=1):
+                            data, seconds = future.result()
+                            encode_seconds += seconds
+                            zf.writestr(f"urkunden-{n:03d}.png", data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        finally:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        elapsed = max(1e-9, time.perf_counter() - self._t0)
+        units = len(self._futures)
+        return {
+            "format": self.fmt,
+            "count": self.count,
+            "pages": units,
+            "bytes": os.path.getsize(self.path),
+            "seconds": elapsed,
+            "per_second": self.count / elapsed,
+            "render_ms": 1000.0 * self.render_seconds / max(1, self.count),
+            "encode_ms": 1000.0 * encode_seconds / max(1, units),
+            "workers": self.workers,
+        }
+
+
+def format_report(report: dict) -> str:
+    one, many = ("Seite", "Seiten") if report["format"] == "pdf" else ("Bogen", "Bögen")
+    text = (
+        f"{report['count']} Urkunden in {report['seconds']:.1f} s ({report['per_second']:.1f}/s)\n"
+        f"Rendern {report['render_ms']:.1f} ms/Urkunde, Kodieren {report['encode_ms']:.0f} ms/{one} "
+        f"({report['workers']} Threads)\n"
+        f"{report['pages']} {many}, {report['bytes'] / 1024:.0f} KiB"
+    )
+    return text.replace(".", ",")
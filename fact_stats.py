@@ -0,0 +1,220 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Per-fact learning statistics in flat arrays. Every fact of the trainer
+# (a·b, a:b, a:b with remainder) has a fixed slot, so memory depends only
+# on max_factor, never on how many sessions were played.
+
+import os
+import struct
+import sys
+from array import array
+
+from questions import MAX_FACTOR, Question
+
+# Response time histogram per fact: bucket i counts times < LATENCY_BOUNDS_MS[i],
+# the last bucket everything slower.
+LATENCY_BOUNDS_MS = (500, 1000, 2000, 4000, 8000, 16000, 32000)
+LATENCY_BUCKETS = len(LATENCY_BOUNDS_MS) + 1
+
+# Weight of the newest response time in the moving average
+EMA_ALPHA = 0.3
+
+_MAGIC = b"JTFS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")  # magic, version, max_factor, slots
+_U16_MAX = 0xFFFF
+
+
+class FactIndex:
+    """Dense slot numbers for (op, quotient or factor, factor or divisor, remainder).
+
+    mult and div use n*n slots each (a, b in 1..n; for div a is the
+    quotient). div_rest uses, per quotient, one slot per (divisor 2..n,
+    remainder 0..divisor-1).
+    """
+
+    def __init__(self, max_factor: int = MAX_FACTOR):
+        n = self.max_factor = max_factor
+        self._rest_row = n * (n + 1) // 2 - 1
+        # Offset of divisor b inside a div_rest row: 0 + 2 + 3 + ... + (b-1)
+        self._rest_col = [0] * (n + 1)
+        for b in range(3, n + 1):
+            self._rest_col[b] = self._rest_col[b - 1] + (b - 1)
+        self.offsets = {"mult": 0, "div": n * n, "div_rest": 2 * n * n}
+        self.size = 2 * n * n + n * self._rest_row
+
+    def __len__(self):
+        return self.size
+
+    def slot(self, op: str, a: int, b: int, remainder: int = 0) -> int:
+        """a: factor or quotient, b: factor or divisor. -1 outside the index."""
+        n = self.max_factor
+        if not (1 <= a <= n and 1 <= b <= n):
+            return -1
+        if op == "div_rest":
+            if b < 2 or not 0 <= remainder < b:
+                return -1
+            return self.offsets[op] + (a - 1) * self._rest_row + self._rest_col[b] + remainder
+        if op in ("mult", "div"):
+            return self.offsets[op] + (a - 1) * n + (b - 1)
+        return -1
+
+    def question_slot(self, q: Question) -> int:
+        if q.op == "mult":
+            return self.slot("mult", q.a, q.b)
+        return self.slot(q.op, q.answer[0], q.b, q.answer[1])
+
+    def keys(self):
+        """(op, a, b, remainder) for every slot, in slot order."""
+        n = self.max_factor
+        for op in ("mult", "div"):
+            for a in range(1, n + 1):
+                for b in range(1, n + 1):
+                    yield op, a, b, 0
+        for a in range(1, n + 1):
+            for b in range(2, n + 1):
+                for r in range(b):
+                    yield "div_rest", a, b, r
+
+
+def latency_bucket(ms: float) -> int:
+    for i, bound in enumerate(LATENCY_BOUNDS_MS):
+        if ms < bound:
+            return i
+    return LATENCY_BUCKETS - 1
+
+
+class FactStats:
+    """Counts, errors, response-time EMA and histogram per fact slot."""
+
+    def __init__(self, max_factor: int = MAX_FACTOR):
+        self.index = FactIndex(max_factor)
+        n = len(self.index)
+        self.seen = array("I", bytes(4 * n))
+        self.errors = array("I", bytes(4 * n))
+        self.ema_ms = array("f", bytes(4 * n))  # 0.0 until the first answer
+        self.latency = array("H", bytes(2 * n * LATENCY_BUCKETS))
+
+    def record(self, question: Question, correct: bool, response_time: float) -> int:
+        """Add one answer; returns the fact slot (-1 if outside the index)."""
+        i = self.index.question_slot(question)
+        if i < 0:
+            return i
+        ms = max(0.0, response_time * 1000.0)
+        self.seen[i] += 1
+        if not correct:
+            self.errors[i] += 1
+        prev = self.ema_ms[i]
+        self.ema_ms[i] = ms if self.seen[i] == 1 else prev + EMA_ALPHA * (ms - prev)
+
+        base = i * LATENCY_BUCKETS
+        j = base + latency_bucket(ms)
+        if self.latency[j] == _U16_MAX:
+            # Halve the whole row: keeps the shape, bounds the counters
+            for k in range(base, base + LATENCY_BUCKETS):
+                self.latency[k] >>= 1
+        self.latency[j] += 1
+        return i
+
+    def fact(self, slot: int) -> dict:
+        base = slot * LATENCY_BUCKETS
+        return {
+            "seen": self.seen[slot],
+            "errors": self.errors[slot],
+            "ema_ms": self.ema_ms[slot],
+            "latency": list(self.latency[base:base + LATENCY_BUCKETS]),
+        }
+
+    def merge(self, newer: "FactStats"):
+        """Add the answers of newer, recorded after the ones held here."""
+        if newer.index.max_factor != self.index.max_factor:
+            newer = newer.resized(self.index.max_factor)
+        for i, count in enumerate(newer.seen):
+            if not count:
+                continue
+            prev = self.ema_ms[i]
+            if self.seen[i]:
+                # count EMA steps on top of ours, approximated by newer's average
+                self.ema_ms[i] = prev + (1.0 - (1.0 - EMA_ALPHA) ** count) * (newer.ema_ms[i] - prev)
+            else:
+                self.ema_ms[i] = newer.ema_ms[i]
+            self.seen[i] += count
+            self.errors[i] += newer.errors[i]
+            base = i * LATENCY_BUCKETS
+            row = [a + b for a, b in zip(self.latency[base:base + LATENCY_BUCKETS],
+                                         newer.latency[base:base + LATENCY_BUCKETS])]
+            while max(row) > _U16_MAX:
+                row = [n >> 1 for n in row]
+            self.latency[base:base + LATENCY_BUCKETS] = array("H", row)
+
+    @property
+    def answered(self) -> int:
+        return sum(self.seen)
+
+    # -------------------------
+    # Persistence (little-endian binary, written next to the highscores)
+    # -------------------------
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(_MAGIC, _VERSION, self.index.max_factor, len(self.index))]
+        for arr in (self.seen, self.errors, self.ema_ms, self.latency):
+            if sys.byteorder == "big":
+                arr = array(arr.typecode, arr)
+                arr.byteswap()
+            parts.append(arr.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_factor: int = MAX_FACTOR) -> "FactStats":
+        """Parse to_bytes() output; facts outside max_factor are dropped."""
+        magic, version, stored_factor, slots = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Unbekanntes Format der Aufgabenstatistik")
+        stored = cls(stored_factor)
+        if len(stored.index) != slots:
+            raise ValueError("Aufgabenstatistik beschädigt")
+        pos = _HEADER.size
+        for arr in (stored.seen, stored.errors, stored.ema_ms, stored.latency):
+            size = len(arr) * arr.itemsize
+            chunk = array(arr.typecode, data[pos:pos + size])
+            if len(chunk) != len(arr):
+                raise ValueError("Aufgabenstatistik beschädigt")
+            if sys.byteorder == "big":
+                chunk.byteswap()
+            arr[:] = chunk
+            pos += size
+        if stored_factor == max_factor:
+            return stored
+        return stored.resized(max_factor)
+
+    def resized(self, max_factor: int) -> "FactStats":
+        """Copy into an index for another max_factor (common facts keep their data)."""
+        out = FactStats(max_factor)
+        for old, key in enumerate(self.index.keys()):
+            new = out.index.slot(*key)
+            if new < 0:
+                continue
+            out.seen[new] = self.seen[old]
+            out.errors[new] = self.errors[old]
+            out.ema_ms[new] = self.ema_ms[old]
+            out.latency[new * LATENCY_BUCKETS:(new + 1) * LATENCY_BUCKETS] = \
+                self.latency[old * LATENCY_BUCKETS:(old + 1) * LATENCY_BUCKETS]
+        return out
+
+
+def load_fact_stats(path: str, max_factor: int = MAX_FACTOR) -> FactStats:
+    """Stats from path; a fresh store when the file is missing or unreadable."""
+    try:
+        with open(path, "rb") as f:
+            return FactStats.from_bytes(f.read(), max_factor)
+    except Exception:
+        return FactStats(max_factor)
+
+
+def save_fact_stats(path: str, data: bytes):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
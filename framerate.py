@@ -0,0 +1,80 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Frame-rate governor: the main loop runs at the active rate only while
+# something happens (touches, feedback, popups) and drops to a low idle
+# rate afterwards. Kivy only redraws when a canvas changed, so what the
+# idle rate saves are the loop wakeups (input polling, clock ticks).
+# A touch waits for the loop to wake up, so screens that are tapped
+# constantly (the training keypad) idle at a higher rate.
+
+import time
+
+ACTIVE_FPS = 60
+IDLE_FPS = 6          # worst case ~170 ms until the first touch after idling is handled
+INTERACTIVE_IDLE_FPS = 30  # ... ~33 ms on interactive screens
+ACTIVE_HOLD = 2.0     # seconds at the active rate after the last wake()
+
+
+class FrameGovernor:
+    """apply_fps(fps) sets the loop limit; schedule(fn, delay) runs fn once later."""
+
+    def __init__(self, apply_fps, schedule, idle_fps: float = IDLE_FPS, active_fps: float = ACTIVE_FPS,
+                 hold: float = ACTIVE_HOLD, clock=time.monotonic, interactive_idle_fps: float = INTERACTIVE_IDLE_FPS):
+        self._apply_fps = apply_fps
+        self._schedule = schedule
+        self.idle_fps = idle_fps
+        self.interactive_idle_fps = interactive_idle_fps
+        self.interactive = False
+        self.active_fps = active_fps
+        self.hold = hold
+        self._clock = clock
+        self._active_until = 0.0
+        self._armed = False
+        self.enabled = True
+        self.fps = None
+        self._set(active_fps)
+
+    def _set(self, fps: float):
+        if fps != self.fps:
+            self.fps = fps
+            self._apply_fps(fps)
+
+    def wake(self, hold: float = None):
+        """Run at the active rate for at least hold seconds from now."""
+        until = self._clock() + (self.hold if hold is None else hold)
+        if until > self._active_until:
+            self._active_until = until
+        self._set(self.active_fps)
+        if self.enabled and not self._armed:
+            self._armed = True
+            self._schedule(self._expire, self._active_until - self._clock())
+
+    def _expire(self):
+        self._armed = False
+        remaining = self._active_until - self._clock()
+        if not self.enabled:
+            return
+        if remaining > 0:
+            # Woken again meanwhile: sleep until the newer deadline
+            self._armed = True
+            self._schedule(self._expire, remaining)
+        else:
+            self._set(self._idle_rate())
+
+    def _idle_rate(self) -> float:
+        return self.interactive_idle_fps if self.interactive else self.idle_fps
+
+    def set_interactive(self, interactive: bool):
+        """Idle at interactive_idle_fps while a screen waits for taps."""
+        self.interactive = interactive
+        if self.enabled and not self._armed:
+            self._set(self._idle_rate())  # already idle: switch now
+
+    def set_enabled(self, enabled: bool):
+        """Disabled keeps the active rate permanently (for comparisons)."""
+        self.enabled = enabled
+        if enabled:
+            self.wake()
+        else:
+            self._set(self.active_fps)
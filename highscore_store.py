@@ -0,0 +1,356 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Highscore persistence helpers: crash-safe snapshot writes and an
+# append-only journal for new entries between snapshots.
+
+import functools
+import json
+import os
+import re
+import threading
+import uuid
+from bisect import insort
+from datetime import datetime
+
+
+def insert_highscore(highscores: dict, category: str, entry: dict, keep: int):
+    """Add entry to the top list of category (best first, ties keep insertion order)."""
+    scores = highscores.setdefault(category, [])
+    # Bisect instead of a full sort; insort places ties after the existing ones
+    insort(scores, entry, key=lambda x: -x.get("points", 0))
+    del scores[keep:]
+
+
+def new_generation() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def _fsync_dir(path: str):
+    # Make the rename itself durable (not supported on every platform)
+    try:
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except Exception:
+        return
+    try:
+        os.fsync(fd)
+    except Exception:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path: str, obj):
+    """Write obj to path via temp file + rename, so readers never see a partial file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=4, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(path)
+
+
+class HighscoreJournal:
+    """Append-only log of highscore entries added since the last snapshot.
+
+    Every record carries the generation of the snapshot it belongs to, so a
+    crash between writing a new snapshot and truncating the journal can never
+    replay entries twice.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.generation = None
+        self.pending = 0
+        self._torn_tail = False
+
+    def replay(self, generation, apply) -> int:
+        """Call apply(category, entry) for every record of generation."""
+        self.generation = generation
+        self.pending = 0
+        self._torn_tail = False
+        if generation is None or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except Exception:
+            return 0
+
+        self._torn_tail = bool(lines) and not lines[-1].endswith("\n")
+        for line in lines:
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue  # torn write at power loss
+            if not isinstance(rec, dict) or rec.get("g") != generation:
+                continue
+            category, entry = rec.get("c"), rec.get("e")
+            if isinstance(category, str) and isinstance(entry, dict):
+                apply(category, entry)
+                self.pending += 1
+        return self.pending
+
+    def append(self, category: str, entry: dict):
+        line = json.dumps({"g": self.generation, "c": category, "e": entry}, ensure_ascii=False, separators=(",", ":"))
+        if self._torn_tail:
+            line = "\n" + line
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._torn_tail = False
+        self.pending += 1
+
+    def reset(self, generation: str):
+        """Start an empty journal for a freshly written snapshot."""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.generation = generation
+        self.pending = 0
+        self._torn_tail = False
+
+
+# -------------------------
+# Full history (SQLite, optional)
+# -------------------------
+try:
+    import sqlite3
+except Exception:  # e.g. python-for-android build without the sqlite3 recipe
+    sqlite3 = None
+
+_ENTRY_DATE_FORMAT = "%d.%m.%Y %H:%M"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    app_version TEXT,
+    schema_version TEXT
+);
+CREATE INDEX IF NOT EXISTS scores_rank ON scores (category, points DESC, id);
+CREATE INDEX IF NOT EXISTS scores_name ON scores (category, name);
+CREATE INDEX IF NOT EXISTS scores_ts ON scores (category, ts);
+-- Entries per distinct score (a few hundred rows per category), kept by triggers
+CREATE TABLE IF NOT EXISTS score_counts (
+    category TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (category, points)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS score_counts_add AFTER INSERT ON scores BEGIN
+    INSERT OR IGNORE INTO score_counts (category, points, n) VALUES (NEW.category, NEW.points, 0);
+    UPDATE score_counts SET n = n + 1 WHERE category = NEW.category AND points = NEW.points;
+END;
+CREATE TRIGGER IF NOT EXISTS score_counts_remove AFTER DELETE ON scores BEGIN
+    UPDATE score_counts SET n = n - 1 WHERE category = OLD.category AND points = OLD.points;
+    DELETE FROM score_counts WHERE category = OLD.category AND points = OLD.points AND n <= 0;
+END;
+"""
+
+
+def _locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _sortable_date(date: str) -> str:
+    try:
+        return datetime.strptime(date, _ENTRY_DATE_FORMAT).strftime("%Y-%m-%d %H:%M")
+    except Exception:
+        return ""
+
+
+def parse_highscore_filter(text: str):
+    """Search text -> (name prefix, date prefix "YYYY-MM-DD"/"YYYY-MM"/"YYYY").
+
+    Dates are typed German style (TT.MM.JJJJ, MM.JJJJ or JJJJ); anything
+    else filters by the start of the player name.
+    """
+    text = (text or "").strip()
+    m = re.fullmatch(r"(\d{1,2})\.(\d{1,2})\.(\d{4})", text)
+    if m:
+        return "", f"{m.group(3)}-{int(m.group(2)):02d}-{int(m.group(1)):02d}"
+    m = re.fullmatch(r"(\d{1,2})\.(\d{4})", text)
+    if m:
+        return "", f"{m.group(2)}-{int(m.group(1)):02d}"
+    if re.fullmatch(r"\d{4}", text):
+        return "", text
+    return text, ""
+
+
+def entry_matches(entry: dict, name: str = "", ts_prefix: str = "") -> bool:
+    """In-memory counterpart of the database filter."""
+    if name and not str(entry.get("name", "")).casefold().startswith(name.casefold()):
+        return False
+    return not ts_prefix or _sortable_date(str(entry.get("date", ""))).startswith(ts_prefix)
+
+
+def _filter_sql(name: str, ts_prefix: str):
+    sql, args = "", []
+    if name:
+        escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        sql += " AND name LIKE ? ESCAPE '\\'"
+        args.append(escaped + "%")
+    if ts_prefix:
+        # ts is "YYYY-MM-DD HH:MM"; "~" sorts after every character in it
+        sql += " AND ts >= ? AND ts < ?"
+        args += [ts_prefix, ts_prefix + "~"]
+    return sql, args
+
+
+class HighscoreDatabase:
+    """Every saved session, indexed for top-N and rank queries per category.
+
+    Ties on points rank the earlier session first, like the stable sort of
+    the JSON top list.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Written by the persistence thread, read by backup export
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        # Databases from before score_counts: fill it once from the history
+        if self.conn.execute("SELECT 1 FROM score_counts LIMIT 1").fetchone() is None:
+            self.conn.execute(
+                "INSERT INTO score_counts (category, points, n) "
+                "SELECT category, points, COUNT(*) FROM scores GROUP BY category, points"
+            )
+        self.conn.commit()
+
+    @_locked
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _row_to_entry(row) -> dict:
+        entry_id, name, points, date, app_version, schema_version = row
+        entry = {"id": entry_id, "name": name, "points": points, "date": date}
+        if app_version is not None:
+            entry["app_version"] = app_version
+        if schema_version is not None:
+            entry["schema_version"] = schema_version
+        return entry
+
+    def _insert(self, category: str, entry: dict) -> int:
+        date = str(entry.get("date", ""))
+        cur = self.conn.execute(
+            "INSERT INTO scores (category, name, points, date, ts, app_version, schema_version) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                category,
+                str(entry.get("name", "Anonym")),
+                int(entry.get("points", 0)),
+                date,
+                _sortable_date(date),
+                entry.get("app_version"),
+                entry.get("schema_version"),
+            ),
+        )
+        return cur.lastrowid
+
+    @_locked
+    def add(self, category: str, entry: dict) -> int:
+        with self.conn:
+            return self._insert(category, entry)
+
+    @_locked
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM scores LIMIT 1").fetchone() is None
+
+    @_locked
+    def replace_all(self, data: dict):
+        """Replace the whole history with {category: [entry, ...]}."""
+        with self.conn:
+            self.conn.execute("DELETE FROM scores")
+            for category, entries in data.items():
+                # Lists are best first; inserting in that order keeps ties ordered by id
+                for entry in entries:
+                    if isinstance(entry, dict):
+                        self._insert(category, entry)
+
+    @_locked
+    def count(self, category: str, name: str = "", ts_prefix: str = "") -> int:
+        if not (name or ts_prefix):
+            # One row per distinct score instead of a scan over the category
+            return self.conn.execute(
+                "SELECT COALESCE(SUM(n), 0) FROM score_counts WHERE category = ?", (category,)
+            ).fetchone()[0]
+        where, args = _filter_sql(name, ts_prefix)
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM scores WHERE category = ?" + where, (category, *args)
+        ).fetchone()[0]
+
+    @_locked
+    def top(self, category: str, n: int, offset: int = 0, name: str = "", ts_prefix: str = "") -> list:
+        where, args = _filter_sql(name, ts_prefix)
+        rows = self.conn.execute(
+            "SELECT id, name, points, date, app_version, schema_version FROM scores "
+            "WHERE category = ?" + where + " ORDER BY points DESC, id LIMIT ? OFFSET ?",
+            (category, *args, n, offset),
+        ).fetchall()
+        return [self._row_to_entry(r) for r in rows]
+
+    @_locked
+    def page(self, category: str, n: int, offset: int = 0, name: str = "", ts_prefix: str = "") -> list:
+        """(overall rank, entry) for one page of the (filtered) list."""
+        entries = self.top(category, n, offset, name, ts_prefix)
+        if not (name or ts_prefix):
+            return [(offset + i + 1, entry) for i, entry in enumerate(entries)]
+        # Filtered rows keep their place in the full list: one rank() per row
+        return [(self.rank(category, entry["id"]), entry) for entry in entries]
+
+    @_locked
+    def rank(self, category: str, entry_id: int) -> int:
+        """1-based rank of a stored entry (0 if unknown)."""
+        row = self.conn.execute("SELECT points FROM scores WHERE id = ? AND category = ?", (entry_id, category)).fetchone()
+        if row is None:
+            return 0
+        # Better entries: a sum over score_counts (one row per distinct score)
+        # instead of counting them one by one on scores_rank; earlier ties are
+        # still a range on scores_rank, bounded by the entries with this score
+        higher = self.conn.execute(
+            "SELECT COALESCE(SUM(n), 0) FROM score_counts WHERE category = ? AND points > ?", (category, row[0])
+        ).fetchone()[0]
+        tied_before = self.conn.execute(
+            "SELECT COUNT(*) FROM scores WHERE category = ? AND points = ? AND id < ?", (category, row[0], entry_id)
+        ).fetchone()[0]
+        return higher + tied_before + 1
+
+    @_locked
+    def history(self) -> dict:
+        """All entries per category, best first (for backups)."""
+        out = {}
+        rows = self.conn.execute(
+            "SELECT category, id, name, points, date, app_version, schema_version FROM scores "
+            "ORDER BY category, points DESC, id"
+        )
+        for row in rows:
+            entry = self._row_to_entry(row[1:])
+            entry.pop("id", None)
+            out.setdefault(row[0], []).append(entry)
+        return out
+
+
+def open_highscore_database(path: str):
+    """HighscoreDatabase at path, or None when SQLite is unavailable."""
+    if sqlite3 is None:
+        return None
+    try:
+        return HighscoreDatabase(path)
+    except Exception:
+        return None
@@ -0,0 +1,224 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Lightweight timing helpers (no Kivy imports).
+
+import time
+from array import array
+from contextlib import contextmanager
+
+
+class StartupTimeline:
+    """Cold-start phases relative to process start (first import of main)."""
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self.t0 = clock()
+        self.phases = []  # (name, start offset s, duration s)
+
+    def now(self) -> float:
+        return self._clock() - self.t0
+
+    def add(self, name: str, start: float, duration: float):
+        self.phases.append((name, start, duration))
+
+    def mark(self, name: str):
+        """Zero-length milestone (e.g. first frame)."""
+        self.add(name, self.now(), 0.0)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.add(name, start, self.now() - start)
+
+    def report(self) -> str:
+        lines = [f"{'Phase':<22}{'Start':>10}{'Dauer':>10}"]
+        for name, start, duration in self.phases:
+            lines.append(f"{name:<22}{start * 1000:8.1f}ms{duration * 1000:8.1f}ms")
+        return "\n".join(lines)
+
+
+class FrameMeter:
+    """Drawn frames, loop ticks and process CPU time over a measuring window.
+
+    tick_counter() returns a running count of main-loop iterations (the
+    app passes Clock.frames); frame() is called once per drawn frame and
+    touch(delay) once per touch with the seconds it waited for its handler.
+    """
+
+    def __init__(self, tick_counter=None, clock=time.perf_counter, cpu_clock=time.process_time):
+        self._tick_counter = tick_counter
+        self._clock = clock
+        self._cpu_clock = cpu_clock
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.touches = 0
+        self._touch_sum = 0.0
+        self._touch_max = 0.0
+        self._t0 = self._clock()
+        self._cpu0 = self._cpu_clock()
+        self._ticks0 = self._tick_counter() if self._tick_counter else 0
+
+    def frame(self, *_):
+        self.frames += 1
+
+    def touch(self, delay: float):
+        self.touches += 1
+        self._touch_sum += delay
+        self._touch_max = max(self._touch_max, delay)
+
+    def sample(self) -> dict:
+        elapsed = max(1e-9, self._clock() - self._t0)
+        ticks = (self._tick_counter() - self._ticks0) if self._tick_counter else 0
+        cpu = self._cpu_clock() - self._cpu0
+        return {
+            "seconds": elapsed,
+            "fps": self.frames / elapsed,
+            "ticks_per_s": ticks / elapsed,
+            "cpu_seconds": cpu,
+            "cpu_percent": 100.0 * cpu / elapsed,
+            "touches": self.touches,
+            "touch_ms": 1000.0 * self._touch_sum / max(1, self.touches),
+            "touch_max_ms": 1000.0 * self._touch_max,
+        }
+
+    def report(self) -> str:
+        s = self.sample()
+        text = (
+            f"{s['seconds']:.0f} s: {s['fps']:.1f} Bilder/s, {s['ticks_per_s']:.1f} Ticks/s, "
+            f"CPU {s['cpu_seconds']:.2f} s ({s['cpu_percent']:.1f} %)"
+        )
+        if s["touches"]:
+            text += f", Touch bis Handler {s['touch_ms']:.0f} ms (max {s['touch_max_ms']:.0f} ms)"
+        return text
+
+
+# -------------------------
+# Latency tracing (opt-in)
+# -------------------------
+# Log-bucketed: 4 buckets per power of two (<= 25 % relative error),
+# 1 ns .. ~36 min, so a histogram never grows beyond HISTOGRAM_BUCKETS counters.
+_SUB_BITS = 2
+_SUB = 1 << _SUB_BITS
+HISTOGRAM_BUCKETS = 40 * _SUB
+
+
+def _bucket(ns: int) -> int:
+    if ns < _SUB:
+        return max(0, ns)
+    e = ns.bit_length() - 1
+    return min(HISTOGRAM_BUCKETS - 1, (e - _SUB_BITS + 1) * _SUB + ((ns >> (e - _SUB_BITS)) & (_SUB - 1)))
+
+
+def _bucket_upper(index: int) -> int:
+    """Largest value (ns) that lands in bucket index."""
+    if index < _SUB:
+        return index
+    e = index // _SUB + _SUB_BITS - 1
+    sub = index % _SUB
+    return ((_SUB + sub + 1) << (e - _SUB_BITS)) - 1
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * HISTOGRAM_BUCKETS))
+        self.total = 0
+        self.max_ns = 0
+        self.sum_ns = 0
+
+    def record(self, ns: int):
+        self.counts[_bucket(ns)] += 1
+        self.total += 1
+        self.sum_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def quantile(self, q: float) -> int:
+        """Upper bound (ns) of the bucket holding the q-quantile; 0 when empty."""
+        if not self.total:
+            return 0
+        rank = max(1, int(q * self.total + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.total,
+            "mean_ns": self.sum_ns // self.total if self.total else 0,
+            "max_ns": self.max_ns,
+            "p50_ns": self.quantile(0.50),
+            "p95_ns": self.quantile(0.95),
+            "p99_ns": self.quantile(0.99),
+            # Sparse: {bucket upper bound ns: count}
+            "buckets": {str(_bucket_upper(i)): n for i, n in enumerate(self.counts) if n},
+        }
+
+
+class LatencyTracer:
+    """Per-stage timings of one interaction, from begin() to close().
+
+    Every mark(stage) records the time since the previous mark; close()
+    records the last stage and "total" since begin(). While disabled all
+    calls return immediately.
+    """
+
+    def __init__(self, enabled: bool = False, clock_ns=time.perf_counter_ns):
+        self.enabled = enabled
+        self._clock_ns = clock_ns
+        self.histograms = {}  # stage -> LatencyHistogram (fixed set of stage names)
+        self._t0 = None
+        self._last = 0
+
+    @property
+    def active(self) -> bool:
+        return self._t0 is not None
+
+    def _record(self, stage: str, ns: int):
+        hist = self.histograms.get(stage)
+        if hist is None:
+            hist = self.histograms[stage] = LatencyHistogram()
+        hist.record(ns)
+
+    def begin(self):
+        if self.enabled:
+            self._t0 = self._last = self._clock_ns()
+
+    def mark(self, stage: str):
+        if self._t0 is None:
+            return
+        now = self._clock_ns()
+        self._record(stage, now - self._last)
+        self._last = now
+
+    def close(self, stage: str) -> bool:
+        """End the open trace with stage. Returns False when none was open."""
+        if self._t0 is None:
+            return False
+        self.mark(stage)
+        self._record("total", self._last - self._t0)
+        self._t0 = None
+        return True
+
+    def report(self) -> str:
+        lines = [f"{'Stufe':<16}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}"]
+        for stage, hist in self.histograms.items():
+            lines.append(
+                f"{stage:<16}{hist.total:>6}"
+                f"{hist.quantile(0.50) / 1e6:7.2f}ms{hist.quantile(0.95) / 1e6:7.2f}ms{hist.quantile(0.99) / 1e6:7.2f}ms"
+            )
+        return "\n".join(lines)
+
+    def snapshot(self, **meta) -> dict:
+        """JSON-ready copy of all histograms (safe to write from another thread)."""
+        data = dict(meta)
+        data["stages"] = {stage: hist.to_dict() for stage, hist in self.histograms.items()}
+        return data
@@ -0,0 +1,98 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Ranked leaderboard: entries of one category, best first. A sorted list of
+# (-points, id) keys is bisected, so insert, remove and rank queries need
+# O(log n) comparisons (plus one C-level list move) instead of a full sort.
+
+from bisect import bisect_left, insort
+from typing import List, Optional, Tuple
+
+
+class Leaderboard:
+    """Entries ranked by points; ties keep insertion order (earlier first).
+
+    Every entry gets an id at insert(). Ids are handed out in insertion
+    order, never reused and independent of the entry's contents, so they
+    identify an entry across re-rankings (two equal dicts stay apart).
+    With keep, only the best keep entries are held.
+    """
+
+    def __init__(self, entries=(), keep: Optional[int] = None):
+        self.keep = keep
+        self._keys = []     # (-points, id), ascending = best first
+        self._entries = {}  # id -> (key, entry)
+        self._next_id = 1
+        for entry in entries:
+            self.insert(entry)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._entries
+
+    def insert(self, entry: dict) -> Optional[int]:
+        """Add entry; returns its id, or None when it did not make the kept list."""
+        entry_id = self._next_id
+        self._next_id += 1
+        key = (-int(entry.get("points", 0)), entry_id)
+        keys = self._keys
+        if self.keep is not None and len(keys) >= self.keep and (not keys or key > keys[-1]):
+            return None
+        if not keys or key > keys[-1]:
+            keys.append(key)  # loading a best-first list: no search needed
+        else:
+            insort(keys, key)
+        self._entries[entry_id] = (key, entry)
+        if self.keep is not None and len(keys) > self.keep:
+            del self._entries[keys.pop()[1]]
+        return entry_id
+
+    def remove(self, entry_id: int) -> Optional[dict]:
+        item = self._entries.pop(entry_id, None)
+        if item is None:
+            return None
+        key, entry = item
+        del self._keys[bisect_left(self._keys, key)]
+        return entry
+
+    def entry(self, entry_id: int) -> Optional[dict]:
+        item = self._entries.get(entry_id)
+        return item[1] if item is not None else None
+
+    def rank_of(self, entry_id: int) -> int:
+        """1-based rank (0 if the id is not on the board)."""
+        item = self._entries.get(entry_id)
+        if item is None:
+            return 0
+        return bisect_left(self._keys, item[0]) + 1
+
+    def rank_for(self, points: int) -> int:
+        """Rank a new entry with points would get (after all ties)."""
+        return bisect_left(self._keys, (-int(points), self._next_id)) + 1
+
+    def rows(self, start: int, stop: int) -> List[Tuple[int, int, dict]]:
+        """(rank, id, entry) for 0-based positions start..stop-1."""
+        entries = self._entries
+        return [
+            (start + i + 1, entry_id, entries[entry_id][1])
+            for i, (_, entry_id) in enumerate(self._keys[max(0, start):stop])
+        ]
+
+    def top_k(self, k: int) -> List[dict]:
+        entries = self._entries
+        return [entries[entry_id][1] for _, entry_id in self._keys[:k]]
+
+    def page(self, number: int, size: int) -> List[Tuple[int, int, dict]]:
+        """Rows of the 0-based page number."""
+        return self.rows(number * size, (number + 1) * size)
+
+    def page_of(self, entry_id: int, size: int) -> int:
+        """0-based page holding entry_id (-1 if not on the board)."""
+        rank = self.rank_of(entry_id)
+        return (rank - 1) // size if rank else -1
+
+    def entries(self) -> List[dict]:
+        """All entries, best first."""
+        return self.top_k(len(self._keys))
@@ -1,6 +1,11 @@
 # Copyright (C) 2025 Arnd Brandes.
 # Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
 
+from instrumentation import FrameMeter, LatencyTracer, StartupTimeline
+
+# Started before the Kivy imports so the timeline covers them
+STARTUP = StartupTimeline()
+
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.textinput import TextInput
@@ -8,103 +13,93 @@ from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.popup import Popup
-from kivy.uix.widget import Widget
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.screenmanager import NoTransition, Screen, ScreenManager
 from kivy.core.window import Window
 from kivy.core.audio import SoundLoader
 from kivy.clock import Clock
-from kivy.graphics import Color, Rectangle, Line
+from kivy.core.text import Label as CoreLabel
+from kivy.logger import Logger
 from kivy.utils import platform as kivy_platform
 
-from datetime import datetime
-import math
-from random import randint
+from datetime import date, datetime
 import os
+import glob
 import json
-import webbrowser
+import copy
 import io
-import struct
-import wave
+import time
+
+from background import BackgroundJob, PersistenceWorker
+from badge import BadgeRenderer
+from badge_cache import CACHE_DIRNAME as BADGE_CACHE_DIRNAME, BadgeCache, badge_key
+from bytebridge import ByteBridge, copy_to_output_stream, probe_direct_bytes
+from certificates import CERTIFICATE_FORMATS, CertificateBatch, format_report
+from fact_stats import FactStats, load_fact_stats, save_fact_stats
+from framerate import FrameGovernor
+from highscore_store import (
+    HighscoreJournal, atomic_write_json, entry_matches, insert_highscore, new_generation, open_highscore_database,
+    parse_highscore_filter,
+)
+from leaderboard import Leaderboard
+from numberpad import NumberPad
+# Android classes and optional crypto modules resolve on first use
+from platform_bridge import ANDROID_CLASSES as JAVA, ClassRegistry, aes_gcm, jnius_jarray, pyzipper_module
+from pngwriter import encode_png
+from replay import DAILY_CATEGORY, SessionLog, build_session, daily_seed, save_session_log
+from session import FINE_COUNTDOWN_SECONDS, new_seed
+from tones import DEFAULT_TONE_VARIANT, TONE_VARIANTS, ensure_tone_file
+from typography import Typography
 
 __version__ = "0.9"
 
-# Operator glyphs (German style)
-OP_MUL = "\u00B7"  # middle dot
-OP_DIV = ":"       # colon
-
 # Highscore schema
 HIGHSCORE_SCHEMA_VERSION = "1.0"
 HIGHSCORE_FILENAME = f"highscores_schema_{HIGHSCORE_SCHEMA_VERSION}.json"
+HIGHSCORE_JOURNAL_FILENAME = f"highscores_schema_{HIGHSCORE_SCHEMA_VERSION}.journal"
+HIGHSCORE_DB_FILENAME = "highscores_history.sqlite3"
+# Per-fact answer statistics (binary, see fact_stats)
+FACT_STATS_FILENAME = "fact_stats.bin"
+# Event log of the last finished session (replayable, see replay)
+SESSION_LOG_FILENAME = "last_session.json"
+HIGHSCORE_KEEP = 10
+# Rows per page of the ranking screen (loaded on demand)
+HIGHSCORE_PAGE_SIZE = 50
+# Batch certificates: max. entries per export, render time per frame (s)
+CERTIFICATE_LIMIT = 300
+CERTIFICATE_FRAME_BUDGET = 0.012
+# Wait before rendering on while the encoders are busy (s)
+CERTIFICATE_DRAIN_WAIT = 0.02
+# Exported certificate files in user_data_dir (removed once shared / on the next export)
+CERTIFICATE_FILE_PATTERN = "jontrain-urkunden-*"
+# Fold the journal back into the snapshot after this many entries
+JOURNAL_COMPACT_EVERY = 20
+# Max. seconds to wait for pending saves on pause/exit
+PERSIST_FLUSH_TIMEOUT = 5.0
 LEGACY_HIGHSCORE_FILE = "highscores.json"
 
 # Backup settings
 BACKUP_PASSWORD = "JonTrain-Extrasicher"
 BACKUP_EXTENSION_ZIP = ".jontrain.zip"
 BACKUP_EXTENSION_AES = ".jontrain.aes"
-
-# AES Zip writer/reader
-try:
-    import pyzipper  # dependency: pyzipper
-except Exception:
-    pyzipper = None
-
-# AES-GCM fallback (uses pycryptodome)
-try:
-    from Crypto.Cipher import AES  # type: ignore
-    from Crypto.Protocol.KDF import PBKDF2  # type: ignore
-    from Crypto.Hash import SHA256  # type: ignore
-    _HAVE_PYCRYPTODOME = True
-except Exception:
-    AES = None  # type: ignore
-    PBKDF2 = None  # type: ignore
-    SHA256 = None  # type: ignore
-    _HAVE_PYCRYPTODOME = False
+# Android: encrypted backup waiting for the SAF target (streamed, then deleted)
+PENDING_BACKUP_FILENAME = "pending-backup.tmp"
 
 # Backup header (for AES-GCM fallback)
 _BACKUP_MAGIC = b"JTBK1"
 # Platform detection
 IS_ANDROID = (kivy_platform == "android")
 IS_IOS = (kivy_platform == "ios")
-_JARRAY_AVAILABLE = False
-_JBYTEARRAY_CLS = None
-
-if IS_ANDROID:
-    try:
-        from jnius import autoclass, jarray  # type: ignore
-        _JARRAY_AVAILABLE = True
-    except Exception:
-        from jnius import autoclass  # type: ignore
-        jarray = None  # type: ignore
-
-    if not _JARRAY_AVAILABLE:
-        try:
-            _JBYTEARRAY_CLS = autoclass("[B")
-        except Exception:
-            _JBYTEARRAY_CLS = None
-
-    PythonActivity = autoclass("org.kivy.android.PythonActivity")
-    Intent = autoclass("android.content.Intent")
-    String = autoclass("java.lang.String")
-    Build_VERSION = autoclass("android.os.Build$VERSION")
-    Context = autoclass("android.content.Context")
-    VibrationEffect = autoclass("android.os.VibrationEffect")
-    HapticFeedbackConstants = autoclass("android.view.HapticFeedbackConstants")
-    ClipData = autoclass("android.content.ClipData")
-
-    try:
-        VibratorManager = autoclass("android.os.VibratorManager")
-    except Exception:
-        VibratorManager = None
-
-    MediaStore_Images_Media = autoclass("android.provider.MediaStore$Images$Media")
-    MediaStore_MediaColumns = autoclass("android.provider.MediaStore$MediaColumns")
-    ContentValues = autoclass("android.content.ContentValues")
 
 if IS_IOS:
     try:
         from pyobjus import autoclass as objc_autoclass, objc_str, objc_method, NSObject  # type: ignore
+        OBJC = ClassRegistry(objc_autoclass)
         _HAVE_PYOBJUS = True
     except Exception:
         objc_autoclass = None  # type: ignore
+        OBJC = None
         objc_str = None  # type: ignore
         objc_method = None  # type: ignore
         NSObject = object  # type: ignore
@@ -134,7 +129,6 @@ if IS_IOS and _HAVE_PYOBJUS:
                     with open(path, "rb") as f:
                         data = f.read()
                     self._owner._import_backup_bytes(data)
-                    self._owner._set_about_status("Import erfolgreich. Highscores übernommen.")
                 finally:
                     try:
                         if hasattr(url, "stopAccessingSecurityScopedResource"):
@@ -151,6 +145,8 @@ if IS_IOS and _HAVE_PYOBJUS:
             except Exception:
                 pass
 
+STARTUP.add("module import", 0.0, STARTUP.now())
+
 CATEGORIES = {
     "Mal-nehmen": "mult",
     "Teilen": "div",
@@ -160,61 +156,218 @@ CATEGORIES = {
     "Alles gemischt": "all",
 }
 
+# The daily challenge has the same questions all day and can be repeated:
+# its results get their own ranking instead of inflating "Alles gemischt"
+DAILY_HIGHSCORE_CATEGORY = "daily"
+HIGHSCORE_CATEGORIES = {**CATEGORIES, "Tagesaufgabe": DAILY_HIGHSCORE_CATEGORY}
+
+
+# Vibration pattern (Android)
+VIBRATE_PULSE_MS = 140
+VIBRATE_GAP_MS = 90
+
+# Training keypad: (label, answer group) per key
+KEYPAD_ROWS = [
+    [("10", "tens"), ("20", "tens"), ("30", "tens"), ("40", "tens"), ("50", "tens"),
+     ("60", "tens"), ("70", "tens"), ("80", "tens"), ("90", "tens"), ("100", "tens")],
+    [("1", "ones"), ("2", "ones"), ("3", "ones"), ("4", "ones"),
+     ("5", "ones"), ("6", "ones"), ("7", "ones"), ("8", "ones"), ("9", "ones"), ("10", "tens")],
+    [("R0", "remainder"), ("R1", "remainder"), ("R2", "remainder"), ("R3", "remainder"),
+     ("R4", "remainder"), ("R5", "remainder"), ("R6", "remainder"), ("R7", "remainder"),
+     ("R8", "remainder"), ("R9", "remainder")],
+]
 
-def convert_to_number(value: str) -> int:
-    return int(value) if value.strip() else 0
+# Texts pre-rendered during warm-up (keypad and training controls)
+WARMUP_LABEL_TEXTS = (
+    [str(n) for n in range(1, 11)] + [str(n) for n in range(20, 101, 10)] +
+    [f"R{n}" for n in range(10)] + ["EINGABE", "LÖSCHEN", "X"]
+)
 
 
-def scale_font(base_size: int) -> int:
-    screen_width, _ = Window.size
-    scale_factor = screen_width / 600
-    return int(base_size * scale_factor)
+# Font sizes for the current window width; screens bind their widgets to it
+FONTS = Typography(Window.width)
 
 
 class MathTrainer(App):
     # Android SAF request codes
     REQ_EXPORT_BACKUP = 1101
     REQ_IMPORT_BACKUP = 1102
+    REQ_EXPORT_CERTIFICATES = 1103
 
     def build(self):
-        self.layout = BoxLayout(orientation="vertical")
+        build_start = STARTUP.now()
+        # One cached Screen per view, named like current_view
+        self.screens = ScreenManager(transition=NoTransition())
         self.current_view = "menu"  # menu/training/about/license/highscore/success/endgame
+        self.about_status_label = None
         self._popup = None
 
         self.category = None
-        self.points = 0
-        self.question = None
-        self.time_left = 300
-        self.current_question = None
-
-        self.answer = {"tens": "", "ones": "", "remainder": ""}
-        self.button_refs = {"tens": None, "ones": None, "remainder": None}
+        self.session = None
+
+        self.numpad = None
+        self._last_result = None
+        self._highscore_view = None
+        self._highscore_filter = ""
+        self._highscore_rows = []
+        self._highscore_own_key = None
+        self._highscore_page = 0
+        self._highscore_pages = 1
+        self._player_name = ""
+        self._success_entry = None
+        self._success_rank_text = ""
 
         self.last_new_entry = None
+        self._last_entry_id = None
+        self._last_db_id = None
         self._sound_success = None
         self._sound_failure = None
-        self._sounds_ready = False
-
-        self.highscores = {}
+        self._sound_specs = None
+        self._tone_sounds = {}
+
+        self.highscores = self._leaderboards(self._default_highscores_data())
+        self._highscores_loaded = False
+        self._highscores_error = None
+        self._journal = HighscoreJournal(self.get_highscore_journal_path())
+        self._score_db = None
+        self._persist = PersistenceWorker(self._dispatch_to_ui)
+        self._backup_job = None
+        self.fact_stats = FactStats()
+        self._fact_stats_dirty = False
         self.load_highscores()
+        self._persist.submit(lambda: load_fact_stats(self.get_fact_stats_path()), on_done=self._apply_fact_stats)
 
         # Android bindings
         self._activity = None
         self._vibrator = None
+        self._has_vibrator = None
+        self._vibration_effect = None
+        self._sdk_int = None
+        self._bridge = None
         if IS_ANDROID:
             try:
-                self._activity = PythonActivity.mActivity
+                self._activity = JAVA.PythonActivity.mActivity
                 self._activity.bind(on_activity_result=self._on_activity_result)
-                self._vibrator = self._get_vibrator()
             except Exception:
                 self._activity = None
-                self._vibrator = None
 
         # Back key handling (Android navigation)
         Window.bind(on_keyboard=self._on_keyboard)
 
+        # One font table update per resize (events arrive in bursts while dragging)
+        self._resize_trigger = Clock.create_trigger(self._on_window_resize)
+        Window.bind(size=lambda *_: self._resize_trigger())
+
+        # Render on demand: full frame rate only while something happens
+        self._governor = FrameGovernor(
+            self._set_max_fps,
+            lambda fn, delay: Clock.schedule_once(lambda dt: fn(), delay),
+        )
+        self._governor.set_enabled(self._frame_governor_enabled())
+        self._frame_meter = FrameMeter(lambda: Clock.frames)
+        Window.bind(
+            on_touch_down=self._wake_frames,
+            on_touch_move=self._wake_frames,
+            on_key_down=self._wake_frames,
+            on_flip=self._frame_meter.frame,
+        )
+        Window.bind(on_touch_down=self._measure_touch)
+
+        # Opt-in answer latency tracing ([debug] latency_trace = 1)
+        self._tracer = LatencyTracer(enabled=self._config_flag("debug", "latency_trace", False))
+        self._latency_overlay = None
+        if self._tracer.enabled:
+            Window.bind(on_flip=self._close_latency_trace)
+
+        self._glyph_textures = {}
+        # Badge widget trees and Fbos, built on the first share
+        self._badge_renderer = None
+        self._certificate_batch = None
+        # Shared badges by content hash; budget enforced and old files removed in the background
+        self._badge_cache = BadgeCache(os.path.join(self.user_data_dir, BADGE_CACHE_DIRNAME))
+        self._persist.submit(lambda: self._badge_cache.cleanup(legacy_dir=self.user_data_dir))
+        self._persist.submit(self._remove_certificate_files)
+        self._pending_certificates = None  # Android: file waiting for its SAF target
+        self._warmup_stages = []
+
         self.main_menu()
-        return self.layout
+        STARTUP.add("build", build_start, STARTUP.now() - build_start)
+        Clock.schedule_once(self._start_warmup)
+        return self.screens
+
+    # -------------------------
+    # Startup warm-up (one stage per frame, after the first frame)
+    # -------------------------
+    def _start_warmup(self, _dt=None):
+        STARTUP.mark("first frame")
+        self._warmup_stages = [
+            ("vibrator", self._warm_vibrator),
+            ("tone files", self._warm_tone_files),
+            ("sounds", self._ensure_feedback_sounds),
+            ("label textures", self._warm_label_textures),
+        ]
+        Clock.schedule_once(self._run_next_warmup_stage)
+
+    def _run_next_warmup_stage(self, _dt=None):
+        if not self._warmup_stages:
+            STARTUP.mark("warm-up done")
+            Logger.info("JonTrain: Startup-Timeline\n" + STARTUP.report())
+            return
+        name, fn = self._warmup_stages.pop(0)
+        start = STARTUP.now()
+        try:
+            continues_later = fn()
+        except Exception as e:
+            Logger.warning(f"JonTrain: Warm-up '{name}' fehlgeschlagen: {e}")
+            continues_later = False
+        if not continues_later:
+            STARTUP.add(f"warm-up {name}", start, STARTUP.now() - start)
+            Clock.schedule_once(self._run_next_warmup_stage)
+
+    def _warm_vibrator(self):
+        if not IS_ANDROID or not self._activity:
+            return
+        self._vibrator = self._get_vibrator()
+        try:
+            self._has_vibrator = bool(self._vibrator) and (
+                not hasattr(self._vibrator, "hasVibrator") or bool(self._vibrator.hasVibrator())
+            )
+        except Exception:
+            self._has_vibrator = bool(self._vibrator)
+        if self._android_sdk_int() >= 26:
+            try:
+                self._vibration_effect = JAVA.VibrationEffect.createOneShot(
+                    VIBRATE_PULSE_MS, JAVA.VibrationEffect.DEFAULT_AMPLITUDE
+                )
+            except Exception:
+                self._vibration_effect = None
+
+    def _warm_tone_files(self):
+        # WAV generation is file I/O: persistence thread, then continue the chain
+        start = STARTUP.now()
+        specs = TONE_VARIANTS[self._tone_variant()]
+
+        def _write():
+            for spec in specs:
+                ensure_tone_file(self.user_data_dir, spec)
+
+        def _done(_result):
+            STARTUP.add("warm-up tone files", start, STARTUP.now() - start)
+            Clock.schedule_once(self._run_next_warmup_stage)
+
+        self._persist.submit(_write, on_done=_done, on_error=_done)
+        return True
+
+    def _warm_label_textures(self):
+        # Loads the font at the training sizes and keeps the keypad glyphs
+        for base_size in (16, 24):
+            font_size = FONTS.size(base_size)
+            for text in WARMUP_LABEL_TEXTS:
+                key = (text, font_size)
+                if key not in self._glyph_textures:
+                    label = CoreLabel(text=text, font_size=font_size)
+                    label.refresh()
+                    self._glyph_textures[key] = label.texture
 
     # -------------------------
     # Android Back key / Navigation
@@ -233,6 +386,10 @@ class MathTrainer(App):
             self._popup = None
             return True
 
+        # A running backup export/import is cancelled first
+        if self.cancel_backup_job():
+            return True
+
         if self.current_view == "training":
             self.confirm_end_training()
             return True
@@ -256,16 +413,52 @@ class MathTrainer(App):
 
         return False
 
+    # -------------------------
+    # Frame-rate governor
+    # -------------------------
+    @staticmethod
+    def _set_max_fps(fps):
+        # Same limit as the graphics/maxfps setting, changed at runtime
+        Clock._max_fps = float(fps)
+
+    def _config_flag(self, section: str, key: str, default: bool) -> bool:
+        try:
+            return self.config.getboolean(section, key)
+        except Exception:
+            return default
+
+    def _frame_governor_enabled(self) -> bool:
+        return self._config_flag("display", "frame_governor", True)
+
+    def _wake_frames(self, *_):
+        # Bound to Window input events: never consumes them
+        self._governor.wake()
+
+    def _measure_touch(self, *_):
+        # The touch arrived during the loop's last sleep at the latest: the
+        # gap since the previous tick plus this tick so far bounds its wait
+        self._frame_meter.touch(Clock.frametime + (Clock.time() - Clock.get_time()))
+
+    def on_resume(self):
+        self._governor.wake()
+        if self.current_view == "training" and self.session and self.session.paused:
+            self.session.resume()
+            self._schedule_timer()
+
+    def _dispatch_to_ui(self, fn):
+        # Thread-safe: run fn on the Kivy main thread with the next frame
+        Clock.schedule_once(lambda dt: fn())
+
     # -------------------------
     # Dialog helpers
     # -------------------------
     def _show_confirm(self, title: str, message: str, on_yes, on_no=None):
         content = BoxLayout(orientation="vertical", spacing=10, padding=10)
-        content.add_widget(Label(text=message, font_size=scale_font(22)))
+        content.add_widget(Label(text=message, font_size=FONTS.size(22)))
 
-        btn_row = BoxLayout(size_hint_y=None, height=scale_font(60), spacing=10)
-        yes_btn = Button(text="Ja", font_size=scale_font(22))
-        no_btn = Button(text="Nein", font_size=scale_font(22))
+        btn_row = BoxLayout(size_hint_y=None, height=FONTS.size(60), spacing=10)
+        yes_btn = Button(text="Ja", font_size=FONTS.size(22))
+        no_btn = Button(text="Nein", font_size=FONTS.size(22))
 
         def _dismiss(*_):
             if self._popup:
@@ -294,6 +487,7 @@ class MathTrainer(App):
             auto_dismiss=False,
         )
         self._popup.open()
+        self._governor.wake()
 
     def confirm_end_training(self):
         self._show_confirm(
@@ -312,18 +506,23 @@ class MathTrainer(App):
     # -------------------------
     # Vibration (Android)
     # -------------------------
+    def _android_sdk_int(self) -> int:
+        if self._sdk_int is None:
+            try:
+                self._sdk_int = int(JAVA.Build_VERSION.SDK_INT)
+            except Exception:
+                self._sdk_int = 0
+        return self._sdk_int
+
     def _get_vibrator(self):
         if not IS_ANDROID or not self._activity:
             return None
-        try:
-            api = int(Build_VERSION.SDK_INT)
-        except Exception:
-            api = 0
+        api = self._android_sdk_int()
 
         vib = None
-        if api >= 31 and VibratorManager is not None:
+        if api >= 31 and JAVA.VibratorManager is not None:
             try:
-                mgr = self._activity.getSystemService(Context.VIBRATOR_MANAGER_SERVICE)
+                mgr = self._activity.getSystemService(JAVA.Context.VIBRATOR_MANAGER_SERVICE)
                 if mgr:
                     vib = mgr.getDefaultVibrator()
             except Exception:
@@ -331,7 +530,7 @@ class MathTrainer(App):
 
         if vib is None:
             try:
-                vib = self._activity.getSystemService(Context.VIBRATOR_SERVICE)
+                vib = self._activity.getSystemService(JAVA.Context.VIBRATOR_SERVICE)
             except Exception:
                 vib = None
 
@@ -342,7 +541,7 @@ class MathTrainer(App):
             return False
         try:
             view = self._activity.getWindow().getDecorView()
-            return bool(view.performHapticFeedback(HapticFeedbackConstants.KEYBOARD_TAP))
+            return bool(view.performHapticFeedback(JAVA.HapticFeedbackConstants.KEYBOARD_TAP))
         except Exception:
             return False
 
@@ -353,7 +552,7 @@ class MathTrainer(App):
         if not IS_IOS or not _HAVE_PYOBJUS:
             return False
         try:
-            UIApplication = objc_autoclass("UIApplication")
+            UIApplication = OBJC.get("UIApplication")
             app = UIApplication.sharedApplication()
             window = app.keyWindow()
             if window is None:
@@ -374,7 +573,7 @@ class MathTrainer(App):
         if not IS_IOS or not _HAVE_PYOBJUS:
             return False
         try:
-            UINotificationFeedbackGenerator = objc_autoclass("UINotificationFeedbackGenerator")
+            UINotificationFeedbackGenerator = OBJC.get("UINotificationFeedbackGenerator")
             gen = UINotificationFeedbackGenerator.alloc().init()
             gen.prepare()
             # 0 = Success, 1 = Warning, 2 = Error
@@ -387,9 +586,9 @@ class MathTrainer(App):
         if not IS_IOS or not _HAVE_PYOBJUS:
             return False
         try:
-            UIImage = objc_autoclass("UIImage")
-            UIActivityViewController = objc_autoclass("UIActivityViewController")
-            NSArray = objc_autoclass("NSArray")
+            UIImage = OBJC.get("UIImage")
+            UIActivityViewController = OBJC.get("UIActivityViewController")
+            NSArray = OBJC.get("NSArray")
             image = UIImage.imageWithContentsOfFile_(objc_str(path))
             if image is None:
                 return False
@@ -403,9 +602,9 @@ class MathTrainer(App):
         if not IS_IOS or not _HAVE_PYOBJUS:
             return False
         try:
-            NSURL = objc_autoclass("NSURL")
-            UIActivityViewController = objc_autoclass("UIActivityViewController")
-            NSArray = objc_autoclass("NSArray")
+            NSURL = OBJC.get("NSURL")
+            UIActivityViewController = OBJC.get("UIActivityViewController")
+            NSArray = OBJC.get("NSArray")
             url = NSURL.fileURLWithPath_(objc_str(path))
             items = NSArray.arrayWithObject_(url)
             vc = UIActivityViewController.alloc().initWithActivityItems_applicationActivities_(items, None)
@@ -420,28 +619,21 @@ class MathTrainer(App):
         if not IS_ANDROID:
             return False
 
-        if not self._vibrator:
-            self._vibrator = self._get_vibrator()
-        if not self._vibrator:
+        if self._has_vibrator is None:
+            # Warm-up has not run yet
+            self._warm_vibrator()
+        if not self._has_vibrator:
             return self._try_haptic_feedback()
 
-        try:
-            if hasattr(self._vibrator, "hasVibrator") and not self._vibrator.hasVibrator():
-                return self._try_haptic_feedback()
-        except Exception:
-            pass
-
-        pulse_ms = 140
-        gap_ms = 90
+        pulse_ms = VIBRATE_PULSE_MS
+        gap_ms = VIBRATE_GAP_MS
 
         scheduled = False
 
         def _pulse(_dt):
             try:
-                api = int(Build_VERSION.SDK_INT)
-                if api >= 26:
-                    eff = VibrationEffect.createOneShot(pulse_ms, VibrationEffect.DEFAULT_AMPLITUDE)
-                    self._vibrator.vibrate(eff)
+                if self._vibration_effect is not None:
+                    self._vibrator.vibrate(self._vibration_effect)
                 else:
                     self._vibrator.vibrate(pulse_ms)
             except Exception:
@@ -455,42 +647,57 @@ class MathTrainer(App):
 
         return scheduled
 
-    def _tone_path(self, name: str) -> str:
-        os.makedirs(self.user_data_dir, exist_ok=True)
-        return os.path.join(self.user_data_dir, name)
-
-    def _generate_tone(self, path: str, freq: float, duration: float, volume: float = 0.35):
-        sample_rate = 44100
-        frames = int(sample_rate * max(0.05, duration))
-        amp = int(32767 * max(0.0, min(1.0, volume)))
-        with wave.open(path, "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(sample_rate)
-            for i in range(frames):
-                s = int(amp * math.sin(2.0 * math.pi * freq * (i / sample_rate)))
-                wf.writeframes(struct.pack("<h", s))
+    def build_config(self, config):
+        config.setdefaults("feedback", {"tones": DEFAULT_TONE_VARIANT})
+        config.setdefaults("display", {"frame_governor": "1"})
+        config.setdefaults("debug", {"latency_trace": "0"})
+        config.setdefaults("training", {"adaptive": "0"})
+        config.setdefaults("export", {"certificates": "pdf"})
+
+    def _tone_variant(self) -> str:
+        try:
+            variant = self.config.get("feedback", "tones")
+        except Exception:
+            variant = DEFAULT_TONE_VARIANT
+        return variant if variant in TONE_VARIANTS else DEFAULT_TONE_VARIANT
+
+    def _load_tone(self, spec):
+        # Sounds are cached per ToneSpec; files are only generated when missing
+        if spec not in self._tone_sounds:
+            path = ensure_tone_file(self.user_data_dir, spec)
+            self._tone_sounds[spec] = SoundLoader.load(path)
+        return self._tone_sounds[spec]
 
     def _ensure_feedback_sounds(self):
-        if self._sounds_ready:
+        specs = TONE_VARIANTS[self._tone_variant()]
+        if self._sound_specs == specs:
             return
-        self._sounds_ready = True
+        self._sound_specs = specs
 
         try:
-            success_path = self._tone_path("success.wav")
-            fail_path = self._tone_path("failure.wav")
-
-            if not os.path.exists(success_path):
-                self._generate_tone(success_path, freq=880.0, duration=0.14)
-            if not os.path.exists(fail_path):
-                self._generate_tone(fail_path, freq=220.0, duration=0.22)
-
-            self._sound_success = SoundLoader.load(success_path)
-            self._sound_failure = SoundLoader.load(fail_path)
+            self._sound_success = self._load_tone(specs[0])
+            self._sound_failure = self._load_tone(specs[1])
         except Exception:
             self._sound_success = None
             self._sound_failure = None
 
+    def set_tone_variant(self, variant: str):
+        if variant not in TONE_VARIANTS:
+            return
+        try:
+            self.config.set("feedback", "tones", variant)
+            self.config.write()
+        except Exception:
+            pass
+        self._play_feedback_sound(True)
+
+    def cycle_tone_variant(self, instance=None):
+        names = list(TONE_VARIANTS)
+        variant = names[(names.index(self._tone_variant()) + 1) % len(names)]
+        self.set_tone_variant(variant)
+        if instance is not None:
+            instance.text = f"Töne: {variant}"
+
     def _play_feedback_sound(self, success: bool):
         self._ensure_feedback_sounds()
         sound = self._sound_success if success else self._sound_failure
@@ -502,6 +709,8 @@ class MathTrainer(App):
             sound.play()
 
     def _feedback(self, success: bool):
+        # Vibration pulses and sounds are timed by the Clock
+        self._governor.wake()
         if IS_IOS and self._ios_haptic(success):
             return
         if self.vibrate(1 if success else 2):
@@ -515,6 +724,22 @@ class MathTrainer(App):
         os.makedirs(self.user_data_dir, exist_ok=True)
         return os.path.join(self.user_data_dir, HIGHSCORE_FILENAME)
 
+    def get_highscore_journal_path(self):
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        return os.path.join(self.user_data_dir, HIGHSCORE_JOURNAL_FILENAME)
+
+    def get_highscore_db_path(self):
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        return os.path.join(self.user_data_dir, HIGHSCORE_DB_FILENAME)
+
+    def get_fact_stats_path(self):
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        return os.path.join(self.user_data_dir, FACT_STATS_FILENAME)
+
+    def get_session_log_path(self):
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        return os.path.join(self.user_data_dir, SESSION_LOG_FILENAME)
+
     def get_legacy_paths(self):
         paths = [os.path.abspath(LEGACY_HIGHSCORE_FILE)]
         try:
@@ -525,7 +750,15 @@ class MathTrainer(App):
         return paths
 
     def _default_highscores_data(self):
-        return {cat: [] for cat in CATEGORIES.values()}
+        return {cat: [] for cat in HIGHSCORE_CATEGORIES.values()}
+
+    @staticmethod
+    def _leaderboards(highscores):
+        # Top lists (best first) -> one ranked Leaderboard per category
+        return {cat: Leaderboard(entries, keep=HIGHSCORE_KEEP) for cat, entries in highscores.items()}
+
+    def _top_lists_snapshot(self):
+        return {cat: copy.deepcopy(board.entries()) for cat, board in self.highscores.items()}
 
     def _wrap_highscores(self, highscores_data):
         return {
@@ -545,6 +778,43 @@ class MathTrainer(App):
         return None
 
     def load_highscores(self):
+        # Read on the persistence thread, applied on the UI thread
+        self._persist.submit(self._read_highscores, on_done=self._apply_highscores,
+                             on_error=self._on_highscores_failed)
+
+    def _apply_highscores(self, highscores):
+        self.highscores = self._leaderboards(highscores)
+        self._highscores_loaded = True
+        self._highscores_error = None
+
+    def _on_highscores_failed(self, error):
+        # The lists stay empty and not loaded: export must not snapshot them over the file
+        Logger.warning(f"JonTrain: Highscores nicht geladen: {error}")
+        self._highscores_error = f"Highscores konnten nicht geladen werden: {error}"
+        self._set_about_status(self._highscores_error)
+
+    def _read_highscores(self):
+        highscores = self._load_highscores_json()
+
+        # Full history lives in SQLite when available; the JSON keeps the top lists
+        self._score_db = open_highscore_database(self.get_highscore_db_path())
+        if self._score_db is not None:
+            try:
+                if self._score_db.is_empty():
+                    self._score_db.replace_all(highscores)
+                highscores = self._top_lists()
+            except Exception:
+                self._score_db = None
+        return highscores
+
+    def _top_lists(self):
+        # Without the database ids: the lists go into the schema-1.0 JSON and backups
+        return {
+            cat: [{k: v for k, v in entry.items() if k != "id"} for entry in self._score_db.top(cat, HIGHSCORE_KEEP)]
+            for cat in HIGHSCORE_CATEGORIES.values()
+        }
+
+    def _load_highscores_json(self):
         schema_path = self.get_highscore_path()
 
         obj = self._try_load_json(schema_path)
@@ -555,8 +825,13 @@ class MathTrainer(App):
                 for k, v in data.items():
                     if k in merged and isinstance(v, list):
                         merged[k] = v
-                self.highscores = merged
-                return
+                replayed = self._journal.replay(
+                    obj.get("journal"),
+                    lambda cat, entry: insert_highscore(merged, cat, entry, HIGHSCORE_KEEP),
+                )
+                if replayed or obj.get("journal") is None:
+                    self._write_highscores_snapshot(merged)
+                return merged
 
         legacy_obj = None
         for p in self.get_legacy_paths():
@@ -577,37 +852,118 @@ class MathTrainer(App):
                 if cat_key in migrated and isinstance(entries, list):
                     migrated[cat_key] = entries
 
-        self.highscores = migrated
-        self._save_highscores_file()
+        self._write_highscores_snapshot(migrated)
+        return migrated
 
-    def _save_highscores_file(self):
+    def _write_highscores_snapshot(self, highscores):
+        # Full snapshot (atomic); entries since then go to the journal
         path = self.get_highscore_path()
-        wrapper = self._wrap_highscores(self.highscores)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(wrapper, f, indent=4, ensure_ascii=False)
+        generation = new_generation()
+        wrapper = self._wrap_highscores(highscores)
+        wrapper["journal"] = generation
+        atomic_write_json(path, wrapper)
+        self._journal.reset(generation)
+
+    def _save_highscores_file(self):
+        # Queued snapshot writes coalesce into the newest one
+        snapshot = self._top_lists_snapshot()
+        self._persist.submit(lambda: self._write_highscores_snapshot(snapshot), key="snapshot")
+
+    def _append_highscore(self, category, entry, on_saved=None):
+        """Rank entry in memory and persist it. Returns its leaderboard id (None if not in the top list)."""
+        board = self.highscores.setdefault(category, Leaderboard(keep=HIGHSCORE_KEEP))
+        entry_id = board.insert(entry)
+        snapshot = self._top_lists_snapshot()
+        # The worker gets its own copy: entry belongs to the UI thread (board, last_new_entry)
+        stored = dict(entry)
+        self._persist.submit(
+            lambda: self._persist_highscore(category, stored, snapshot),
+            on_done=on_saved,
+            on_error=self._on_highscore_save_failed,
+        )
+        return entry_id
+
+    def _on_highscore_save_failed(self, error):
+        Logger.warning(f"JonTrain: Highscore nicht gespeichert: {error}")
+        self._show_info("Highscore", f"Speichern fehlgeschlagen: {error}")
+
+    def _persist_highscore(self, category, entry, snapshot):
+        """Store one new entry (persistence thread). Returns (rank, total, database id) or None."""
+        rank = None
+        if self._score_db is not None:
+            try:
+                db_id = self._score_db.add(category, entry)
+                rank = (self._score_db.rank(category, db_id), self._score_db.count(category), db_id)
+            except Exception:
+                pass
+        try:
+            self._journal.append(category, entry)
+        except Exception:
+            self._write_highscores_snapshot(snapshot)
+            return rank
+        if self._journal.pending >= JOURNAL_COMPACT_EVERY:
+            self._write_highscores_snapshot(snapshot)
+        return rank
+
+    def _store_imported_highscores(self, highscores, history):
+        """Replace all stored highscores (persistence thread). Returns the top lists."""
+        if self._score_db is not None:
+            self._score_db.replace_all(history if isinstance(history, dict) else highscores)
+            highscores = self._top_lists()
+        self._write_highscores_snapshot(highscores)
+        return highscores
+
+    def _apply_fact_stats(self, stats):
+        # Loaded right after startup; answers recorded in the meantime are newer
+        stats.merge(self.fact_stats)
+        self.fact_stats = stats
+
+    def _save_fact_stats(self):
+        if not self._fact_stats_dirty:
+            return
+        self._fact_stats_dirty = False
+        data = self.fact_stats.to_bytes()
+        path = self.get_fact_stats_path()
+        self._persist.submit(lambda: save_fact_stats(path, data), key="fact_stats")
+
+    def flush_persistence(self, timeout=PERSIST_FLUSH_TIMEOUT):
+        if self._persist is not None:
+            self._persist.flush(timeout)
+
+    def on_pause(self):
+        # Time in the background does not count against the session
+        if self.current_view == "training" and self.session:
+            Clock.unschedule(self.update_timer)
+            self.session.pause()
+        self._save_fact_stats()
+        self.flush_persistence()
+        return True
+
+    def on_stop(self):
+        self._save_fact_stats()
+        if self._persist is not None:
+            self._persist.stop(PERSIST_FLUSH_TIMEOUT)
 
     # -------------------------
     # Android bytes helper (FIX: OutputStream/InputStream + pyjnius)
     # -------------------------
-    def _to_jbytearray(self, data: bytes):
-        """Convert Python bytes (0..255) to Java byte[] (-128..127) for pyjnius."""
-        if not IS_ANDROID:
-            return data  # type: ignore
-        signed = [b - 256 if b > 127 else b for b in data]
-        if _JARRAY_AVAILABLE and jarray:
-            return jarray("b")(signed)
-        if _JBYTEARRAY_CLS:
-            arr = _JBYTEARRAY_CLS(len(signed))
-            for i, v in enumerate(signed):
-                arr[i] = v
-            return arr
-        return data  # type: ignore
+    def _byte_bridge(self) -> ByteBridge:
+        if self._bridge is None:
+            direct = False
+            try:
+                direct = probe_direct_bytes(JAVA.ByteArrayOutputStream)
+            except Exception:
+                pass
+            jarray = jnius_jarray()
+            jbytearray_cls = None if jarray else JAVA.JByteArray
+            self._bridge = ByteBridge(jarray, jbytearray_cls, direct_bytes=direct)
+        return self._bridge
 
     def _bytes_from_jbytearray(self, buf, n: int) -> bytes:
         """Convert Java byte[] (-128..127) to Python bytes (0..255)."""
         if isinstance(buf, (bytes, bytearray)):
             return bytes(buf[:n])
-        return bytes(((int(buf[i]) + 256) & 0xFF) for i in range(n))
+        return self._byte_bridge().from_java(buf, n)
 
     # -------------------------
     # Backup (Android SAF file dialogs)
@@ -618,35 +974,73 @@ class MathTrainer(App):
 
     def _backup_suggested_name(self):
         stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        ext = BACKUP_EXTENSION_ZIP if pyzipper is not None else BACKUP_EXTENSION_AES
+        ext = BACKUP_EXTENSION_ZIP if pyzipper_module() is not None else BACKUP_EXTENSION_AES
         return f"jontrain-highscores-v{__version__}-schema{HIGHSCORE_SCHEMA_VERSION}-{stamp}{ext}"
 
     def _read_highscore_bytes(self) -> bytes:
+        # The snapshot was queued by export_backup; wait until it is written
+        self.flush_persistence()
         src_path = self.get_highscore_path()
-        if not os.path.exists(src_path):
-            self._save_highscores_file()
         with open(src_path, "rb") as f:
-            return f.read()
+            raw = f.read()
+        if self._score_db is not None:
+            obj = json.loads(raw.decode("utf-8"))
+            obj["history"] = self._score_db.history()
+            raw = json.dumps(obj, indent=4, ensure_ascii=False).encode("utf-8")
+        return raw
+
+    # -------------------------
+    # Backup jobs (off the main thread, cancellable via Back)
+    # -------------------------
+    def _start_backup_job(self, fn, on_done, error_prefix: str):
+        if self._backup_job is not None and self._backup_job.running:
+            self._set_about_status("Bitte warten, Backup läuft noch…")
+            return
+        self._backup_job = BackgroundJob(
+            fn,
+            self._dispatch_to_ui,
+            on_progress=self._set_about_status,
+            on_done=on_done,
+            on_error=lambda e: self._set_about_status(f"{error_prefix}: {e}"),
+            name="jontrain-backup",
+        ).start()
+
+    def cancel_backup_job(self) -> bool:
+        job = self._backup_job
+        if job is None or not job.running:
+            return False
+        job.cancel()
+        self._backup_job = None
+        self._set_about_status("Abgebrochen.")
+        return True
+
+    @staticmethod
+    def _job_step(job, text: str):
+        if job is not None:
+            job.check()
+            job.report(text)
 
     def _encrypt_backup_bytes_aes(self, payload: bytes) -> bytes:
-        if not _HAVE_PYCRYPTODOME:
+        crypto = aes_gcm()
+        if crypto is None:
             raise RuntimeError("pycryptodome fehlt (AES-Backup nicht möglich)")
 
         salt = os.urandom(16)
-        key = PBKDF2(
+        key = crypto.PBKDF2(
             BACKUP_PASSWORD.encode("utf-8"),
             salt,
             dkLen=32,
             count=200_000,
-            hmac_hash_module=SHA256,
+            hmac_hash_module=crypto.SHA256,
         )
         nonce = os.urandom(12)
-        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+        cipher = crypto.AES.new(key, crypto.AES.MODE_GCM, nonce=nonce)
         ciphertext, tag = cipher.encrypt_and_digest(payload)
         return _BACKUP_MAGIC + salt + nonce + tag + ciphertext
 
     def _decrypt_backup_bytes_aes(self, data: bytes) -> bytes:
-        if not _HAVE_PYCRYPTODOME:
+        crypto = aes_gcm()
+        if crypto is None:
             raise RuntimeError("pycryptodome fehlt (AES-Import nicht möglich)")
 
         if not data.startswith(_BACKUP_MAGIC):
@@ -657,19 +1051,22 @@ class MathTrainer(App):
         tag = data[len(_BACKUP_MAGIC) + 28:len(_BACKUP_MAGIC) + 44]
         ciphertext = data[len(_BACKUP_MAGIC) + 44:]
 
-        key = PBKDF2(
+        key = crypto.PBKDF2(
             BACKUP_PASSWORD.encode("utf-8"),
             salt,
             dkLen=32,
             count=200_000,
-            hmac_hash_module=SHA256,
+            hmac_hash_module=crypto.SHA256,
         )
-        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+        cipher = crypto.AES.new(key, crypto.AES.MODE_GCM, nonce=nonce)
         return cipher.decrypt_and_verify(ciphertext, tag)
 
-    def _make_encrypted_backup_bytes(self):
+    def _make_encrypted_backup_bytes(self, job=None):
+        self._job_step(job, "Highscores werden gelesen…")
         payload = self._read_highscore_bytes()
 
+        self._job_step(job, "Backup wird verschlüsselt…")
+        pyzipper = pyzipper_module()
         if pyzipper is not None:
             buf = io.BytesIO()
             with pyzipper.AESZipFile(
@@ -685,50 +1082,78 @@ class MathTrainer(App):
         return self._encrypt_backup_bytes_aes(payload)
 
     def export_backup(self, instance=None):
-        if pyzipper is None and not _HAVE_PYCRYPTODOME:
+        if pyzipper_module() is None and aes_gcm() is None:
             self._set_about_status("Export nicht moeglich: pyzipper/pycryptodome fehlt.")
             return
 
+        # A fresh snapshot (journal folded in) from the UI-owned top lists;
+        # the backup job only reads the file after the queue has drained
+        if not self._highscores_loaded:
+            self._set_about_status(self._highscores_error or "Bitte warten, Highscores werden geladen…")
+            return
+        self._save_highscores_file()
+
         if IS_ANDROID and self._activity:
-            try:
-                self._pending_backup_bytes = self._make_encrypted_backup_bytes()
-                intent = Intent(Intent.ACTION_CREATE_DOCUMENT)
-                intent.addCategory(Intent.CATEGORY_OPENABLE)
-                mime = "application/zip" if pyzipper is not None else "application/octet-stream"
-                intent.setType(mime)
-                intent.putExtra(Intent.EXTRA_TITLE, self._backup_suggested_name())
-                self._activity.startActivityForResult(intent, self.REQ_EXPORT_BACKUP)
-                self._set_about_status("Speicherort auswählen…")
-            except Exception as e:
-                self._set_about_status(f"Export-Fehler: {e}")
+            self._start_backup_job(
+                lambda job: self._export_backup_to_file(job, self._pending_backup_path()),
+                self._request_backup_location,
+                "Export-Fehler",
+            )
             return
 
+        self._start_backup_job(self._export_backup_to_file, self._on_backup_file_written, "Export-Fehler")
+
+    def _pending_backup_path(self):
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        return os.path.join(self.user_data_dir, PENDING_BACKUP_FILENAME)
+
+    def _discard_pending_backup(self):
         try:
-            data = self._make_encrypted_backup_bytes()
+            os.remove(self._pending_backup_path())
+        except Exception:
+            pass
+
+    def _request_backup_location(self, pending_path: str):
+        try:
+            intent = JAVA.Intent(JAVA.Intent.ACTION_CREATE_DOCUMENT)
+            intent.addCategory(JAVA.Intent.CATEGORY_OPENABLE)
+            mime = "application/zip" if pyzipper_module() is not None else "application/octet-stream"
+            intent.setType(mime)
+            intent.putExtra(JAVA.Intent.EXTRA_TITLE, self._backup_suggested_name())
+            self._activity.startActivityForResult(intent, self.REQ_EXPORT_BACKUP)
+            self._set_about_status("Speicherort auswählen…")
+        except Exception as e:
+            self._set_about_status(f"Export-Fehler: {e}")
+
+    def _export_backup_to_file(self, job, out_path=None) -> str:
+        data = self._make_encrypted_backup_bytes(job)
+        self._job_step(job, "Backup wird gespeichert…")
+        if out_path is None:
             os.makedirs(self.user_data_dir, exist_ok=True)
             out_path = os.path.join(self.user_data_dir, self._backup_suggested_name())
-            with open(out_path, "wb") as f:
-                f.write(data)
-            if IS_IOS:
-                if self._ios_share_file(out_path, title="Backup exportieren"):
-                    self._set_about_status("Backup bereit zum Teilen/Speichern (Dateien-App).")
-                else:
-                    self._set_about_status(f"Backup gespeichert:\n{out_path}")
+        with open(out_path, "wb") as f:
+            f.write(data)
+        return out_path
+
+    def _on_backup_file_written(self, out_path: str):
+        if IS_IOS:
+            if self._ios_share_file(out_path, title="Backup exportieren"):
+                self._set_about_status("Backup bereit zum Teilen/Speichern (Dateien-App).")
             else:
                 self._set_about_status(f"Backup gespeichert:\n{out_path}")
-        except Exception as e:
-            self._set_about_status(f"Export-Fehler: {e}")
+        else:
+            self._set_about_status(f"Backup gespeichert:\n{out_path}")
 
     def import_backup(self, instance=None):
-        if pyzipper is None and not _HAVE_PYCRYPTODOME:
+        if pyzipper_module() is None and aes_gcm() is None:
             self._set_about_status("Hinweis: Backup deaktiviert (pyzipper/pycryptodome fehlt).")
-        elif pyzipper is None:
+        elif pyzipper_module() is None:
             self._set_about_status("Hinweis: pyzipper fehlt. Backup nutzt AES-Format.")
 
         if IS_ANDROID and self._activity:
             try:
-                intent = Intent(Intent.ACTION_OPEN_DOCUMENT)
-                intent.addCategory(Intent.CATEGORY_OPENABLE)
+                intent = JAVA.Intent(JAVA.Intent.ACTION_OPEN_DOCUMENT)
+                intent.addCategory(JAVA.Intent.CATEGORY_OPENABLE)
                 intent.setType("*/*")
                 self._activity.startActivityForResult(intent, self.REQ_IMPORT_BACKUP)
                 self._set_about_status("Backup-Datei auswählen…")
@@ -747,8 +1172,8 @@ class MathTrainer(App):
             self._set_about_status("Import nicht möglich: iOS/pyobjus fehlt.")
             return
         try:
-            UIDocumentPickerViewController = objc_autoclass("UIDocumentPickerViewController")
-            NSArray = objc_autoclass("NSArray")
+            UIDocumentPickerViewController = OBJC.get("UIDocumentPickerViewController")
+            NSArray = OBJC.get("NSArray")
             types = NSArray.arrayWithObject_(objc_str("public.data"))
             # 0 = UIDocumentPickerModeImport
             picker = UIDocumentPickerViewController.alloc().initWithDocumentTypes_inMode_(types, 0)
@@ -769,36 +1194,50 @@ class MathTrainer(App):
         if result_code != -1 or intent is None:
             if request_code in (self.REQ_EXPORT_BACKUP, self.REQ_IMPORT_BACKUP):
                 self._set_about_status("Abgebrochen.")
+            if request_code == self.REQ_EXPORT_BACKUP:
+                self._discard_pending_backup()
+            elif request_code == self.REQ_EXPORT_CERTIFICATES:
+                self._dispatch_to_ui(lambda: self._on_certificates_location(None))
             return
 
         try:
             uri = intent.getData()
+            if request_code == self.REQ_EXPORT_CERTIFICATES:
+                # Called on the Java UI thread; the handler opens popups
+                self._dispatch_to_ui(lambda: self._on_certificates_location(uri))
+                return
+
             if uri is None:
                 self._set_about_status("Keine Datei gewählt.")
                 return
 
             if request_code == self.REQ_EXPORT_BACKUP:
-                self._write_bytes_to_uri(uri, getattr(self, "_pending_backup_bytes", b""))
-                self._pending_backup_bytes = None
+                try:
+                    with open(self._pending_backup_path(), "rb") as f:
+                        self._write_bytes_to_uri(uri, f)
+                finally:
+                    self._discard_pending_backup()
                 self._set_about_status("Backup gespeichert.")
 
             elif request_code == self.REQ_IMPORT_BACKUP:
-                raw = self._read_bytes_from_uri(uri)
-                self._import_backup_bytes(raw)
-                self._set_about_status("Import erfolgreich. Highscores übernommen.")
+                self._start_backup_job(
+                    lambda job: self._parse_backup_bytes(self._read_bytes_from_uri(uri), job),
+                    self._on_backup_parsed,
+                    "Fehler",
+                )
 
         except Exception as e:
             self._set_about_status(f"Fehler: {e}")
 
-    def _write_bytes_to_uri(self, uri, data: bytes):
+    def _write_bytes_to_uri(self, uri, source):
+        """Stream bytes or a binary file object to a content URI in fixed-size chunks."""
         resolver = self._activity.getContentResolver()
         stream = resolver.openOutputStream(uri)
         if stream is None:
             raise RuntimeError("Konnte OutputStream nicht öffnen")
         try:
             # FIX: Java OutputStream.write braucht Java byte[]
-            stream.write(self._to_jbytearray(data))
-            stream.flush()
+            copy_to_output_stream(stream, source, self._byte_bridge())
         finally:
             stream.close()
 
@@ -812,12 +1251,7 @@ class MathTrainer(App):
 
             if IS_ANDROID:
                 # FIX: Java InputStream.read erwartet Java byte[]
-                if _JARRAY_AVAILABLE and jarray:
-                    buf = jarray("b")([0] * (64 * 1024))
-                elif _JBYTEARRAY_CLS:
-                    buf = _JBYTEARRAY_CLS(64 * 1024)
-                else:
-                    buf = bytearray(64 * 1024)
+                buf = self._byte_bridge().new_buffer(64 * 1024)
                 while True:
                     n = stream.read(buf)
                     if n is None or n <= 0:
@@ -836,9 +1270,38 @@ class MathTrainer(App):
             stream.close()
 
     def _import_backup_bytes(self, zip_bytes: bytes):
+        # Decrypting runs as a backup job; the result is applied on the UI thread
+        self._start_backup_job(
+            lambda job: self._parse_backup_bytes(zip_bytes, job),
+            self._on_backup_parsed,
+            "Import-Fehler",
+        )
+
+    def _on_backup_parsed(self, result):
+        merged, history = result
+        self._set_about_status("Highscores werden übernommen…")
+        self._apply_imported_highscores(merged, history)
+
+    def _apply_imported_highscores(self, merged, history):
+        self.highscores = self._leaderboards(merged)
+        snapshot = copy.deepcopy(merged)
+        self._persist.submit(
+            lambda: self._store_imported_highscores(snapshot, history),
+            on_done=self._on_imported_highscores_stored,
+            on_error=lambda e: self._set_about_status(f"Import-Fehler: {e}"),
+        )
+
+    def _on_imported_highscores_stored(self, highscores):
+        self._apply_highscores(highscores)
+        self._set_about_status("Import erfolgreich. Highscores übernommen.")
+
+    def _parse_backup_bytes(self, zip_bytes: bytes, job=None):
+        """Decrypt and validate a backup. Returns (top lists, full history or None)."""
+        self._job_step(job, "Backup wird entschlüsselt…")
         if zip_bytes.startswith(_BACKUP_MAGIC):
             raw = self._decrypt_backup_bytes_aes(zip_bytes)
         else:
+            pyzipper = pyzipper_module()
             if pyzipper is None:
                 raise RuntimeError("pyzipper fehlt (ZIP-Import nicht moeglich)")
             buf = io.BytesIO(zip_bytes)
@@ -849,6 +1312,7 @@ class MathTrainer(App):
                     raise RuntimeError("Backup ungueltig: Datei fehlt im Archiv")
                 raw = zf.read(HIGHSCORE_FILENAME)
 
+        self._job_step(job, "Backup wird geprüft…")
         obj = json.loads(raw.decode("utf-8"))
         if not (isinstance(obj, dict) and "schema_version" in obj and "data" in obj):
             raise RuntimeError("Backup ungültig: Format nicht erkannt")
@@ -867,67 +1331,22 @@ class MathTrainer(App):
             if k in merged and isinstance(v, list):
                 merged[k] = v
 
-        self.highscores = merged
-        self._save_highscores_file()
+        history = obj.get("history")
+        return merged, (history if isinstance(history, dict) else None)
 
     # -------------------------
     # Share success badge (generated on demand)
     # -------------------------
-    def _create_badge_widget(self, entry, category_display: str):
-        w, h = 900, 520
-        badge = BoxLayout(orientation="vertical", size_hint=(None, None), size=(w, h), padding=30, spacing=18)
-
-        with badge.canvas.before:
-            Color(0, 0, 0, 1)
-            bg = Rectangle(pos=badge.pos, size=badge.size)
-            Color(1, 1, 1, 1)
-            border = Line(rectangle=(badge.x, badge.y, badge.width, badge.height), width=2)
-
-        def _sync(*_):
-            bg.pos = badge.pos
-            bg.size = badge.size
-            border.rectangle = (badge.x, badge.y, badge.width, badge.height)
-
-        badge.bind(pos=_sync, size=_sync)
-
-        title = Label(text="JONTRAIN  HIGHSCORE", font_size=40)
-        sep = Label(text="====================", font_size=26)
-
-        name = entry.get("name", "Anonym")
-        pts = entry.get("points", 0)
-        date = entry.get("date", "")
-        mode = category_display
-
-        l1 = Label(text=f"Name:   {name}", font_size=34, halign="left")
-        l2 = Label(text=f"Modus:  {mode}", font_size=34, halign="left")
-        l3 = Label(text=f"Punkte: {pts}", font_size=34, halign="left")
-        l4 = Label(text=f"Datum:  {date}", font_size=26, halign="left")
-
-        for l in (l1, l2, l3, l4):
-            l.text_size = (w - 60, None)
-            l.valign = "middle"
-
-        footer = Label(text="geteilt aus JonTrain", font_size=22)
-
-        badge.add_widget(title)
-        badge.add_widget(sep)
-        badge.add_widget(l1)
-        badge.add_widget(l2)
-        badge.add_widget(l3)
-        badge.add_widget(l4)
-        badge.add_widget(Widget())
-        badge.add_widget(footer)
-        return badge
-
     def _show_info(self, title: str, message: str):
         content = BoxLayout(orientation="vertical", spacing=10, padding=10)
-        content.add_widget(Label(text=message, font_size=scale_font(20)))
-        btn = Button(text="OK", font_size=scale_font(20), size_hint_y=None, height=scale_font(60))
+        content.add_widget(Label(text=message, font_size=FONTS.size(20)))
+        btn = Button(text="OK", font_size=FONTS.size(20), size_hint_y=None, height=FONTS.size(60))
 
         popup = Popup(title=title, content=content, size_hint=(0.85, 0.4))
         btn.bind(on_press=lambda *_: popup.dismiss())
         content.add_widget(btn)
         popup.open()
+        self._governor.wake()
 
     def _desktop_copy_image_to_clipboard(self, png_path: str):
         import subprocess
@@ -996,7 +1415,7 @@ class MathTrainer(App):
             img = KivyImage(source=path, allow_stretch=True, keep_ratio=True)
             content.add_widget(img)
 
-            btn = Button(text="OK", font_size=scale_font(22), size_hint_y=None, height=scale_font(60))
+            btn = Button(text="OK", font_size=FONTS.size(22), size_hint_y=None, height=FONTS.size(60))
             popup = Popup(title="Exportiertes Badge", content=content, size_hint=(0.9, 0.9))
             btn.bind(on_press=lambda *_: popup.dismiss())
             content.add_widget(btn)
@@ -1016,163 +1435,351 @@ class MathTrainer(App):
         if not self.last_new_entry or not self.category:
             return
 
-        category_display = next((k for k, v in CATEGORIES.items() if v == self.category), self.category)
+        category_display = next((k for k, v in HIGHSCORE_CATEGORIES.items() if v == self.category), self.category)
+        entry = self.last_new_entry
+        fields = {"name": entry.get("name", "Anonym"), "mode": category_display,
+                  "points": entry.get("points", 0), "date": entry.get("date", "")}
 
-        badge = self._create_badge_widget(self.last_new_entry, category_display)
+        # Same entry shared before: reuse the file
+        key = badge_key(fields, BadgeRenderer.template_id())
+        cached = self._badge_cache.get(key)
+        if cached is not None:
+            self._share_badge_file(cached)
+            return
 
-        # Zentriert ON-SCREEN platzieren (robust, damit sicher gerendert wird)
-        w, h = badge.size
-        badge.pos = ((Window.width - w) / 2, (Window.height - h) / 2)
+        # Offscreen: drawn into the renderer's Fbo in this frame, the visible UI stays untouched
+        if self._badge_renderer is None:
+            self._badge_renderer = BadgeRenderer()
+        width, height, pixels = self._badge_renderer.render(fields)
 
-        # Wichtig: NICHT opacity=0 setzen, sonst kann es „leer“ werden
-        self.root.add_widget(badge)
+        self._persist.submit(
+            lambda: self._badge_cache.put(key, encode_png(pixels, width, height, flip=True)),
+            on_done=self._share_badge_file,
+            on_error=lambda e: self._show_info("Teilen", f"Badge-Fehler: {e}"),
+        )
 
-        os.makedirs(self.user_data_dir, exist_ok=True)
-        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        out_path = os.path.join(self.user_data_dir, f"jontrain-badge-{stamp}.png")
+    def _share_badge_file(self, out_path: str):
+        # Android: teilen
+        if IS_ANDROID and self._activity:
+            self._android_share_image_via_mediastore(out_path, title="Highscore teilen")
+        elif IS_IOS:
+            if not self._ios_share_image(out_path, title="Highscore teilen"):
+                self._preview_exported_image(out_path)
+        else:
+            # Desktop: wenigstens anzeigen
+            self._preview_exported_image(out_path)
+
+    # -------------------------
+    # Batch certificates (all listed entries of a category, offscreen)
+    # -------------------------
+    def _certificate_format(self) -> str:
+        try:
+            fmt = self.config.get("export", "certificates")
+        except Exception:
+            fmt = "pdf"
+        return fmt if fmt in CERTIFICATE_FORMATS else "pdf"
+
+    def export_certificates(self, instance=None):
+        """One certificate per entry of the shown ranking (current filter applies)."""
+        if self._certificate_batch is not None:
+            return
+        category = self._highscore_view[0]
+        name, ts_prefix = parse_highscore_filter(self._highscore_filter)
+        self.certificates_btn.disabled = True
+        db = self._score_db
+        if db is None:
+            board = self.highscores.get(category) or Leaderboard()
+            entries = [e for e in board.entries() if entry_matches(e, name, ts_prefix)]
+            self._render_certificates(category, entries[:CERTIFICATE_LIMIT])
+            return
+        self._persist.submit(
+            lambda: db.top(category, CERTIFICATE_LIMIT, 0, name, ts_prefix),
+            on_done=lambda entries: self._render_certificates(category, entries),
+            on_error=self._on_certificates_failed,
+        )
 
-        def _render_and_share(_dt):
+    def _render_certificates(self, category, entries):
+        if self._certificate_batch is not None:
+            return  # button pressed again while the entries were queried
+        if not entries:
+            self.certificates_btn.disabled = False
+            self._show_info("Urkunden", "Keine Einträge vorhanden")
+            return
+        fmt = self._certificate_format()
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        path = os.path.join(self.user_data_dir, f"jontrain-urkunden-{stamp}.{fmt}")
+        if self._pending_certificates is None:
+            self._persist.submit(lambda: self._remove_certificate_files(keep=path))
+        batch = self._certificate_batch = CertificateBatch(path, fmt)
+        if self._badge_renderer is None:
+            self._badge_renderer = BadgeRenderer()
+        renderer = self._badge_renderer
+        mode = next((k for k, v in HIGHSCORE_CATEGORIES.items() if v == category), category)
+        pending = iter(entries)
+
+        def _step(_dt):
+            # Render within a frame budget while the pool keeps up; the
+            # pool encodes meanwhile
+            deadline = time.perf_counter() + CERTIFICATE_FRAME_BUDGET
+            while not batch.busy:
+                entry = next(pending, None)
+                if entry is None:
+                    break
+                t0 = time.perf_counter()
+                fields = {"name": entry.get("name", "Anonym"), "mode": mode,
+                          "points": entry.get("points", 0), "date": entry.get("date", "")}
+                width, height, pixels = renderer.render(fields)
+                batch.add(width, height, pixels, time.perf_counter() - t0)
+                if time.perf_counter() >= deadline:
+                    break
+            if batch.count < len(entries):
+                if self.current_view == "highscore":
+                    self.highscore_page_label.text = f"Urkunde {batch.count} / {len(entries)}"
+                self._governor.wake()
+                Clock.schedule_once(_step, CERTIFICATE_DRAIN_WAIT if batch.busy else 0)
+                return
+            BackgroundJob(
+                lambda job: batch.finish(),
+                self._dispatch_to_ui,
+                on_done=self._on_certificates_written,
+                on_error=self._on_certificates_failed,
+                name="jontrain-certificates",
+            ).start()
+
+        _step(0)
+
+    def _on_certificates_written(self, report):
+        path = self._certificate_batch.path
+        self._certificate_batch = None
+        Logger.info(f"JonTrain: Urkunden\n{format_report(report)}")
+        self.certificates_btn.disabled = False
+        if self.current_view == "highscore":
+            self._load_highscore_page(self._highscore_page)
+        self._share_certificates(path, report)
+
+    def _on_certificates_failed(self, error):
+        # Also the entry query: no batch yet then
+        if self._certificate_batch is not None:
+            self._certificate_batch.cancel()
+            self._certificate_batch = None
+        self.certificates_btn.disabled = False
+        self._show_info("Urkunden", f"Export-Fehler: {error}")
+
+    def _share_certificates(self, path, report):
+        mime = "application/pdf" if report["format"] == "pdf" else "application/zip"
+        if IS_ANDROID and self._activity:
             try:
-                # Force update before export
-                badge.do_layout()
-                badge.canvas.ask_update()
-                self.root.canvas.ask_update()
+                self._android_share_via_mediastore(path, title="Urkunden teilen", mime=mime)
+            except Exception as e:
+                # Android < 10 has no Downloads collection: let the user pick a place
+                Logger.info(f"JonTrain: Urkunden nicht über MediaStore geteilt: {e}")
+                self._request_certificates_location(path, mime)
+                return
+            self._remove_file(path)  # copied into Download/JonTrain
+        elif not (IS_IOS and self._ios_share_file(path, title="Urkunden teilen")):
+            # Desktop: the file stays until the next export
+            self._show_info("Urkunden", f"{format_report(report)}\n{path}")
 
-                badge.export_to_png(out_path)
-            finally:
-                try:
-                    self.root.remove_widget(badge)
-                except Exception:
-                    pass
+    def _request_certificates_location(self, path, mime):
+        try:
+            intent = JAVA.Intent(JAVA.Intent.ACTION_CREATE_DOCUMENT)
+            intent.addCategory(JAVA.Intent.CATEGORY_OPENABLE)
+            intent.setType(mime)
+            intent.putExtra(JAVA.Intent.EXTRA_TITLE, os.path.basename(path))
+            self._activity.startActivityForResult(intent, self.REQ_EXPORT_CERTIFICATES)
+            self._pending_certificates = path
+        except Exception as e:
+            self._show_info("Urkunden", f"Teilen nicht möglich: {e}\nDatei: {path}")
 
-            # Android: teilen
-            if IS_ANDROID and self._activity:
-                self._android_share_image_via_mediastore(out_path, title="Highscore teilen")
-            elif IS_IOS:
-                if not self._ios_share_image(out_path, title="Highscore teilen"):
-                    self._preview_exported_image(out_path)
-            else:
-                # Desktop: wenigstens anzeigen
-                self._preview_exported_image(out_path)
+    def _on_certificates_location(self, uri):
+        """SAF result for the pending certificates (uri None: cancelled)."""
+        path, self._pending_certificates = self._pending_certificates, None
+        if path is None:
+            return
+        if uri is None:
+            self._remove_file(path)
+            self._show_info("Urkunden", "Abgebrochen.")
+            return
+        try:
+            with open(path, "rb") as f:
+                self._write_bytes_to_uri(uri, f)
+        except Exception as e:
+            self._show_info("Urkunden", f"Speichern fehlgeschlagen: {e}\nDatei: {path}")
+            return
+        self._remove_file(path)
+        self._show_info("Urkunden", "Urkunden gespeichert.")
 
-        # Nicht 0! Gib Kivy Zeit für mindestens einen Draw-Pass
-        Clock.schedule_once(_render_and_share, 0.2)
+    def _remove_certificate_files(self, keep=None):
+        """Earlier exports (persistence thread; iOS shares read the file after the call returns)."""
+        for path in glob.glob(os.path.join(glob.escape(self.user_data_dir), CERTIFICATE_FILE_PATTERN)):
+            if keep is None or not path.startswith(keep):
+                self._remove_file(path)
 
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
     def _android_share_image_via_mediastore(self, path: str, title="Teilen"):
         try:
-            resolver = self._activity.getContentResolver()
-
-            values = ContentValues()
-            values.put(MediaStore_MediaColumns.MIME_TYPE, String("image/png"))
-            values.put(MediaStore_MediaColumns.DISPLAY_NAME, String(os.path.basename(path)))
+            self._android_share_via_mediastore(path, title)
+        except Exception:
+            self._android_share_text("Ich habe einen Highscore in JonTrain geschafft!")
 
-            # API 29+: optional, makes it show up in Pictures/
-            api = int(Build_VERSION.SDK_INT)
-            if api >= 29:
-                values.put(MediaStore_MediaColumns.RELATIVE_PATH, String("Pictures/JonTrain"))
-                try:
-                    values.put(MediaStore_MediaColumns.IS_PENDING, 1)
-                except Exception:
-                    pass
+    def _android_share_via_mediastore(self, path: str, title="Teilen", mime="image/png"):
+        """Copy path into MediaStore and open the share sheet; raises when that is not possible."""
+        resolver = self._activity.getContentResolver()
+        is_image = mime.startswith("image/")
+
+        values = JAVA.ContentValues()
+        values.put(JAVA.MediaStore_MediaColumns.MIME_TYPE, JAVA.String(mime))
+        values.put(JAVA.MediaStore_MediaColumns.DISPLAY_NAME, JAVA.String(os.path.basename(path)))
+
+        # API 29+: optional, makes it show up in Pictures/ (documents: Download/, required)
+        api = self._android_sdk_int()
+        if not is_image and (api < 29 or JAVA.MediaStore_Downloads is None):
+            raise RuntimeError("Downloads-Sammlung erst ab Android 10")
+        if api >= 29:
+            folder = "Pictures/JonTrain" if is_image else "Download/JonTrain"
+            values.put(JAVA.MediaStore_MediaColumns.RELATIVE_PATH, JAVA.String(folder))
+            try:
+                values.put(JAVA.MediaStore_MediaColumns.IS_PENDING, 1)
+            except Exception:
+                pass
 
-            uri = resolver.insert(MediaStore_Images_Media.EXTERNAL_CONTENT_URI, values)
-            if uri is None:
-                raise RuntimeError("MediaStore insert fehlgeschlagen")
+        collection = JAVA.MediaStore_Images_Media if is_image else JAVA.MediaStore_Downloads
+        uri = resolver.insert(collection.EXTERNAL_CONTENT_URI, values)
+        if uri is None:
+            raise RuntimeError("MediaStore insert fehlgeschlagen")
 
-            stream = resolver.openOutputStream(uri)
-            if stream is None:
-                raise RuntimeError("Konnte MediaStore OutputStream nicht öffnen")
+        stream = resolver.openOutputStream(uri)
+        if stream is None:
+            raise RuntimeError("Konnte MediaStore OutputStream nicht öffnen")
 
-            try:
-                with open(path, "rb") as f:
-                    data = f.read()
-                # FIX: Java OutputStream.write braucht Java byte[]
-                stream.write(self._to_jbytearray(data))
-                stream.flush()
-            finally:
-                stream.close()
-
-            if api >= 29:
-                try:
-                    values = ContentValues()
-                    values.put(MediaStore_MediaColumns.IS_PENDING, 0)
-                    resolver.update(uri, values, None, None)
-                except Exception:
-                    pass
+        try:
+            with open(path, "rb") as f:
+                copy_to_output_stream(stream, f, self._byte_bridge())
+        finally:
+            stream.close()
 
-            intent = Intent(Intent.ACTION_SEND)
-            intent.setType("image/png")
+        if api >= 29:
             try:
-                intent.setDataAndType(uri, "image/png")
+                values = JAVA.ContentValues()
+                values.put(JAVA.MediaStore_MediaColumns.IS_PENDING, 0)
+                resolver.update(uri, values, None, None)
             except Exception:
                 pass
-            intent.putExtra(Intent.EXTRA_STREAM, uri)
-            intent.addFlags(Intent.FLAG_GRANT_READ_URI_PERMISSION)
-            intent.addFlags(Intent.FLAG_ACTIVITY_NEW_TASK)
-            try:
-                intent.setClipData(ClipData.newRawUri(String("image"), uri))
-            except Exception:
-                pass
-            chooser = Intent.createChooser(intent, String(title))
-            chooser.addFlags(Intent.FLAG_GRANT_READ_URI_PERMISSION)
-            chooser.addFlags(Intent.FLAG_ACTIVITY_NEW_TASK)
-            self._activity.startActivity(chooser)
+
+        intent = JAVA.Intent(JAVA.Intent.ACTION_SEND)
+        intent.setType(mime)
+        try:
+            intent.setDataAndType(uri, mime)
         except Exception:
-            self._android_share_text("Ich habe einen Highscore in JonTrain geschafft!")
+            pass
+        intent.putExtra(JAVA.Intent.EXTRA_STREAM, uri)
+        intent.addFlags(JAVA.Intent.FLAG_GRANT_READ_URI_PERMISSION)
+        intent.addFlags(JAVA.Intent.FLAG_ACTIVITY_NEW_TASK)
+        try:
+            intent.setClipData(JAVA.ClipData.newRawUri(JAVA.String("image"), uri))
+        except Exception:
+            pass
+        chooser = JAVA.Intent.createChooser(intent, JAVA.String(title))
+        chooser.addFlags(JAVA.Intent.FLAG_GRANT_READ_URI_PERMISSION)
+        chooser.addFlags(JAVA.Intent.FLAG_ACTIVITY_NEW_TASK)
+        self._activity.startActivity(chooser)
 
     def _android_share_text(self, text: str):
         try:
-            intent = Intent(Intent.ACTION_SEND)
+            intent = JAVA.Intent(JAVA.Intent.ACTION_SEND)
             intent.setType("text/plain")
-            intent.putExtra(Intent.EXTRA_TEXT, String(text))
-            intent.addFlags(Intent.FLAG_ACTIVITY_NEW_TASK)
-            chooser = Intent.createChooser(intent, String("Teilen"))
-            chooser.addFlags(Intent.FLAG_ACTIVITY_NEW_TASK)
+            intent.putExtra(JAVA.Intent.EXTRA_TEXT, JAVA.String(text))
+            intent.addFlags(JAVA.Intent.FLAG_ACTIVITY_NEW_TASK)
+            chooser = JAVA.Intent.createChooser(intent, JAVA.String("Teilen"))
+            chooser.addFlags(JAVA.Intent.FLAG_ACTIVITY_NEW_TASK)
             self._activity.startActivity(chooser)
         except Exception:
             pass
 
+    # -------------------------
+    # Screen cache (every view is built once, then only refreshed)
+    # -------------------------
+    def _show_screen(self, name: str):
+        """Switch to view name; its widgets are built on first use only."""
+        self.current_view = name
+        # The training keypad must not wait for a long idle sleep
+        self._governor.set_interactive(name == "training")
+        if not self.screens.has_screen(name):
+            screen = Screen(name=name)
+            screen.add_widget(self._build_screen_layout(name))
+            self.screens.add_widget(screen)
+        self.screens.current = name
+
+    def _build_screen_layout(self, name: str):
+        layout = BoxLayout(orientation="vertical")
+        getattr(self, f"_build_{name}_screen")(layout)
+        return layout
+
+    def _on_window_resize(self, _dt=None):
+        # Only widgets bound to a size that changed are touched; no rebuild
+        FONTS.update(Window.width)
+        if self.current_view == "highscore":
+            # Recycled rows take their font size from the data
+            self._render_highscore_rows()
+
     # -------------------------
     # UI: About / License
     # -------------------------
     def show_about(self, instance=None):
-        self.current_view = "about"
-        self.layout.clear_widgets()
+        self._show_screen("about")
+        self._refresh_about_screen()
+        self._set_about_status("")
 
-        self.layout.add_widget(Label(text="Über JonTrain", font_size=scale_font(28)))
-        self.layout.add_widget(Label(text="Autor: Arnd", font_size=scale_font(24)))
-        self.layout.add_widget(Label(text="Tester: Jona, Vincent, Ben", font_size=scale_font(24)))
-        self.layout.add_widget(Label(text=f"Version: {__version__}", font_size=scale_font(24)))
-        self.layout.add_widget(Label(text=f"Schema: {HIGHSCORE_SCHEMA_VERSION}", font_size=scale_font(24)))
+        if pyzipper_module() is None and aes_gcm() is None:
+            self._set_about_status("Import nicht moeglich: pyzipper/pycryptodome fehlt.")
 
-        self.layout.add_widget(Label(text="Backup (Highscores)", font_size=scale_font(24)))
+    def _build_about_screen(self, layout):
+        layout.add_widget(FONTS.bind(Label(text="Über JonTrain"), 28))
+        layout.add_widget(FONTS.bind(Label(text="Autor: Arnd"), 24))
+        layout.add_widget(FONTS.bind(Label(text="Tester: Jona, Vincent, Ben"), 24))
+        layout.add_widget(FONTS.bind(Label(text=f"Version: {__version__}"), 24))
+        layout.add_widget(FONTS.bind(Label(text=f"Schema: {HIGHSCORE_SCHEMA_VERSION}"), 24))
 
-        export_btn = Button(text="Backup exportieren", font_size=scale_font(24), on_press=self.export_backup)
-        import_btn = Button(text="Backup importieren", font_size=scale_font(24), on_press=self.import_backup)
-        self.layout.add_widget(export_btn)
-        self.layout.add_widget(import_btn)
+        self.tones_btn = FONTS.bind(Button(text="", on_press=self.cycle_tone_variant), 24)
+        layout.add_widget(self.tones_btn)
 
-        self.about_status_label = Label(text="", font_size=scale_font(16))
-        self.layout.add_widget(self.about_status_label)
+        layout.add_widget(FONTS.bind(Label(text="Backup (Highscores)"), 24))
 
-        if pyzipper is None and not _HAVE_PYCRYPTODOME:
-            self._set_about_status("Import nicht moeglich: pyzipper/pycryptodome fehlt.")
+        export_btn = FONTS.bind(Button(text="Backup exportieren", on_press=self.export_backup), 24)
+        import_btn = FONTS.bind(Button(text="Backup importieren", on_press=self.import_backup), 24)
+        layout.add_widget(export_btn)
+        layout.add_widget(import_btn)
+
+        self.about_status_label = FONTS.bind(Label(text=""), 16)
+        layout.add_widget(self.about_status_label)
+
+        if pyzipper_module() is None and aes_gcm() is None:
             return
 
-        license_btn = Button(text="Lizenz", font_size=scale_font(24), on_press=self.show_license)
-        self.layout.add_widget(license_btn)
+        license_btn = FONTS.bind(Button(text="Lizenz", on_press=self.show_license), 24)
+        layout.add_widget(license_btn)
 
-        support_btn = Button(text="Unterstütze meinen Verein", font_size=scale_font(24), on_press=self.open_support_link)
-        self.layout.add_widget(support_btn)
+        support_btn = FONTS.bind(Button(text="Unterstütze meinen Verein", on_press=self.open_support_link), 24)
+        layout.add_widget(support_btn)
 
-        back_btn = Button(text="Zurück", font_size=scale_font(24), on_press=self.return_to_main_menu)
-        self.layout.add_widget(back_btn)
+        back_btn = FONTS.bind(Button(text="Zurück", on_press=self.return_to_main_menu), 24)
+        layout.add_widget(back_btn)
+
+    def _refresh_about_screen(self):
+        self.tones_btn.text = f"Töne: {self._tone_variant()}"
 
     def show_license(self, instance=None):
-        self.current_view = "license"
-        self.layout.clear_widgets()
-        self.layout.add_widget(Label(text="Lizenz (Deutsche Freie Software Lizenz)", font_size=scale_font(28)))
+        self._show_screen("license")
+
+    def _build_license_screen(self, layout):
+        layout.add_widget(FONTS.bind(Label(text="Lizenz (Deutsche Freie Software Lizenz)"), 28))
 
         license_text = """\
 Copyright (C) 2025 Arnd Brandes.
@@ -1203,20 +1810,23 @@ Weitere Details finden Sie unter https://dfsl.de
         scroll = ScrollView(size_hint=(1, 0.85))
         license_label = Label(
             text=license_text,
-            font_size=scale_font(16),
             halign="left",
             valign="top",
             text_size=(Window.width - 40, None),
             size_hint_y=None,
         )
+        FONTS.bind(license_label, 16)
         license_label.bind(texture_size=lambda inst, val: setattr(inst, "height", val[1]))
+        # Re-wrap with the window instead of rebuilding the screen
+        scroll.bind(width=lambda inst, w: setattr(license_label, "text_size", (w - 40, None)))
         scroll.add_widget(license_label)
 
-        back_btn = Button(text="Zurück", font_size=scale_font(24), size_hint=(1, 0.15), on_press=self.show_about)
-        self.layout.add_widget(scroll)
-        self.layout.add_widget(back_btn)
+        back_btn = FONTS.bind(Button(text="Zurück", size_hint=(1, 0.15), on_press=self.show_about), 24)
+        layout.add_widget(scroll)
+        layout.add_widget(back_btn)
 
     def open_support_link(self, instance=None):
+        import webbrowser
         url = "https://www.paypal.com/donate/?hosted_button_id=PND6Y8CGNZVW6"
         webbrowser.open(url)
 
@@ -1224,58 +1834,212 @@ Weitere Details finden Sie unter https://dfsl.de
     # Main menu / Highscore screens
     # -------------------------
     def main_menu(self):
-        self.current_view = "menu"
-        self.layout.clear_widgets()
+        self._show_screen("menu")
 
-        title = Label(text="JonTrain Rechentrainer", font_size=scale_font(32))
-        self.layout.add_widget(title)
+    def _build_menu_screen(self, layout):
+        title = FONTS.bind(Label(text="JonTrain Rechentrainer"), 32)
+        layout.add_widget(title)
 
         for cat_name, cat_key in CATEGORIES.items():
             row = BoxLayout()
             btn = Button(
                 text=cat_name,
-                font_size=scale_font(24),
                 on_press=lambda x, key=cat_key: self.start_training(key),
             )
             highscore_btn = Button(
                 text="H",
-                font_size=scale_font(24),
                 on_press=lambda x, key=cat_key: self.show_highscore(key),
                 size_hint_x=0.3,
             )
+            FONTS.bind(btn, 24)
+            FONTS.bind(highscore_btn, 24)
             row.add_widget(btn)
             row.add_widget(highscore_btn)
-            self.layout.add_widget(row)
-
-        about_btn = Button(text="Über", font_size=scale_font(24), on_press=self.show_about)
-        self.layout.add_widget(about_btn)
-
-    def show_highscore(self, category, new_entry=None):
-        self.current_view = "highscore"
-        self.layout.clear_widgets()
-        display_name = next(k for k, v in CATEGORIES.items() if v == category)
-        self.layout.add_widget(Label(text=f"Rangliste für {display_name}", font_size=scale_font(28)))
-
-        scores = self.highscores.get(category, [])
-        if scores:
-            for rank, score in enumerate(scores, start=1):
-                highlight = "[b]" if score == new_entry else ""
-                reset = "[/b]" if score == new_entry else ""
-                date_str = score.get("date", "")
-                name_str = score.get("name", "Anonym")
-                pts = score.get("points", 0)
-                self.layout.add_widget(
-                    Label(
-                        text=f"{highlight}#{rank} {name_str} - {pts} Punkte ({date_str}){reset}",
-                        font_size=scale_font(24),
-                        markup=True,
-                    )
-                )
-        else:
-            self.layout.add_widget(Label(text="Keine Einträge vorhanden", font_size=scale_font(24)))
+            layout.add_widget(row)
+
+        row = BoxLayout()
+        daily_btn = FONTS.bind(Button(text="Tagesaufgabe", on_press=self.start_daily_challenge), 24)
+        daily_highscore_btn = FONTS.bind(Button(
+            text="H",
+            on_press=lambda x: self.show_highscore(DAILY_HIGHSCORE_CATEGORY),
+            size_hint_x=0.3,
+        ), 24)
+        row.add_widget(daily_btn)
+        row.add_widget(daily_highscore_btn)
+        layout.add_widget(row)
 
-        back_btn = Button(text="Zurück", font_size=scale_font(24), on_press=self.return_to_main_menu)
-        self.layout.add_widget(back_btn)
+        mode_btn = FONTS.bind(Button(text=self._training_mode_text(), on_press=self.toggle_adaptive_mode), 24)
+        layout.add_widget(mode_btn)
+
+        about_btn = FONTS.bind(Button(text="Über", on_press=self.show_about), 24)
+        layout.add_widget(about_btn)
+
+    def _adaptive_mode(self) -> bool:
+        return self._config_flag("training", "adaptive", False)
+
+    def _training_mode_text(self) -> str:
+        return "Modus: adaptiv" if self._adaptive_mode() else "Modus: zufällig"
+
+    def toggle_adaptive_mode(self, instance=None):
+        try:
+            self.config.set("training", "adaptive", "0" if self._adaptive_mode() else "1")
+            self.config.write()
+        except Exception:
+            pass
+        if instance is not None:
+            instance.text = self._training_mode_text()
+
+    def show_highscore(self, category, entry_id=None):
+        """Ranking of category; entry_id (see _own_ranking_key) is shown in bold."""
+        self._highscore_view = (category, entry_id)
+        self._highscore_filter = ""
+        self._show_screen("highscore")
+        self._refresh_highscore_screen()
+
+    def _build_highscore_screen(self, layout):
+        self.highscore_title_label = FONTS.bind(Label(text=""), 28)
+        layout.add_widget(self.highscore_title_label)
+
+        search_row = BoxLayout()
+        self.highscore_filter_input = FONTS.bind(
+            TextInput(hint_text="Name oder Datum (TT.MM.JJJJ)", multiline=False), 20
+        )
+        self._highscore_filter_trigger = Clock.create_trigger(lambda dt: self._load_highscore_page(0), 0.3)
+        self.highscore_filter_input.bind(text=self._on_highscore_filter)
+        self.highscore_own_btn = FONTS.bind(
+            Button(text="Mein Platz", size_hint_x=0.4, on_press=self.jump_to_own_rank), 20
+        )
+        search_row.add_widget(self.highscore_filter_input)
+        search_row.add_widget(self.highscore_own_btn)
+        layout.add_widget(search_row)
+
+        # Recycled row labels: the widget count depends on the screen height, not on the entries
+        self.highscore_list = RecycleView(size_hint_y=6)
+        self.highscore_list.viewclass = "Label"
+        self.highscore_rows_layout = RecycleBoxLayout(
+            orientation="vertical", size_hint_y=None, default_size_hint=(1, None)
+        )
+        self.highscore_rows_layout.bind(minimum_height=self.highscore_rows_layout.setter("height"))
+        self.highscore_list.add_widget(self.highscore_rows_layout)
+        layout.add_widget(self.highscore_list)
+
+        nav_row = BoxLayout()
+        self.highscore_prev_btn = FONTS.bind(
+            Button(text="<", size_hint_x=0.3, on_press=lambda *_: self._load_highscore_page(self._highscore_page - 1)), 24
+        )
+        self.highscore_page_label = FONTS.bind(Label(text=""), 20)
+        self.highscore_next_btn = FONTS.bind(
+            Button(text=">", size_hint_x=0.3, on_press=lambda *_: self._load_highscore_page(self._highscore_page + 1)), 24
+        )
+        nav_row.add_widget(self.highscore_prev_btn)
+        nav_row.add_widget(self.highscore_page_label)
+        nav_row.add_widget(self.highscore_next_btn)
+        layout.add_widget(nav_row)
+
+        bottom_row = BoxLayout()
+        self.certificates_btn = FONTS.bind(Button(text="Urkunden", on_press=self.export_certificates), 24)
+        back_btn = FONTS.bind(Button(text="Zurück", on_press=self.return_to_main_menu), 24)
+        bottom_row.add_widget(self.certificates_btn)
+        bottom_row.add_widget(back_btn)
+        layout.add_widget(bottom_row)
+
+    def _refresh_highscore_screen(self):
+        category, entry_id = self._highscore_view
+        display_name = next(k for k, v in HIGHSCORE_CATEGORIES.items() if v == category)
+        self.highscore_title_label.text = f"Rangliste für {display_name}"
+        self.highscore_filter_input.text = self._highscore_filter
+        self.highscore_own_btn.disabled = entry_id is None
+        self.certificates_btn.disabled = self._certificate_batch is not None
+        self._highscore_rows = []
+        self._highscore_own_key = None
+        self._highscore_page = 0
+        self._highscore_pages = 1
+        self._render_highscore_rows()
+        # The own entry (if any) opens on its page
+        self._load_highscore_page(0, jump=entry_id is not None)
+
+    def _on_highscore_filter(self, _inst, value):
+        if value != self._highscore_filter:
+            self._highscore_filter = value
+            self._highscore_filter_trigger()
+
+    def jump_to_own_rank(self, instance=None):
+        if self._highscore_view[1] is None:
+            return
+        # The own entry may not match the filter: show it in the full list
+        self._highscore_filter = ""
+        self.highscore_filter_input.text = ""
+        self._load_highscore_page(self._highscore_page, jump=True)
+
+    def _load_highscore_page(self, page, jump=False):
+        """Fetch one page from the score database (persistence thread) or the in-memory top list."""
+        category, entry_id = self._highscore_view
+        if not jump:
+            page = max(0, min(page, self._highscore_pages - 1))
+        name, ts_prefix = parse_highscore_filter(self._highscore_filter)
+        db = self._score_db
+        if db is None:
+            self._apply_highscore_page(self._memory_highscore_page(category, entry_id, page, name, ts_prefix, jump))
+            return
+        self._persist.submit(
+            lambda: self._db_highscore_page(db, category, entry_id, page, name, ts_prefix, jump),
+            key="highscore_page",
+            on_done=self._apply_highscore_page,
+        )
+
+    def _memory_highscore_page(self, category, entry_id, page, name, ts_prefix, jump):
+        board = self.highscores.get(category) or Leaderboard()
+        rows = [row for row in board.rows(0, len(board)) if entry_matches(row[2], name, ts_prefix)]
+        if jump and entry_id in board:
+            page = next((i for i, row in enumerate(rows) if row[1] == entry_id), 0) // HIGHSCORE_PAGE_SIZE
+        start = page * HIGHSCORE_PAGE_SIZE
+        return category, page, len(rows), rows[start:start + HIGHSCORE_PAGE_SIZE], entry_id
+
+    @staticmethod
+    def _db_highscore_page(db, category, own_id, page, name, ts_prefix, jump):
+        """(category, page, matching rows, [(rank, key, entry)], own key) from SQLite."""
+        if jump and own_id is not None:
+            rank = db.rank(category, own_id)
+            if rank:
+                page = (rank - 1) // HIGHSCORE_PAGE_SIZE
+        total = db.count(category, name, ts_prefix)
+        rows = db.page(category, HIGHSCORE_PAGE_SIZE, page * HIGHSCORE_PAGE_SIZE, name, ts_prefix)
+        return category, page, total, [(rank, entry["id"], entry) for rank, entry in rows], own_id
+
+    def _apply_highscore_page(self, result):
+        category, page, total, rows, own_key = result
+        if self.current_view != "highscore" or self._highscore_view[0] != category:
+            return  # answer to a view that is gone
+        self._highscore_page = page
+        self._highscore_pages = max(1, -(-total // HIGHSCORE_PAGE_SIZE))
+        self._highscore_rows = rows
+        self._highscore_own_key = own_key
+        self.highscore_page_label.text = f"Seite {page + 1} / {self._highscore_pages}"
+        self.highscore_prev_btn.disabled = page <= 0
+        self.highscore_next_btn.disabled = page + 1 >= self._highscore_pages
+        own_index = self._render_highscore_rows()
+        if own_index is not None and len(rows) > 1:
+            self.highscore_list.scroll_y = 1.0 - own_index / (len(rows) - 1)
+        else:
+            self.highscore_list.scroll_y = 1.0
+
+    def _render_highscore_rows(self):
+        """Fill the RecycleView from the loaded page. Returns the index of the own row."""
+        font_size = FONTS.size(24)
+        self.highscore_rows_layout.default_size = (None, FONTS.size(44))
+        own_key = self._highscore_own_key
+        own_index = None
+        data = []
+        for i, (rank, key, score) in enumerate(self._highscore_rows):
+            own = own_key is not None and key == own_key
+            if own:
+                own_index = i
+            text = f"#{rank} {score.get('name', 'Anonym')} - {score.get('points', 0)} Punkte ({score.get('date', '')})"
+            data.append({"text": f"[b]{text}[/b]" if own else text, "markup": True, "font_size": font_size})
+        if not data:
+            data.append({"text": "Keine Einträge vorhanden", "markup": False, "font_size": font_size})
+        self.highscore_list.data = data
+        return own_index
 
     def return_to_main_menu(self, instance=None):
         try:
@@ -1288,231 +2052,291 @@ Weitere Details finden Sie unter https://dfsl.de
     # Training screen / logic
     # -------------------------
     def clear_input(self):
-        for key in self.button_refs:
-            if self.button_refs[key]:
-                self.button_refs[key].background_color = (1, 1, 1, 1)
-        self.answer = {"tens": "", "ones": "", "remainder": ""}
-        self.button_refs = {"tens": None, "ones": None, "remainder": None}
+        self.session.clear_input()
+        self.numpad.set_active(())
         self.update_answer_display()
 
-    def start_training(self, category):
-        self.current_view = "training"
-        self.category = category
-        self.points = 0
-        self.time_left = 300
-        self.layout.clear_widgets()
-
+    def start_training(self, category, seed=None, daily=None):
+        # category picks the questions; self.category is where the result is ranked
+        self.category = DAILY_HIGHSCORE_CATEGORY if daily is not None else category
+        # Every session is recorded: seed plus input events replay it exactly
+        meta = {"app_version": __version__, "platform": kivy_platform}
+        if daily is not None:
+            meta["daily"] = daily.isoformat()
+        # Adaptive: weak facts first, seeded from the long-term fact statistics
+        mode = "adaptive" if self._adaptive_mode() and daily is None else "random"
+        log = SessionLog(new_seed() if seed is None else seed, category, mode=mode, **meta)
+        self.session = build_session(log, stats=self.fact_stats)
+        self._last_result = None
+        self._show_screen("training")
+
+        self.session.start()
+        self._refresh_training_screen()
+        self._schedule_timer()
+        self._frame_meter.reset()
+
+    def start_daily_challenge(self, instance=None):
+        # Same questions on every device today (never adaptive)
+        today = date.today()
+        self.start_training(DAILY_CATEGORY, seed=daily_seed(today), daily=today)
+
+    def _save_session_log(self):
+        log = self.session.log
+        log.finish(self.session)
+        path = self.get_session_log_path()
+        self._persist.submit(lambda: save_session_log(path, log), key="session_log")
+
+    def _build_training_screen(self, layout):
         top_bar = BoxLayout()
         left_spacer = Label(size_hint_x=0.15)
-        self.prev_question_label = Label(text="", font_size=scale_font(24), halign="left")
+        self.prev_question_label = FONTS.bind(Label(text="", halign="left"), 24)
         exit_btn = Button(
             text="X",
-            font_size=scale_font(16),
             size_hint_x=0.15,
             on_press=lambda *_: self.confirm_end_training(),
         )
+        FONTS.bind(exit_btn, 16)
 
         top_bar.add_widget(left_spacer)
         top_bar.add_widget(self.prev_question_label)
         top_bar.add_widget(exit_btn)
-        self.layout.add_widget(top_bar)
-
-        separator = Label(text="―" * 50, font_size=scale_font(16), size_hint_y=None, height=scale_font(8))
-        self.layout.add_widget(separator)
+        layout.add_widget(top_bar)
 
-        self.question_label = Label(text="", font_size=scale_font(28))
-        self.layout.add_widget(self.question_label)
+        separator = FONTS.bind(Label(text="―" * 50, size_hint_y=None), 16)
+        FONTS.bind(separator, 8, "height")
+        layout.add_widget(separator)
 
-        self.answer_label = Label(text="", font_size=scale_font(28))
-        self.layout.add_widget(self.answer_label)
+        self.question_label = FONTS.bind(Label(text=""), 28)
+        layout.add_widget(self.question_label)
 
-        separator2 = Label(text="―" * 50, font_size=scale_font(16), size_hint_y=None, height=scale_font(8))
-        self.layout.add_widget(separator2)
+        self.answer_label = FONTS.bind(Label(text=""), 28)
+        layout.add_widget(self.answer_label)
 
-        self.button_refs = {"tens": None, "ones": None, "remainder": None}
+        separator2 = FONTS.bind(Label(text="―" * 50, size_hint_y=None), 16)
+        FONTS.bind(separator2, 8, "height")
+        layout.add_widget(separator2)
 
-        num_buttons = [
-            [("10", "tens"), ("20", "tens"), ("30", "tens"), ("40", "tens"), ("50", "tens"),
-             ("60", "tens"), ("70", "tens"), ("80", "tens"), ("90", "tens"), ("100", "tens")],
-            [("1", "ones"), ("2", "ones"), ("3", "ones"), ("4", "ones"),
-             ("5", "ones"), ("6", "ones"), ("7", "ones"), ("8", "ones"), ("9", "ones"), ("10", "tens")],
-            [("R0", "remainder"), ("R1", "remainder"), ("R2", "remainder"), ("R3", "remainder"),
-             ("R4", "remainder"), ("R5", "remainder"), ("R6", "remainder"), ("R7", "remainder"),
-             ("R8", "remainder"), ("R9", "remainder")]
-        ]
-
-        for row in num_buttons:
-            button_row = BoxLayout()
-            for num, group in row:
-                btn = Button(text=num, font_size=scale_font(24), on_press=lambda x, grp=group: self.toggle_input(x, grp))
-                button_row.add_widget(btn)
-            self.layout.add_widget(button_row)
+        # One share per key row, like the former rows of Buttons
+        self.numpad = NumberPad(
+            KEYPAD_ROWS,
+            on_key=self.toggle_input,
+            glyph_cache=self._glyph_textures,
+            size_hint_y=len(KEYPAD_ROWS),
+        )
+        FONTS.bind(self.numpad, 24)
+        layout.add_widget(self.numpad)
 
         control_row = BoxLayout()
-        submit_btn = Button(text="EINGABE", font_size=scale_font(24), on_press=self.check_answer)
-        clear_btn = Button(text="LÖSCHEN", font_size=scale_font(24), on_press=lambda *_: self.clear_input())
+        submit_btn = FONTS.bind(Button(text="EINGABE", on_press=self.check_answer), 24)
+        clear_btn = FONTS.bind(Button(text="LÖSCHEN", on_press=lambda *_: self.clear_input()), 24)
         control_row.add_widget(clear_btn)
         control_row.add_widget(submit_btn)
-        self.layout.add_widget(control_row)
+        layout.add_widget(control_row)
 
-        self.timer_label = Label(text=f"Zeit: {self.time_left} s", font_size=scale_font(24))
-        self.layout.add_widget(self.timer_label)
+        self.timer_label = FONTS.bind(Label(text=""), 24)
+        layout.add_widget(self.timer_label)
 
-        self.points_label = Label(text=f"Punkte: {self.points}", font_size=scale_font(24))
-        self.layout.add_widget(self.points_label)
+        self.points_label = FONTS.bind(Label(text=""), 24)
+        layout.add_widget(self.points_label)
 
-        Clock.schedule_interval(self.update_timer, 1)
-        self.generate_question()
-
-    def generate_question(self):
-        while True:
-            case = randint(1, 10)
-
-            if case < 5 and self.category in ["mult", "mult_div", "all"]:
-                a, b = randint(1, 10), randint(1, 10)
-                self.current_question = (a, b, "mult")
-                self.question = f"{a} {OP_MUL} {b}"
-                self.question_label.text = f"Was ist {a} {OP_MUL} {b}?"
-                break
-
-            if case < 8 and self.category in ["div", "mult_div", "div_divrest", "all"]:
-                a, b = randint(1, 10), randint(1, 10)
-                self.current_question = (a * b, b, "div")
-                self.question = f"{a * b} {OP_DIV} {b}"
-                self.question_label.text = f"Was ist {a * b} {OP_DIV} {b}?"
-                break
-
-            if case >= 8 and self.category in ["div_rest", "div_divrest", "all"]:
-                a, b = randint(1, 10), randint(2, 10)
-                remainder = randint(0, b - 1)
-                self.current_question = (a * b + remainder, b, remainder, "div_rest")
-                self.question = f"{a * b + remainder} {OP_DIV} {b}"
-                self.question_label.text = f"Was ist {a * b + remainder} {OP_DIV} {b}?"
-                break
-
-    def toggle_input(self, instance, group):
-        if self.button_refs[group]:
-            self.button_refs[group].background_color = (1, 1, 1, 1)
-
-        if self.button_refs[group] == instance:
-            self.answer[group] = ""
-            self.button_refs[group] = None
+    def _refresh_training_screen(self):
+        result = self._last_result
+        if result is None:
+            self.prev_question_label.text = ""
+            self.prev_question_label.color = (1, 1, 1, 1)
         else:
-            self.answer[group] = instance.text
-            self.button_refs[group] = instance
-            instance.background_color = (0.5, 1, 0.5, 1)
+            self.prev_question_label.text = result.text
+            self.prev_question_label.color = (0, 1, 0, 1) if result.correct else (1, 0, 0, 1)
+        self.timer_label.text = f"Zeit: {self.session.time_text()}"
+        self.points_label.text = f"Punkte: {self.session.points}"
+        self.show_question()
+        self.numpad.set_active(self.session.selected.values())
+        self.update_answer_display()
 
+    def show_question(self):
+        self.question_label.text = self.session.question.prompt
+
+    def toggle_input(self, index, text, group):
+        # The key index tells the two "10" keys (tens row / ones row) apart
+        self.session.toggle(group, text, key=index)
+        self.numpad.set_active(self.session.selected.values())
         self.update_answer_display()
 
     def update_answer_display(self):
-        tens = convert_to_number(self.answer["tens"] if self.answer["tens"] else "")
-        ones = convert_to_number(self.answer["ones"] if self.answer["ones"] else "")
-        remainder = self.answer["remainder"] if self.answer["remainder"] else ""
-        self.answer_label.text = f"{tens + ones}{remainder}"
+        self.answer_label.text = self.session.answer_text()
 
     def check_answer(self, instance):
-        tens = convert_to_number(self.answer["tens"])
-        ones = convert_to_number(self.answer["ones"])
-        remainder = convert_to_number(self.answer["remainder"].replace("R", "")) if self.answer["remainder"] else 0
-        user_answer = (tens + ones, remainder)
-
-        if self.current_question[-1] == "mult":
-            correct_answer = (self.current_question[0] * self.current_question[1], 0)
-            points_awarded = 1 if user_answer == correct_answer else -5
-        elif self.current_question[-1] == "div":
-            correct_answer = (self.current_question[0] // self.current_question[1], 0)
-            points_awarded = 2 if user_answer == correct_answer else -3
-        else:  # div_rest
-            correct_answer = (self.current_question[0] // self.current_question[1], self.current_question[2])
-            points_awarded = 5 if user_answer == correct_answer else -3
-
-        if user_answer == correct_answer:
-            result_text = f"{user_answer[0]}" + (f" R{user_answer[1]}" if user_answer[1] else "") + " ist RICHTIG!"
-            self.points += points_awarded
+        if self.session.is_over:
+            # Deadline passed before the timer callback ran
+            self.update_timer(0)
+            return
+        tracer = self._tracer
+        tracer.begin()
+        result = self.session.submit()  # scores and draws the next question
+        self._last_result = result
+        self.fact_stats.record(result.question, result.correct, result.response_time)
+        self._fact_stats_dirty = True
+        tracer.mark("submit")
+
+        if result.correct:
             self._feedback(True)
             self.prev_question_label.color = (0, 1, 0, 1)
         else:
-            correct_text = f"{correct_answer[0]}" + (f" R{correct_answer[1]}" if correct_answer[1] else "")
-            result_text = (
-                f"{user_answer[0]}" + (f" R{user_answer[1]}" if user_answer[1] else "") +
-                f" ist FALSCH!\n>>> {self.question} = {correct_text} <<<"
-            )
-            self.points = max(0, self.points + points_awarded)
             self._feedback(False)
             self.prev_question_label.color = (1, 0, 0, 1)
+        tracer.mark("feedback")
 
-        self.prev_question_label.text = result_text
-        self.points_label.text = f"Punkte: {self.points}"
+        self.prev_question_label.text = result.text
+        self.points_label.text = f"Punkte: {self.session.points}"
 
-        self.generate_question()
+        self.show_question()
+        tracer.mark("labels")
         self.clear_input()
+        tracer.mark("clear_input")
+        # "frame" and "total" are recorded when the next frame is flipped
+
+    def _close_latency_trace(self, *_):
+        if self._tracer.close("frame"):
+            self._update_latency_overlay()
+
+    def _update_latency_overlay(self):
+        if self._latency_overlay is None:
+            self._latency_overlay = Label(
+                font_name="RobotoMono-Regular",
+                font_size=FONTS.size(12),
+                color=(1, 1, 0, 1),
+                halign="left",
+                valign="top",
+                size_hint=(None, None),
+            )
+            self._latency_overlay.bind(texture_size=lambda inst, size: setattr(inst, "size", size))
+            Window.add_widget(self._latency_overlay)
+        overlay = self._latency_overlay
+        overlay.text = self._tracer.report()
+        overlay.pos = (4, Window.height - overlay.height - 4)
+
+    def _dump_latency_trace(self):
+        if not self._tracer.histograms:
+            return
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.user_data_dir, f"jontrain-latency-{stamp}.json")
+        meta = {"app_version": __version__, "platform": kivy_platform, "category": self.category}
+        Logger.info("JonTrain: Latenz\n" + self._tracer.report())
+        data = self._tracer.snapshot(**meta)
+        self._persist.submit(lambda: atomic_write_json(path, data))
+
+    def _schedule_timer(self):
+        # One wakeup per change of the displayed value, computed from the deadline
+        Clock.unschedule(self.update_timer)
+        Clock.schedule_once(self.update_timer, self.session.next_display_change())
 
     def update_timer(self, dt):
-        if self.time_left > 0:
-            self.time_left -= 1
-            self.timer_label.text = f"Zeit: {self.time_left} s"
-        else:
+        if self.session.is_over:
             Clock.unschedule(self.update_timer)
             self.end_game()
+            return
+        self.timer_label.text = f"Zeit: {self.session.time_text()}"
+        if self.session.remaining() <= FINE_COUNTDOWN_SECONDS:
+            # Tenths need more than the idle frame rate
+            self._governor.wake()
+        self._schedule_timer()
 
     def end_game(self):
-        self.current_view = "endgame"
-        self.layout.clear_widgets()
-
-        self.layout.add_widget(Label(text=f"Zeit abgelaufen! Deine Punkte: {self.points}", font_size=scale_font(28)))
-        self.name_input = TextInput(hint_text="Dein Name", font_size=scale_font(24), multiline=False)
-        self.layout.add_widget(self.name_input)
-
-        submit_btn = Button(text="Speichern", font_size=scale_font(24), on_press=self.save_highscore)
-        self.layout.add_widget(submit_btn)
-
-        cancel_btn = Button(text="Zurück zum Menü", font_size=scale_font(24), on_press=self.return_to_main_menu)
-        self.layout.add_widget(cancel_btn)
+        Logger.info(f"JonTrain: Training {self._frame_meter.report()}")
+        if self._tracer.enabled:
+            self._dump_latency_trace()
+        self._save_fact_stats()
+        self._save_session_log()
+        self._player_name = ""
+        self._show_screen("endgame")
+        self._refresh_endgame_screen()
+
+    def _build_endgame_screen(self, layout):
+        self.endgame_points_label = FONTS.bind(Label(text=""), 28)
+        layout.add_widget(self.endgame_points_label)
+        self.name_input = FONTS.bind(TextInput(hint_text="Dein Name", multiline=False), 24)
+        self.name_input.bind(text=lambda inst, value: setattr(self, "_player_name", value))
+        layout.add_widget(self.name_input)
+
+        submit_btn = FONTS.bind(Button(text="Speichern", on_press=self.save_highscore), 24)
+        layout.add_widget(submit_btn)
+
+        cancel_btn = FONTS.bind(Button(text="Zurück zum Menü", on_press=self.return_to_main_menu), 24)
+        layout.add_widget(cancel_btn)
+
+    def _refresh_endgame_screen(self):
+        self.endgame_points_label.text = f"Zeit abgelaufen! Deine Punkte: {self.session.points}"
+        self.name_input.text = self._player_name
 
     def save_highscore(self, instance):
         player_name = str(self.name_input.text).strip() if str(self.name_input.text).strip() else "Anonym"
         timestamp = datetime.now().strftime("%d.%m.%Y %H:%M")
 
-        if self.category not in self.highscores:
-            self.highscores[self.category] = []
-
         new_entry = {
             "name": player_name,
-            "points": self.points,
+            "points": self.session.points,
             "date": timestamp,
             "app_version": __version__,
             "schema_version": HIGHSCORE_SCHEMA_VERSION,
         }
 
-        self.highscores[self.category].append(new_entry)
-        self.highscores[self.category] = sorted(
-            self.highscores[self.category],
-            key=lambda x: x.get("points", 0),
-            reverse=True,
-        )[:10]
-
-        self._save_highscores_file()
+        self._last_db_id = None
+        self._last_entry_id = self._append_highscore(self.category, new_entry, on_saved=self._show_success_rank)
         self.last_new_entry = new_entry
 
         self.show_success_screen(new_entry)
 
+    def _show_success_rank(self, saved):
+        if saved:
+            rank, total, self._last_db_id = saved
+            self._success_rank_text = f"Platz {rank} von {total}"
+            if self.current_view == "success":
+                self.success_rank_label.text = self._success_rank_text
+
+    def _own_ranking_key(self):
+        """Key of the last saved entry in the ranking rows (None if unknown).
+
+        With the database the rows are keyed by SQLite id, which reaches
+        every saved entry; the leaderboard id only covers the kept top list.
+        """
+        return self._last_db_id if self._score_db is not None else self._last_entry_id
+
     def show_success_screen(self, entry):
-        self.current_view = "success"
-        self.layout.clear_widgets()
+        self._success_entry = entry
+        self._success_rank_text = ""
+        self._show_screen("success")
+        self._refresh_success_screen()
+
+    def _build_success_screen(self, layout):
+        layout.add_widget(FONTS.bind(Label(text="Highscore gespeichert!"), 30))
+        self.success_name_label = FONTS.bind(Label(text=""), 28)
+        layout.add_widget(self.success_name_label)
+        self.success_mode_label = FONTS.bind(Label(text=""), 24)
+        layout.add_widget(self.success_mode_label)
+
+        self.success_rank_label = FONTS.bind(Label(text=""), 24)
+        layout.add_widget(self.success_rank_label)
+
+        share_btn = FONTS.bind(Button(text="Erfolg teilen", on_press=self.share_achievement), 24)
+        layout.add_widget(share_btn)
+
+        ranking_btn = FONTS.bind(
+            Button(text="Rangliste", on_press=lambda *_: self.show_highscore(self.category, self._own_ranking_key())), 24
+        )
+        layout.add_widget(ranking_btn)
+
+        back_btn = FONTS.bind(Button(text="Zurück zum Menü", on_press=self.return_to_main_menu), 24)
+        layout.add_widget(back_btn)
 
-        category_display = next((k for k, v in CATEGORIES.items() if v == self.category), self.category)
+    def _refresh_success_screen(self):
+        entry = self._success_entry
+        category_display = next((k for k, v in HIGHSCORE_CATEGORIES.items() if v == self.category), self.category)
         pts = entry.get("points", 0)
         name = entry.get("name", "Anonym")
 
-        self.layout.add_widget(Label(text="Highscore gespeichert!", font_size=scale_font(30)))
-        self.layout.add_widget(Label(text=f"{name} — {pts} Punkte", font_size=scale_font(28)))
-        self.layout.add_widget(Label(text=f"Modus: {category_display}", font_size=scale_font(24)))
-
-        share_btn = Button(text="Erfolg teilen", font_size=scale_font(24), on_press=self.share_achievement)
-        self.layout.add_widget(share_btn)
-
-        back_btn = Button(text="Zurück zum Menü", font_size=scale_font(24), on_press=self.return_to_main_menu)
-        self.layout.add_widget(back_btn)
+        self.success_name_label.text = f"{name} — {pts} Punkte"
+        self.success_mode_label.text = f"Modus: {category_display}"
+        self.success_rank_label.text = self._success_rank_text
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Training keypad as a single widget: every key is two rectangles on one
+# canvas (background + cached glyph texture) instead of a Button with its
+# own label, and touches are mapped to keys arithmetically.
+
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, Rectangle
+from kivy.properties import NumericProperty
+from kivy.uix.widget import Widget
+
+KEY_COLOR = (0.35, 0.35, 0.35, 1)
+KEY_ACTIVE_COLOR = (0.2, 0.55, 0.2, 1)
+KEY_GAP = 1.5  # px on each side of a key
+
+
+class NumberPad(Widget):
+    """Grid of keys; rows is a list of equally long [(text, group), ...].
+
+    Keys are addressed by index = row * cols + column. on_key(index, text,
+    group) runs on touch down; which keys are shown as selected is up to
+    the caller (set_active).
+    """
+
+    font_size = NumericProperty(24)
+
+    def __init__(self, rows, on_key=None, glyph_cache=None, **kwargs):
+        super().__init__(**kwargs)
+        self.cols = len(rows[0])
+        if any(len(row) != self.cols for row in rows):
+            raise ValueError("NumberPad: alle Zeilen brauchen gleich viele Tasten")
+        self.rows = len(rows)
+        self.keys = [key for row in rows for key in row]
+        self._on_key = on_key
+        # (text, font_size) -> texture; shared with the app's warm-up
+        self._glyphs = {} if glyph_cache is None else glyph_cache
+        self._active = set()
+        self._backgrounds = []
+        self._key_rects = []
+        self._glyph_rects = []
+
+        with self.canvas:
+            for _ in self.keys:
+                self._backgrounds.append(Color(*KEY_COLOR))
+                self._key_rects.append(Rectangle())
+                Color(1, 1, 1, 1)
+                self._glyph_rects.append(Rectangle())
+
+        self.bind(pos=self._layout_keys, size=self._layout_keys, font_size=self._update_glyphs)
+        self._update_glyphs()
+
+    def _glyph(self, text: str):
+        key = (text, int(self.font_size))
+        texture = self._glyphs.get(key)
+        if texture is None:
+            label = CoreLabel(text=text, font_size=key[1])
+            label.refresh()
+            texture = self._glyphs[key] = label.texture
+        return texture
+
+    def _update_glyphs(self, *_):
+        for (text, _group), rect in zip(self.keys, self._glyph_rects):
+            texture = self._glyph(text)
+            rect.texture = texture
+            rect.size = texture.size
+        self._layout_keys()
+
+    def _layout_keys(self, *_):
+        kw = self.width / self.cols
+        kh = self.height / self.rows
+        for index, (key_rect, glyph_rect) in enumerate(zip(self._key_rects, self._glyph_rects)):
+            r, c = divmod(index, self.cols)
+            x = self.x + c * kw
+            y = self.top - (r + 1) * kh
+            key_rect.pos = (x + KEY_GAP, y + KEY_GAP)
+            key_rect.size = (max(0, kw - 2 * KEY_GAP), max(0, kh - 2 * KEY_GAP))
+            gw, gh = glyph_rect.size
+            glyph_rect.pos = (int(x + (kw - gw) / 2), int(y + (kh - gh) / 2))
+
+    def key_at(self, x, y):
+        """Index of the key under (x, y) in window coordinates, or None."""
+        if not self.collide_point(x, y):
+            return None
+        c = min(int((x - self.x) * self.cols / self.width), self.cols - 1)
+        r = min(int((self.top - y) * self.rows / self.height), self.rows - 1)
+        return r * self.cols + c
+
+    def set_active(self, indices):
+        """Show exactly these key indices as selected (None entries are ignored)."""
+        active = {i for i in indices if i is not None}
+        for i in self._active ^ active:
+            self._backgrounds[i].rgba = KEY_ACTIVE_COLOR if i in active else KEY_COLOR
+        self._active = active
+
+    def on_touch_down(self, touch):
+        index = self.key_at(*touch.pos)
+        if index is None:
+            return super().on_touch_down(touch)
+        if self._on_key is not None:
+            text, group = self.keys[index]
+            self._on_key(index, text, group)
+        return True
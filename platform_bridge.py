@@ -0,0 +1,133 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Lazy access to platform classes (pyjnius/pyobjus) and optional modules.
+# Nothing is imported or resolved at import time; every class or module is
+# looked up on first use and cached, so the cold start only pays for what
+# the first screen actually needs.
+
+import importlib
+import threading
+from types import SimpleNamespace
+
+
+class ClassRegistry:
+    """Named platform classes, resolved on first attribute access.
+
+    loader(path) returns the class for a platform path (e.g. pyjnius
+    autoclass). Names listed in optional resolve to None instead of raising
+    when the class is missing on the device. get(path) resolves classes that
+    have no registered name, with the same cache.
+    """
+
+    def __init__(self, loader, classes=None, optional=()):
+        self._loader = loader
+        self._classes = dict(classes or {})
+        self._optional = frozenset(optional)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, optional: bool = False):
+        try:
+            return self._cache[path]
+        except KeyError:
+            pass
+        with self._lock:
+            if path not in self._cache:
+                try:
+                    self._cache[path] = self._loader(path)
+                except Exception:
+                    if not optional:
+                        raise
+                    self._cache[path] = None
+            return self._cache[path]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            path = self._classes[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return self.get(path, optional=name in self._optional)
+
+    def resolved(self) -> list:
+        """Paths looked up so far (for startup diagnostics)."""
+        return list(self._cache)
+
+
+_modules = {}
+_modules_lock = threading.Lock()
+
+
+def optional_module(name: str):
+    """Imported module name, or None if it is not installed (cached either way)."""
+    try:
+        return _modules[name]
+    except KeyError:
+        pass
+    with _modules_lock:
+        if name not in _modules:
+            try:
+                _modules[name] = importlib.import_module(name)
+            except Exception:
+                _modules[name] = None
+        return _modules[name]
+
+
+def jnius_autoclass(path: str):
+    from jnius import autoclass  # type: ignore
+    return autoclass(path)
+
+
+def jnius_jarray():
+    """pyjnius jarray helper, or None for builds that lack it."""
+    jnius = optional_module("jnius")
+    return getattr(jnius, "jarray", None)
+
+
+# Android classes used by the app; resolved when first touched
+ANDROID_CLASSES = ClassRegistry(
+    jnius_autoclass,
+    {
+        "PythonActivity": "org.kivy.android.PythonActivity",
+        "Intent": "android.content.Intent",
+        "String": "java.lang.String",
+        "Build_VERSION": "android.os.Build$VERSION",
+        "Context": "android.content.Context",
+        "VibrationEffect": "android.os.VibrationEffect",
+        "HapticFeedbackConstants": "android.view.HapticFeedbackConstants",
+        "ClipData": "android.content.ClipData",
+        "VibratorManager": "android.os.VibratorManager",
+        "MediaStore_Images_Media": "android.provider.MediaStore$Images$Media",
+        "MediaStore_MediaColumns": "android.provider.MediaStore$MediaColumns",
+        "MediaStore_Downloads": "android.provider.MediaStore$Downloads",
+        "ContentValues": "android.content.ContentValues",
+        "ByteArrayOutputStream": "java.io.ByteArrayOutputStream",
+        "JByteArray": "[B",
+    },
+    # VibratorManager: API 31+, MediaStore$Downloads: API 29+
+    optional=("VibratorManager", "MediaStore_Downloads", "JByteArray"),
+)
+
+
+def pyzipper_module():
+    """pyzipper (AES zip backups) or None."""
+    return optional_module("pyzipper")
+
+
+_aes_gcm = None
+
+
+def aes_gcm():
+    """pycryptodome AES/PBKDF2/SHA256 for the AES-GCM fallback, or None."""
+    global _aes_gcm
+    if _aes_gcm is None:
+        cipher = optional_module("Crypto.Cipher.AES")
+        kdf = optional_module("Crypto.Protocol.KDF")
+        sha256 = optional_module("Crypto.Hash.SHA256")
+        if cipher is None or kdf is None or sha256 is None:
+            _aes_gcm = False
+        else:
+            _aes_gcm = SimpleNamespace(AES=cipher, PBKDF2=kdf.PBKDF2, SHA256=sha256)
+    return _aes_gcm or None
@@ -0,0 +1,38 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Minimal PNG encoder (RGBA, 8 bit) on zlib only: turns raw pixels read back
+# from an Fbo into file bytes without a round trip through an image library.
+# Pure CPU work, so it can run on any thread.
+
+import struct
+import zlib
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def encode_png(rgba, width: int, height: int, flip: bool = False, level: int = 6) -> bytes:
+    """PNG bytes for width*height RGBA pixels; flip for bottom-up rows (OpenGL read-back)."""
+    stride = width * 4
+    view = memoryview(rgba)
+    if len(view) != stride * height:
+        raise ValueError(f"PNG: {len(view)} Bytes passen nicht zu {width}x{height} RGBA")
+    rows = range(height - 1, -1, -1) if flip else range(height)
+    # Filter type 0 per row; flat badge colours compress well without prediction
+    raw = b"".join(b"\x00" + view[y * stride:(y + 1) * stride] for y in rows)
+    return encode_png_scanlines(raw, width, height, level)
+
+
+def encode_png_scanlines(raw, width: int, height: int, level: int = 6) -> bytes:
+    """PNG bytes for ready scanlines (filter byte + RGBA row, top-down), e.g. filled in place."""
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"".join((
+        _SIGNATURE,
+        _chunk(b"IHDR", header),
+        _chunk(b"IDAT", zlib.compress(raw, level)),
+        _chunk(b"IEND", b""),
+    ))
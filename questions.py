@@ -0,0 +1,152 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+from collections import deque
+from functools import lru_cache
+from random import Random
+from typing import NamedTuple, Optional, Tuple
+
+# Operator glyphs (German style)
+OP_MUL = "\u00B7"  # middle dot
+OP_DIV = ":"       # colon
+
+MAX_FACTOR = 10
+
+# Share of the historic 1..10 draw each operation received per category:
+# 1-4 multiplication (falls through to division if not allowed),
+# 5-7 division, 8-10 division with remainder.
+CATEGORY_OPS = {
+    "mult": (("mult", 4),),
+    "div": (("div", 7),),
+    "mult_div": (("mult", 4), ("div", 3)),
+    "div_rest": (("div_rest", 3),),
+    "div_divrest": (("div", 7), ("div_rest", 3)),
+    "all": (("mult", 4), ("div", 3), ("div_rest", 3)),
+}
+
+
+class Question(NamedTuple):
+    a: int          # first factor or dividend
+    b: int          # second factor or divisor
+    remainder: int
+    op: str         # "mult" / "div" / "div_rest"
+    answer: Tuple[int, int]  # (result, remainder)
+    text: str       # e.g. "56 : 8"
+    prompt: str     # e.g. "Was ist 56 : 8?"
+
+
+def _make_question(a: int, b: int, remainder: int, op: str, answer) -> Question:
+    glyph = OP_MUL if op == "mult" else OP_DIV
+    text = f"{a} {glyph} {b}"
+    return Question(a, b, remainder, op, answer, text, f"Was ist {text}?")
+
+
+def _op_facts(op: str, max_factor: int):
+    """Yield (question, weight) for one operation; weights sum to 1."""
+    n = max_factor
+    if op == "mult":
+        for a in range(1, n + 1):
+            for b in range(1, n + 1):
+                yield _make_question(a, b, 0, "mult", (a * b, 0)), 1.0 / (n * n)
+    elif op == "div":
+        for a in range(1, n + 1):
+            for b in range(1, n + 1):
+                yield _make_question(a * b, b, 0, "div", (a, 0)), 1.0 / (n * n)
+    elif op == "div_rest":
+        # Divisor 2..n, remainder uniform per divisor (as the old randint draws)
+        for a in range(1, n + 1):
+            for b in range(2, n + 1):
+                for r in range(b):
+                    w = 1.0 / (n * (n - 1) * b)
+                    yield _make_question(a * b + r, b, r, "div_rest", (a, r)), w
+    else:
+        raise ValueError(f"Unbekannte Rechenart: {op}")
+
+
+class QuestionTable:
+    """All facts of a category with a Vose alias table for O(1) weighted draws."""
+
+    def __init__(self, category: str, max_factor: int = MAX_FACTOR):
+        if category not in CATEGORY_OPS:
+            raise ValueError(f"Unbekannte Kategorie: {category}")
+        self.category = category
+        self.max_factor = max_factor
+
+        ops = CATEGORY_OPS[category]
+        total = float(sum(share for _, share in ops))
+        facts = []
+        weights = []
+        for op, share in ops:
+            for q, w in _op_facts(op, max_factor):
+                facts.append(q)
+                weights.append(w * share / total)
+
+        self.facts = tuple(facts)
+        self.weights = tuple(weights)
+        self._prob, self._alias = self._build_alias(weights)
+
+    @staticmethod
+    def _build_alias(weights):
+        n = len(weights)
+        scaled = [w * n for w in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        for i in large:
+            prob[i] = 1.0
+        for i in small:
+            prob[i] = 1.0  # numerical leftovers
+        return tuple(prob), tuple(alias)
+
+    def __len__(self):
+        return len(self.facts)
+
+    def sample_index(self, rng: Random) -> int:
+        i = int(rng.random() * len(self._prob))
+        return i if rng.random() < self._prob[i] else self._alias[i]
+
+
+@lru_cache(maxsize=None)
+def question_table(category: str, max_factor: int = MAX_FACTOR) -> QuestionTable:
+    return QuestionTable(category, max_factor)
+
+
+class QuestionPool:
+    """Per-session question source drawing from a shared QuestionTable."""
+
+    # Upper bound on redraws when avoiding recent questions
+    MAX_REDRAWS = 8
+
+    def __init__(self, category: str, rng: Optional[Random] = None, recent: int = 0,
+                 max_factor: int = MAX_FACTOR):
+        self.table = question_table(category, max_factor)
+        self.rng = rng if rng is not None else Random()
+        # Never block more than half the pool, otherwise redraws pile up
+        self._recent = deque(maxlen=max(0, min(recent, len(self.table) // 2)))
+
+    def draw(self) -> Question:
+        table = self.table
+        rng = self.rng
+        recent = self._recent
+        i = table.sample_index(rng)
+        if recent.maxlen:
+            tries = 0
+            while i in recent and tries < self.MAX_REDRAWS:
+                i = table.sample_index(rng)
+                tries += 1
+            recent.append(i)
+        return table.facts[i]
+
+    def record(self, question: Question, correct: bool, response_time: float):
+        """Answer feedback; random draws ignore it (see scheduler.AdaptiveScheduler)."""
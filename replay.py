@@ -0,0 +1,190 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Session recording and replay. A session is fully described by its seed
+# and its input events; replay() feeds them through a TrainingSession on a
+# VirtualClock, so a recording re-runs much faster than real time (bug
+# reports, regression runs over many sessions). A seed derived from the
+# date gives every device the same daily challenge.
+
+import base64
+import hashlib
+import json
+import os
+import sys
+from array import array
+from datetime import date
+from random import Random
+
+from questions import MAX_FACTOR
+from scheduler import AdaptiveScheduler
+from session import RECENT_QUESTIONS, SESSION_SECONDS, TrainingSession, VirtualClock
+
+LOG_VERSION = 1
+
+# Category of the daily challenge (random order, same on every device)
+DAILY_CATEGORY = "all"
+
+
+class ReplayMismatch(ValueError):
+    """The replay diverged from the recording (other question or result)."""
+
+
+def daily_seed(day: date, category: str = DAILY_CATEGORY) -> int:
+    """Seed of the daily challenge; independent of platform and Python hash seed."""
+    digest = hashlib.sha256(f"jontrain-daily:{day.isoformat()}:{category}".encode("ascii")).digest()
+    return int.from_bytes(digest[:4], "big")
+
+
+class SessionLog:
+    """Seed, settings and timestamped events of one session.
+
+    Events are lists [ms since start, code, *args]:
+      q text               question shown
+      t group value key    keypad toggle
+      c                    input cleared
+      s                    input submitted
+      a value remainder    numeric answer (answer_with)
+      p / r                paused / resumed
+    """
+
+    def __init__(self, seed: int, category: str, duration: int = SESSION_SECONDS, mode: str = "random",
+                 max_factor: int = MAX_FACTOR, recent: int = RECENT_QUESTIONS, **meta):
+        self.seed = seed
+        self.category = category
+        self.duration = duration
+        self.mode = mode  # "random" / "adaptive"
+        self.max_factor = max_factor
+        self.recent = recent
+        self.meta = meta
+        # Adaptive sessions: starting weakness per fact (the fact statistics
+        # change while playing, so the order can only be replayed from these)
+        self.priors = None
+        self.events = []
+        self.result = None
+
+    def __len__(self):
+        return len(self.events)
+
+    def add(self, ms: int, code: str, *args):
+        self.events.append([ms, code, *args])
+
+    def clear(self):
+        self.events = []
+        self.result = None
+
+    def finish(self, session: TrainingSession):
+        self.result = {"points": session.points, "answered": session.answered, "correct": session.correct}
+
+    def to_dict(self) -> dict:
+        priors = None
+        if self.priors is not None:
+            data = array("f", self.priors)
+            if sys.byteorder == "big":
+                data.byteswap()
+            priors = base64.b64encode(data.tobytes()).decode("ascii")
+        return {
+            "version": LOG_VERSION,
+            "seed": self.seed,
+            "category": self.category,
+            "duration": self.duration,
+            "mode": self.mode,
+            "max_factor": self.max_factor,
+            "recent": self.recent,
+            "meta": self.meta,
+            "priors": priors,
+            "result": self.result,
+            "events": self.events,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SessionLog":
+        if data.get("version") != LOG_VERSION:
+            raise ValueError("Unbekanntes Format der Sitzungsaufzeichnung")
+        log = cls(
+            data["seed"], data["category"], data.get("duration", SESSION_SECONDS), data.get("mode", "random"),
+            data.get("max_factor", MAX_FACTOR), data.get("recent", RECENT_QUESTIONS), **data.get("meta", {}),
+        )
+        log.events = [list(event) for event in data.get("events", [])]
+        log.result = data.get("result")
+        if data.get("priors"):
+            priors = array("f", base64.b64decode(data["priors"]))
+            if sys.byteorder == "big":
+                priors.byteswap()
+            log.priors = priors
+        return log
+
+
+def save_session_log(path: str, log: SessionLog):
+    """Compact JSON (one line per event), written via temp file + rename."""
+    data = log.to_dict()
+    events = data.pop("events")
+    head = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    lines = [json.dumps(event, ensure_ascii=False, separators=(",", ":")) for event in events]
+    text = head[:-1] + ',"events":[\n' + ",\n".join(lines) + "\n]}\n"
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_session_log(path: str) -> SessionLog:
+    with open(path, "r", encoding="utf-8") as f:
+        return SessionLog.from_dict(json.load(f))
+
+
+def build_session(log: SessionLog, clock=None, stats=None, record: bool = True) -> TrainingSession:
+    """The session described by log (recording into it unless record is False).
+
+    The app and replay() both build sessions here, so the question stream
+    depends on nothing but the log. A new adaptive session takes its
+    starting weakness from stats and stores it in log.priors; a logged one
+    is rebuilt from log.priors alone.
+    """
+    rng = Random(log.seed)
+    pool = None
+    if log.mode == "adaptive":
+        pool = AdaptiveScheduler(log.category, stats=stats, rng=rng, max_factor=log.max_factor, priors=log.priors)
+        log.priors = pool.priors
+    return TrainingSession(
+        log.category, duration=log.duration, clock=clock, rng=rng, recent=log.recent, pool=pool,
+        max_factor=log.max_factor, seed=log.seed, log=log if record else None,
+    )
+
+
+def replay(log: SessionLog, check: bool = True) -> TrainingSession:
+    """Re-run log on a VirtualClock and return the finished session.
+
+    With check, every recorded question and the final result must match,
+    otherwise ReplayMismatch is raised.
+    """
+    clock = VirtualClock()
+    session = build_session(log, clock=clock, record=False)
+    session.start()
+    for n, event in enumerate(log.events):
+        ms, code, args = event[0], event[1], event[2:]
+        clock.now = ms / 1000.0
+        if code == "q":
+            if check and session.question.text != args[0]:
+                raise ReplayMismatch(f"Ereignis {n}: Aufgabe {session.question.text} statt {args[0]}")
+        elif code == "t":
+            session.toggle(*args)
+        elif code == "c":
+            session.clear_input()
+        elif code == "s":
+            session.submit()
+        elif code == "a":
+            session.answer_with(*args)
+        elif code == "p":
+            session.pause()
+        elif code == "r":
+            session.resume()
+        else:
+            raise ValueError(f"Unbekanntes Ereignis: {code}")
+    if check and log.result is not None:
+        result = {"points": session.points, "answered": session.answered, "correct": session.correct}
+        if result != log.result:
+            raise ReplayMismatch(f"Ergebnis {result} statt {log.result}")
+    return session
@@ -0,0 +1,124 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Adaptive question order (spaced repetition). The operation of each
+# question is drawn with the category's shares (CATEGORY_OPS), exactly as in
+# random mode, so the points per session stay comparable. Within an
+# operation the facts sit in a heap keyed by (due turn, -weakness); a
+# correct answer pushes a fact further out, a wrong one brings it back
+# after a few questions. Draws and updates are O(log n), so 1..20 tables
+# (~5000 facts) cost the same per answer as 1..10.
+
+import heapq
+from array import array
+from random import Random
+from typing import Optional
+
+from fact_stats import FactStats
+from questions import CATEGORY_OPS, MAX_FACTOR, Question, question_table
+
+# Questions until a fact comes back: after a wrong answer, and per interval step
+RETRY_AFTER = 3
+INTERVALS = (4, 8, 16, 32, 64, 128, 256)
+# Answers slower than this count as shaky: the interval does not grow
+SLOW_ANSWER_SECONDS = 6.0
+# Prior weakness of a fact that was never answered
+UNSEEN_WEAKNESS = 0.5
+
+
+def weakness(stats: Optional[FactStats], slot: int) -> float:
+    """0 (known) .. ~1.5 (often wrong and slow), from the long-term statistics."""
+    if stats is None or slot < 0 or not stats.seen[slot]:
+        return UNSEEN_WEAKNESS
+    error_rate = (stats.errors[slot] + 1) / (stats.seen[slot] + 2)
+    slowness = min(stats.ema_ms[slot], 10000.0) / 20000.0
+    return error_rate + slowness
+
+
+class AdaptiveScheduler:
+    """Drop-in for QuestionPool: draw() picks the most urgent fact, record() reschedules it.
+
+    The starting weakness per fact comes from stats, or from priors (a
+    previous scheduler's .priors, e.g. from a session log): with the same
+    priors and rng seed the question order is the same.
+    """
+
+    def __init__(self, category: str, stats: Optional[FactStats] = None, rng: Optional[Random] = None,
+                 max_factor: int = MAX_FACTOR, priors=None):
+        self.table = question_table(category, max_factor)
+        self.rng = rng if rng is not None else Random()
+        n = len(self.table)
+        self.turn = 0
+        self.step = array("B", bytes(n))
+        # Heap entries go stale when a fact is rescheduled; version tells them apart
+        self._version = array("I", bytes(4 * n))
+        self._weakness = array("f", bytes(4 * n))
+        self._out = None  # index of the drawn fact until its answer is recorded
+
+        # One heap per operation; the operation itself is drawn by share
+        self._heaps = {op: [] for op, _ in CATEGORY_OPS[category]}
+        self._ops = list(self._heaps)
+        self._cum_shares = []
+        total = 0.0
+        for _, share in CATEGORY_OPS[category]:
+            total += share
+            self._cum_shares.append(total)
+        if priors is None:
+            priors = (
+                weakness(stats, stats.index.question_slot(q) if stats is not None else -1)
+                for q in self.table.facts
+            )
+        self.priors = array("f", priors)
+        if len(self.priors) != n:
+            raise ValueError("Vorwissen passt nicht zur Aufgabentabelle")
+        for i, q in enumerate(self.table.facts):
+            # Jitter keeps equally weak facts from always coming in table order
+            w = self.priors[i] + self.rng.random() * 0.05
+            self._weakness[i] = w
+            self._heaps[q.op].append((0, -w, i, 0))
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
+
+    def __len__(self):
+        return len(self.table)
+
+    def _push(self, i: int, due: int):
+        self._version[i] += 1
+        heap = self._heaps[self.table.facts[i].op]
+        heapq.heappush(heap, (due, -self._weakness[i], i, self._version[i]))
+
+    def _draw_op(self) -> str:
+        x = self.rng.random() * self._cum_shares[-1]
+        for op, bound in zip(self._ops, self._cum_shares):
+            if x < bound:
+                return op
+        return self._ops[-1]
+
+    def draw(self) -> Question:
+        if self._out is not None:
+            # Previous question was never answered: keep it near the front
+            self._push(self._out, self.turn + 1)
+        heap = self._heaps[self._draw_op()]
+        while True:
+            due, _, i, version = heapq.heappop(heap)
+            if version == self._version[i]:
+                break
+        self._out = i
+        self.turn += 1
+        return self.table.facts[i]
+
+    def record(self, question: Question, correct: bool, response_time: float):
+        i = self._out
+        if i is None or self.table.facts[i] != question:
+            return
+        self._out = None
+        if correct:
+            if response_time <= SLOW_ANSWER_SECONDS or self.step[i] == 0:
+                self.step[i] = min(self.step[i] + 1, len(INTERVALS))
+            due = self.turn + INTERVALS[self.step[i] - 1]
+            self._weakness[i] *= 0.7
+        else:
+            self.step[i] = 0
+            due = self.turn + RETRY_AFTER
+            self._weakness[i] = min(2.0, self._weakness[i] + 0.5)
+        self._push(i, due)
@@ -0,0 +1,278 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Kivy-free training engine: questions, input state, scoring and countdown.
+# MathTrainer only renders what the session reports, so the same rules can
+# run headless (simulations, load tests) on a VirtualClock.
+
+import math
+import time
+from random import Random, SystemRandom
+from typing import NamedTuple, Optional, Tuple
+
+from questions import MAX_FACTOR, Question, QuestionPool
+
+SESSION_SECONDS = 300
+
+# Below this many seconds the countdown shows tenths
+FINE_COUNTDOWN_SECONDS = 10
+
+# Avoid repeating any of the last N questions
+RECENT_QUESTIONS = 3
+
+# Points per operation: (right, wrong)
+POINTS = {
+    "mult": (1, -5),
+    "div": (2, -3),
+    "div_rest": (5, -3),
+}
+
+
+def new_seed() -> int:
+    """Fresh 32-bit session seed (logged, so the question stream can be replayed)."""
+    return SystemRandom().getrandbits(32)
+
+
+def convert_to_number(value: str) -> int:
+    return int(value) if value.strip() else 0
+
+
+def _format_answer(answer: Tuple[int, int]) -> str:
+    return f"{answer[0]}" + (f" R{answer[1]}" if answer[1] else "")
+
+
+class VirtualClock:
+    """Manually advanced clock for headless runs (callable like time.monotonic)."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class AnswerResult(NamedTuple):
+    question: Question
+    user_answer: Tuple[int, int]
+    correct: bool
+    points_awarded: int
+    response_time: float  # seconds between showing the question and submitting
+
+    @property
+    def text(self) -> str:
+        if self.correct:
+            return _format_answer(self.user_answer) + " ist RICHTIG!"
+        return (
+            _format_answer(self.user_answer) +
+            f" ist FALSCH!\n>>> {self.question.text} = {_format_answer(self.question.answer)} <<<"
+        )
+
+
+class TrainingSession:
+    def __init__(self, category: str, duration: int = SESSION_SECONDS, clock=None,
+                 rng: Optional[Random] = None, recent: int = RECENT_QUESTIONS, pool=None,
+                 max_factor: int = MAX_FACTOR, seed: Optional[int] = None, log=None):
+        self.category = category
+        self.duration = duration
+        self.clock = clock if clock is not None else time.monotonic
+        # Without an explicit rng the question stream follows the seed
+        if rng is None:
+            self.seed = seed if seed is not None else new_seed()
+            rng = Random(self.seed)
+        else:
+            self.seed = seed
+        # Optional event recorder with add(ms, code, *args) (see replay.SessionLog)
+        self.log = log
+        self._started_at = 0.0
+        # Any object with draw() and record() (QuestionPool, AdaptiveScheduler)
+        self.pool = pool if pool is not None else QuestionPool(category, rng=rng, recent=recent, max_factor=max_factor)
+
+        self.points = 0
+        self.deadline = None  # clock() value at which the session ends
+        self._paused_at = None
+        self.answered = 0
+        self.correct = 0
+        self.question = None  # type: Optional[Question]
+        self.asked_at = 0.0
+        # Times that scoring depends on, in the log's resolution (whole ms
+        # since start), so a replay computes exactly the same response times
+        self._asked_ms = 0
+        self._paused_ms = 0
+
+        self.answer = {"tens": "", "ones": "", "remainder": ""}
+        # Key of the selected button per group (a value may exist on several keys)
+        self.selected = {"tens": None, "ones": None, "remainder": None}
+
+    # -------------------------
+    # Questions / input
+    # -------------------------
+    def _record(self, code: str, *args) -> int:
+        """Log an event; returns its time in ms since start (also without a log)."""
+        ms = round((self.clock() - self._started_at) * 1000)
+        if self.log is not None:
+            self.log.add(ms, code, *args)
+        return ms
+
+    def next_question(self) -> Question:
+        self.question = self.pool.draw()
+        self.asked_at = self.clock()
+        self._asked_ms = self._record("q", self.question.text)
+        return self.question
+
+    def toggle(self, group: str, value: str, key=None) -> bool:
+        """Select value for group or deselect it when key is already active.
+
+        Returns True when the key is selected afterwards.
+        """
+        if key is None:
+            key = value
+        self._record("t", group, value, key)
+        if self.selected[group] == key:
+            self.answer[group] = ""
+            self.selected[group] = None
+            return False
+        self.answer[group] = value
+        self.selected[group] = key
+        return True
+
+    def clear_input(self):
+        self._record("c")
+        self._reset_input()
+
+    def _reset_input(self):
+        self.answer = {"tens": "", "ones": "", "remainder": ""}
+        self.selected = {"tens": None, "ones": None, "remainder": None}
+
+    def user_answer(self) -> Tuple[int, int]:
+        tens = convert_to_number(self.answer["tens"])
+        ones = convert_to_number(self.answer["ones"])
+        remainder = convert_to_number(self.answer["remainder"].replace("R", "")) if self.answer["remainder"] else 0
+        return tens + ones, remainder
+
+    def answer_text(self) -> str:
+        tens = convert_to_number(self.answer["tens"])
+        ones = convert_to_number(self.answer["ones"])
+        return f"{tens + ones}{self.answer['remainder']}"
+
+    # -------------------------
+    # Scoring
+    # -------------------------
+    def submit(self) -> AnswerResult:
+        """Score the current input, then draw the next question and clear the input."""
+        ms = self._record("s")
+        result = self._score(*self.user_answer(), ms)
+        self._reset_input()
+        return result
+
+    def answer_with(self, value: int, remainder: int = 0) -> AnswerResult:
+        """Score a numeric answer directly (fast path for simulations)."""
+        ms = self._record("a", value, remainder)
+        return self._score(value, remainder, ms)
+
+    def _score(self, value: int, remainder: int, ms: int) -> AnswerResult:
+        q = self.question
+        user_answer = (value, remainder)
+        correct = user_answer == q.answer
+        points_awarded = POINTS[q.op][0 if correct else 1]
+        if correct:
+            self.points += points_awarded
+            self.correct += 1
+        else:
+            self.points = max(0, self.points + points_awarded)
+        self.answered += 1
+
+        result = AnswerResult(q, user_answer, correct, points_awarded, (ms - self._asked_ms) / 1000.0)
+        self.pool.record(q, correct, result.response_time)
+        self.question = self.pool.draw()
+        self.asked_at = self.clock()
+        self._asked_ms = ms
+        self._record("q", self.question.text)
+        return result
+
+    # -------------------------
+    # Countdown
+    # -------------------------
+    def start(self) -> Question:
+        self.points = 0
+        self.answered = 0
+        self.correct = 0
+        self._reset_input()
+        self._paused_at = None
+        self._started_at = self.clock()
+        if self.log is not None:
+            self.log.clear()
+        self.deadline = self._started_at + self.duration
+        return self.next_question()
+
+    def remaining(self) -> float:
+        """Seconds left, from the deadline (independent of how often anyone asks)."""
+        if self.deadline is None:
+            return float(self.duration)
+        now = self._paused_at if self._paused_at is not None else self.clock()
+        return max(0.0, self.deadline - now)
+
+    @property
+    def time_left(self) -> int:
+        return math.ceil(self.remaining())
+
+    @property
+    def is_over(self) -> bool:
+        return self.deadline is not None and self.remaining() <= 0
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_at is not None
+
+    def pause(self):
+        if self.deadline is not None and self._paused_at is None:
+            self._paused_at = self.clock()
+            self._paused_ms = self._record("p")
+
+    def resume(self):
+        """Continue after pause(); the paused time does not count."""
+        if self._paused_at is not None:
+            self._asked_ms += self._record("r") - self._paused_ms
+            now = self.clock()
+            self.deadline += now - self._paused_at
+            self.asked_at += now - self._paused_at
+            self._paused_at = None
+
+    def time_text(self) -> str:
+        remaining = self.remaining()
+        if remaining > FINE_COUNTDOWN_SECONDS:
+            return f"{math.ceil(remaining)} s"
+        return f"{math.ceil(remaining * 10) / 10:.1f} s".replace(".", ",")
+
+    def next_display_change(self) -> float:
+        """Seconds until time_text() shows a different value (0 when over)."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            return 0.0
+        if remaining > FINE_COUNTDOWN_SECONDS:
+            step = math.ceil(remaining) - 1
+            # Switch to tenths exactly at the threshold
+            step = max(step, FINE_COUNTDOWN_SECONDS)
+        else:
+            step = (math.ceil(remaining * 10) - 1) / 10
+        # A little past the boundary, so the next call sees the new value
+        return remaining - step + 0.001
+
+
+def simulate(category: str, accuracy: float = 0.9, answer_seconds: float = 3.0,
+             duration: int = SESSION_SECONDS, seed: Optional[int] = None) -> TrainingSession:
+    """Play one session headless on a VirtualClock and return it."""
+    rng = Random(seed)
+    clock = VirtualClock()
+    session = TrainingSession(category, duration=duration, clock=clock, rng=rng)
+    session.start()
+    while not session.is_over:
+        clock.advance(answer_seconds)
+        q = session.question
+        if rng.random() < accuracy:
+            session.answer_with(*q.answer)
+        else:
+            session.answer_with(q.answer[0] + 1, q.answer[1])
+    return session
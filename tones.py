@@ -0,0 +1,132 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Feedback tone synthesis. A tone is described by a ToneSpec; its WAV file
+# name is derived from the parameters, so a changed setting only
+# regenerates the tones that actually differ.
+
+import hashlib
+import math
+import os
+import sys
+import wave
+from array import array
+from itertools import repeat
+from operator import add, mul, truediv
+from typing import NamedTuple, Tuple
+
+SAMPLE_RATE = 44100
+
+
+class ToneSpec(NamedTuple):
+    freqs: Tuple[float, ...]  # one frequency = plain tone, several = chord
+    duration: float
+    volume: float = 0.35
+    attack: float = 0.0       # seconds of linear fade-in
+    release: float = 0.0      # seconds of linear fade-out
+    sample_rate: int = SAMPLE_RATE
+
+    def cache_key(self) -> str:
+        return hashlib.sha1(repr(tuple(self)).encode("ascii")).hexdigest()[:12]
+
+    def filename(self) -> str:
+        return f"tone-{self.cache_key()}.wav"
+
+
+# Feedback variants: name -> (success, failure)
+TONE_VARIANTS = {
+    "klassisch": (
+        ToneSpec((880.0,), 0.14),
+        ToneSpec((220.0,), 0.22),
+    ),
+    "sanft": (
+        ToneSpec((523.25, 659.25, 783.99), 0.20, volume=0.30, attack=0.01, release=0.09),
+        ToneSpec((196.0, 233.08), 0.26, volume=0.30, attack=0.01, release=0.12),
+    ),
+    "hell": (
+        ToneSpec((1046.5, 1318.5), 0.12, volume=0.30, attack=0.003, release=0.05),
+        ToneSpec((311.13, 329.63), 0.24, volume=0.30, attack=0.003, release=0.08),
+    ),
+}
+DEFAULT_TONE_VARIANT = "klassisch"
+
+
+# Longest single-frequency loop that is tiled. The loop frequency is
+# adjusted so the loop closes on a whole sample; the shortest loop within
+# LOOP_TOLERANCE (relative, 1e-4 = 0.17 cent) is taken.
+MAX_LOOP_SAMPLES = 4096
+LOOP_TOLERANCE = 1e-4
+
+
+def _loop(freq: float, rate: int, amp: float, frames: int) -> list:
+    """int(amp * sine) over a whole number of periods that fits in a whole number of samples."""
+    period = rate / freq
+    limit = max(1, min(frames, MAX_LOOP_SAMPLES))
+    best = (1.0, max(1, round(period)), 1)  # (frequency error, samples, periods)
+    k = 1
+    while k * period <= limit:
+        n = round(k * period)
+        error = abs(k * period - n) / (k * period)
+        if error < best[0]:
+            best = (error, n, k)
+            if error <= LOOP_TOLERANCE:
+                break
+        k += 1
+    _, n, k = best
+    w = 2.0 * math.pi * k / n
+    sin = math.sin
+    return [int(amp * sin(w * i)) for i in range(n)]
+
+
+def synthesize(spec: ToneSpec) -> bytes:
+    """16-bit mono PCM for spec: one tiled loop per frequency, envelope only where it is below 1.
+
+    Everything per sample runs in C (list repeat, map); Python only
+    computes the loops, a few thousand samples at most.
+    """
+    rate = spec.sample_rate
+    frames = int(rate * max(0.05, spec.duration))
+    amp = 32767 * max(0.0, min(1.0, spec.volume)) / max(1, len(spec.freqs))
+    attack_n = max(1, int(rate * spec.attack))
+    release_n = max(1, int(rate * spec.release))
+
+    samples = None
+    for freq in spec.freqs:
+        loop = _loop(freq, rate, amp, frames)
+        tone = (loop * (frames // len(loop) + 1))[:frames]
+        samples = tone if samples is None else list(map(add, samples, tone))
+
+    # Linear envelope min(1, i / attack_n, (frames - i) / release_n); with
+    # attack/release 0 it is 1.0 for every sample but the first. Only the
+    # attack and release spans are touched, everything between stays 1.0.
+    head = min(attack_n, frames)
+    tail = max(head, frames - release_n)
+    up = map(truediv, range(head), repeat(attack_n))
+    if frames - release_n < head:  # short tone: the fade-out starts during the fade-in
+        up = map(min, up, map(truediv, range(frames, frames - head, -1), repeat(release_n)))
+    samples[:head] = map(int, map(mul, samples[:head], up))
+    down = map(truediv, range(frames - tail, 0, -1), repeat(release_n))
+    samples[tail:] = map(int, map(mul, samples[tail:], down))
+    pcm = array("h", samples)
+    if sys.byteorder == "big":
+        pcm.byteswap()  # WAV is little-endian
+    return pcm.tobytes()
+
+
+def write_wav(path: str, spec: ToneSpec):
+    tmp_path = path + ".tmp"
+    with wave.open(tmp_path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(spec.sample_rate)
+        wf.writeframes(synthesize(spec))
+    os.replace(tmp_path, path)
+
+
+def ensure_tone_file(directory: str, spec: ToneSpec) -> str:
+    """Path of the WAV for spec in directory; generated only if missing."""
+    path = os.path.join(directory, spec.filename())
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        write_wav(path, spec)
+    return path
@@ -0,0 +1,51 @@
+# Copyright (C) 2025 Arnd Brandes.
+# Dieses Programm kann durch jedermann gemäß den Bestimmungen der Deutschen Freien Software Lizenz genutzt werden.
+
+# Font sizes relative to the window width. The UI uses a handful of base
+# sizes (designed for a 600 px wide window); their pixel sizes are computed
+# once per width and pushed only into the widgets bound to a size that
+# actually changed.
+
+import weakref
+
+REFERENCE_WIDTH = 600
+
+
+class Typography:
+    def __init__(self, width: float = REFERENCE_WIDTH, reference_width: float = REFERENCE_WIDTH):
+        self.reference_width = reference_width
+        self.width = width
+        self._table = {}  # base size -> px at the current width
+        self._bound = {}  # base size -> {widget: [property, ...]} (weak keys)
+
+    def size(self, base_size: int) -> int:
+        try:
+            return self._table[base_size]
+        except KeyError:
+            px = self._table[base_size] = int(base_size * self.width / self.reference_width)
+            return px
+
+    def bind(self, widget, base_size: int, prop: str = "font_size"):
+        """Set widget.prop to the scaled size now and after every resize. Returns widget."""
+        setattr(widget, prop, self.size(base_size))
+        widgets = self._bound.setdefault(base_size, weakref.WeakKeyDictionary())
+        widgets.setdefault(widget, []).append(prop)
+        return widget
+
+    def update(self, width: float) -> int:
+        """Recompute the table for a new window width. Returns the number of properties set."""
+        if width == self.width:
+            return 0
+        old = self._table
+        self.width = width
+        self._table = {}
+        changed = 0
+        for base_size, widgets in self._bound.items():
+            px = self.size(base_size)
+            if old.get(base_size) == px:
+                continue
+            for widget, props in list(widgets.items()):
+                for prop in props:
+                    setattr(widget, prop, px)
+                    changed += 1
+        return changed